@@ -8,18 +8,36 @@ Handles multiple tournaments per day with smart priority logic:
 - Keeps showing tournament even after midnight until completed
 """
 
+import argparse
+import atexit
 import datetime
 import time
 import json
+import os
 import sys
 import re
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import shutil
+import signal
+import threading
+import urllib.parse
+# Selenium is imported inside the functions that drive the browser, so runs
+# that finish early (nothing scheduled, fresh result, ...) never load it
+from tournament_model import Tournament, TournamentStatus, parse_time_string, empty_record, load_record
+from schedule_cache import Schedule, load_schedule, save_schedule, today_string
+from change_events import EventType, make_event, update_snapshot, append_events
+from profiling import NullProfiler, add_profile_argument, make_profiler
+from circuit_breaker import BreakerState, load_breaker, save_breaker, probe
+from last_good import save_last_good, warm_start_record
+from browser_pool import BrowserPool, BrowserTask
+from card_stream import CardStream, parse_card_fragment
+from render_display import render_if_changed
+from freshness import stamp_scrape
+from completion_eta import load_progress, save_progress, format_epoch
+from tournament_sources import TournamentSource, SourceError, JsonFeedSource, fetch_sources, in_range
+from payouts import parse_entry_fee, default_entry_fee, load_payout_structures, load_payout_tables, save_payout_tables
+from bracket_feed import BracketFeed, parse_bracket
+from browser_reaper import BrowserRun, profile_dir
+from single_flight import SingleFlight
 
 
 # Configuration
@@ -28,6 +46,42 @@ VENUE_CITY = "Hilliard"
 DATA_FILE = "/home/pi/tournament_data.json"
 DATA_FILE_BACKUP = "/var/www/html/tournament_data.json"
 LOG_FILE = "/home/pi/logs/tournament_monitor.log"
+STATE_DIR = os.path.dirname(DATA_FILE)
+SCHEDULE_FILE = os.path.join(STATE_DIR, "tournament_schedule.json")
+SNAPSHOT_FILE = os.path.join(STATE_DIR, "tournament_snapshot.json")
+EVENTS_FILE = os.path.join(os.path.dirname(DATA_FILE_BACKUP), "tournament_events.jsonl")
+BREAKER_FILE = os.path.join(STATE_DIR, "circuit_breaker.json")
+LAST_GOOD_FILE = os.path.join(STATE_DIR, "tournament_last_good.json")
+PROGRESS_FILE = os.path.join(STATE_DIR, "tournament_progress.json")
+PAYOUT_FILE = os.path.join(STATE_DIR, "payout_tables.json")
+PAYOUT_STRUCTURE_FILE = os.path.join(STATE_DIR, "payout_structures.json")  # Maintained by the venue
+BRACKET_FILE = os.path.join(STATE_DIR, "bracket_deltas.jsonl")
+BROWSER_RUN_FILE = os.path.join(STATE_DIR, "browser_run.json")  # PIDs of the browsers runs have open
+SCRAPE_STATE_FILE = os.path.join(STATE_DIR, "scrape_flight.json")  # Lock, lease and last result of run()
+SCRAPE_FRESH_SECONDS = 120  # Overlapping triggers reuse a result this recent instead of scraping
+RENDER_DIR = os.path.dirname(DATA_FILE_BACKUP)  # Static display page goes next to the web copy
+DIGITALPOOL_URL = "https://www.digitalpool.com/tournaments"
+RECHECK_TABS = 3  # Tournament pages loaded at the same time in one Chrome
+RECHECK_TIMEOUT = 30  # Seconds per tournament page before giving up on it
+PAGE_SETTLE = 3  # Seconds for DigitalPool's client-side rendering after load
+BROWSER_BACKENDS = ('chromedriver', 'cdp')
+BROWSER_BACKEND = os.environ.get('TOURNAMENT_BROWSER_BACKEND', 'chromedriver')
+# Extra JSON tournament feeds fetched alongside DigitalPool (comma-separated URLs)
+TOURNAMENT_FEEDS = [url.strip() for url in os.environ.get('TOURNAMENT_FEEDS', '').split(',') if url.strip()]
+
+# Replaced by make_profiler() when --profile is given
+PROFILER = NullProfiler()
+
+# Loaded from PAYOUT_FILE (for the structures in PAYOUT_STRUCTURE_FILE) on first use
+PAYOUT_TABLES = None
+
+# Matches read from each tournament page this run, by URL (feeds the bracket of the displayed one)
+LIVE_BRACKETS = {}
+
+# Created on first use, so BROWSER_RUN_FILE can still be redirected after import
+BROWSERS = None
+BROWSER_HOOKS = threading.Lock()  # Held while install_browser_hooks() runs; see BROWSER_HOOKS_INSTALLED
+BROWSER_HOOKS_INSTALLED = False
 
 
 def log(message):
@@ -43,8 +97,12 @@ def log(message):
         pass
 
 
-def setup_driver(headless=True):
-    """Setup Chrome WebDriver"""
+def setup_driver(headless=True, page_load_strategy=None, user_data_dir=None):
+    """Setup Chrome WebDriver (page_load_strategy='none' for the multi-tab pool)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    
     chrome_options = Options()
     
     if headless:
@@ -56,6 +114,17 @@ def setup_driver(headless=True):
     chrome_options.add_argument('--start-maximized')
     chrome_options.add_argument('--user-agent=Mozilla/5.0 (X11; Linux armv7l) AppleWebKit/537.36')
     chrome_options.add_argument('--disable-extensions')
+    # Keep background tabs loading at full speed for the browser pool
+    chrome_options.add_argument('--disable-background-timer-throttling')
+    chrome_options.add_argument('--disable-backgrounding-occluded-windows')
+    chrome_options.add_argument('--disable-renderer-backgrounding')
+    
+    # Marks the Chrome processes as ours for the orphan reaper
+    if user_data_dir:
+        chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+    
+    if page_load_strategy:
+        chrome_options.page_load_strategy = page_load_strategy
     
     try:
         service = Service(executable_path='/usr/bin/chromedriver')
@@ -65,23 +134,488 @@ def setup_driver(headless=True):
         raise
 
 
-def parse_time_string(time_str):
-    """Parse time strings like '7:00 PM' and return datetime.time object"""
+def browser_run():
+    """The browsers this process has open (see browser_reaper.py)"""
+    global BROWSERS
+    if BROWSERS is None:
+        BROWSERS = BrowserRun(BROWSER_RUN_FILE, log=log)
+    return BROWSERS
+
+
+def open_browser(headless=True, page_load_strategy=None):
+    """
+    Start a browser with the configured backend (chromedriver or direct CDP)
+    and record its process tree so a killed run's browser can be reaped
+    Close it with close_browser()
+    """
+    if BROWSER_BACKEND == 'cdp':
+        from cdp_driver import setup_cdp_driver
+        try:
+            driver = setup_cdp_driver(headless=headless, page_load_strategy=page_load_strategy)
+        except Exception as e:
+            log(f"Error starting Chrome with the CDP backend: {e}")
+            raise
+        # CDPDriver.quit() removes its own profile
+        browser_run().track(driver, driver.process.pid)
+        return driver
+    
+    profile = profile_dir()
     try:
-        time_str = time_str.strip()
-        for fmt in ['%I:%M %p', '%I:%M%p', '%I %p', '%I%p']:
+        driver = setup_driver(headless=headless, page_load_strategy=page_load_strategy, user_data_dir=profile)
+    except Exception:
+        shutil.rmtree(profile, ignore_errors=True)
+        raise
+    # chromedriver is the root of the tree; Chrome runs under it
+    browser_run().track(driver, driver.service.process.pid, profile)
+    return driver
+
+
+def close_browser(driver):
+    """Quit a browser from open_browser(), log what it used and kill anything it leaves behind"""
+    browser_run().close(driver)
+
+
+def parse_status_from_text(card_text, tournament_date):
+    """
+    Determine status, player count and completion from tournament card (or detail page) text
+    Returns (TournamentStatus, player_count, completion_pct or None)
+    """
+    # Extract status - check for explicit keywords first, then infer from context
+    actual_status = TournamentStatus.UNKNOWN
+    player_count = 0
+    completion_pct = None
+    
+    # Extract player count
+    player_match = re.search(r'(\d+)\s+Players?', card_text, re.IGNORECASE)
+    if player_match:
+        player_count = int(player_match.group(1))
+        log(f"  Player count: {player_count}")
+    
+    # Extract completion percentage (feeds the completion ETA)
+    completion_match = re.search(r'(\d+)%\s*Complete', card_text, re.IGNORECASE)
+    if completion_match:
+        completion_pct = int(completion_match.group(1))
+        log(f"Found completion: {completion_pct}%")
+    
+    # First check for explicit status keywords
+    status_indicators = {
+        TournamentStatus.IN_PROGRESS: ["In Progress", "Live", "Active", "Playing"],
+        TournamentStatus.UPCOMING: ["Upcoming", "Scheduled", "Future"],
+        TournamentStatus.COMPLETED: ["Completed", "Finished", "Final", "Ended"]
+    }
+    
+    for status, keywords in status_indicators.items():
+        if any(keyword in card_text for keyword in keywords):
+            actual_status = status
+            log(f"Status from keyword: {actual_status.value}")
+            break
+    
+    # A fully played bracket is over even if the page hasn't switched to "Completed" yet
+    if completion_pct == 100 and actual_status is not TournamentStatus.COMPLETED:
+        actual_status = TournamentStatus.COMPLETED
+        log("Status overridden: Completed (100% complete)")
+    
+    # If no explicit keyword, infer from context
+    if actual_status is TournamentStatus.UNKNOWN:
+        log("No explicit status keyword found, inferring from context...")
+        
+        # Look for completion percentage
+        if completion_pct is not None:
+            if completion_pct == 100:
+                actual_status = TournamentStatus.COMPLETED
+                log("Status inferred: Completed (100% complete)")
+            elif completion_pct == 0:
+                # KEY CHANGE: Check if players are registered
+                if player_count > 0:
+                    actual_status = TournamentStatus.IN_PROGRESS
+                    log(f"Status inferred: In Progress (0% complete but {player_count} players registered)")
+                else:
+                    actual_status = TournamentStatus.UPCOMING
+                    log("Status inferred: Upcoming (0% complete, no players)")
+            elif completion_pct > 0 and completion_pct < 100:
+                actual_status = TournamentStatus.IN_PROGRESS
+                log("Status inferred: In Progress (partial completion)")
+        else:
+            # No completion percentage - check players and date/time
+            if player_count > 0:
+                actual_status = TournamentStatus.IN_PROGRESS
+                log(f"Status inferred: In Progress ({player_count} players registered)")
+            elif tournament_date:
+                # Check if today's date matches tournament date
+                today = datetime.date.today()
+                today_str = today.strftime("%Y/%m/%d")
+                
+                if tournament_date == today_str:
+                    # Today's tournament with no completion info - probably upcoming
+                    actual_status = TournamentStatus.UPCOMING
+                    log("Status inferred: Upcoming (today's tournament, no completion data)")
+                elif tournament_date < today_str:
+                    # Past tournament - probably completed
+                    actual_status = TournamentStatus.COMPLETED
+                    log("Status inferred: Completed (past date)")
+    
+    log(f"Final status: {actual_status.value}")
+    
+    return actual_status, player_count, completion_pct
+
+
+def extract_tournament_name(card_text, headings=None, title_text=None):
+    """
+    Pick the tournament name from a card
+    headings maps h1..h5 to the text of the first heading of that tag
+    """
+    tournament_name = None
+    
+    # Strategy 1: Look for heading elements
+    for tag in ['h1', 'h2', 'h3', 'h4', 'h5']:
+        heading_text = (headings or {}).get(tag)
+        if heading_text and heading_text.strip() and VENUE_NAME not in heading_text:
+            tournament_name = heading_text.strip()
+            log(f"Found name in {tag}: {tournament_name}")
+            break
+    
+    # Strategy 2: Look for elements with 'title' class
+    if not tournament_name and title_text and title_text.strip():
+        tournament_name = title_text.strip()
+        log(f"Found name in title element: {tournament_name}")
+    
+    # Strategy 3: Look for first meaningful text line
+    if not tournament_name:
+        lines = card_text.split('\n')
+        for line in lines:
+            line = line.strip()
+            if (line and 
+                len(line) > 5 and 
+                VENUE_NAME not in line and
+                VENUE_CITY not in line and
+                not re.match(r'^\d{4}/\d{2}/\d{2}', line) and
+                'Showing tournaments' not in line):
+                tournament_name = line
+                log(f"Found name from text parsing: {tournament_name}")
+                break
+    
+    if not tournament_name:
+        tournament_name = f"Tournament at {VENUE_NAME}"
+        log(f"Using default name: {tournament_name}")
+    
+    return tournament_name
+
+
+def extract_start_time(card_text):
+    """Find the tournament start time, preferring it over registration/check-in times"""
+    start_time_str = None
+    all_times_found = []
+    
+    # First, try to find times with specific context keywords (most reliable)
+    priority_patterns = [
+        (r'(?:Tournament\s+)?Start[s]?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Tournament Start'),
+        (r'(?:Play\s+)?Start[s]?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Play Start'),
+        (r'Start\s+Time[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Start Time'),
+        (r'Begins?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Begins'),
+    ]
+    
+    for pattern, label in priority_patterns:
+        time_match = re.search(pattern, card_text, re.IGNORECASE)
+        if time_match:
+            start_time_str = time_match.group(1).strip()
+            log(f"Found time with priority pattern '{label}': {start_time_str}")
+            break
+    
+    # If no priority pattern found, collect ALL times and filter out registration/check-in
+    if not start_time_str:
+        log("No priority time pattern found, scanning for all times...")
+        
+        # Find all times in the card
+        all_time_patterns = [
+            r'(\d{1,2}:\d{2}\s*[AP]\.?M\.?)',  # 7:00 PM, 7:00PM
+            r'(\d{1,2}\s*[AP]\.?M\.?)',         # 7 PM, 7PM
+        ]
+        
+        for pattern in all_time_patterns:
+            matches = re.finditer(pattern, card_text, re.IGNORECASE)
+            for match in matches:
+                time_val = match.group(1).strip()
+                # Get context around the time (50 chars before and after)
+                start_pos = max(0, match.start() - 50)
+                end_pos = min(len(card_text), match.end() + 50)
+                context = card_text[start_pos:end_pos]
+                
+                all_times_found.append({
+                    'time': time_val,
+                    'context': context
+                })
+        
+        log(f"Found {len(all_times_found)} time(s) in card")
+        
+        # Filter out registration/check-in times
+        filtered_times = []
+        exclude_keywords = ['registration', 'check-in', 'check in', 'checkin', 'sign-in', 
+                           'signin', 'sign in', 'doors', 'door open']
+        
+        for time_info in all_times_found:
+            context_lower = time_info['context'].lower()
+            is_excluded = any(keyword in context_lower for keyword in exclude_keywords)
+            
+            if is_excluded:
+                log(f"  Excluding time {time_info['time']} (context suggests registration/check-in)")
+                log(f"    Context: {time_info['context'][:100]}")
+            else:
+                filtered_times.append(time_info)
+                log(f"  Keeping time {time_info['time']}")
+                log(f"    Context: {time_info['context'][:100]}")
+        
+        # Use the LAST remaining time (tournament start is usually listed after registration)
+        if filtered_times:
+            start_time_str = filtered_times[-1]['time']
+            log(f"Selected last filtered time as tournament start: {start_time_str}")
+        elif all_times_found:
+            # If all were filtered out, use the last one anyway
+            start_time_str = all_times_found[-1]['time']
+            log(f"All times were filtered, using last time anyway: {start_time_str}")
+    
+    if not start_time_str:
+        log("No start time found in card text")
+    
+    return start_time_str
+
+
+def construct_tournament_url(tournament_date, tournament_name):
+    """Build the DigitalPool URL from the date and name when the card has no link"""
+    date_no_slashes = tournament_date.replace('/', '')
+    
+    # Remove date from tournament name to avoid duplication in URL
+    # Tournament names often start with date like "2025/11/19 Wednesday Night..."
+    name_for_url = tournament_name
+    name_for_url = re.sub(r'^\d{4}/\d{2}/\d{2}\s+', '', name_for_url)  # Remove date prefix
+    
+    name_slug = re.sub(r'[^a-z0-9-]', '', name_for_url.lower().replace(' ', '-'))
+    name_slug = re.sub(r'-+', '-', name_slug).strip('-')
+    return f"https://digitalpool.com/tournaments/{date_no_slashes}-{name_slug}/"
+
+
+def build_tournament(card_text, headings=None, title_text=None, link_url=None):
+    """Run the full card parse (name, date, time, status, URL) and return a Tournament"""
+    tournament_name = extract_tournament_name(card_text, headings, title_text)
+    
+    # Extract date
+    date_match = re.search(r'(\d{4}/\d{2}/\d{2})', card_text)
+    tournament_date = date_match.group(1) if date_match else None
+    log(f"Date: {tournament_date}")
+    
+    # Extract time - prioritize tournament start time over registration/check-in
+    start_time_str = extract_start_time(card_text)
+    start_time = parse_time_string(start_time_str) if start_time_str else None
+    
+    with PROFILER.phase('parse'):
+        actual_status, player_count, completion_pct = parse_status_from_text(card_text, tournament_date)
+    entry_fee = parse_entry_fee(card_text)
+    if entry_fee:
+        log(f"  Entry fee: ${entry_fee}")
+    
+    # Get tournament URL from link element
+    tournament_url = link_url
+    if tournament_url:
+        log(f"Found URL from link: {tournament_url}")
+    elif tournament_date and tournament_name:
+        # Fallback: construct URL
+        tournament_url = construct_tournament_url(tournament_date, tournament_name)
+        log(f"Constructed URL: {tournament_url}")
+    
+    tournament_info = Tournament(
+        tournament_name,
+        venue=f"{VENUE_NAME}, {VENUE_CITY}",
+        date=tournament_date,
+        start_time=start_time_str,
+        start_time_parsed=start_time.strftime("%H:%M") if start_time else None,
+        status=actual_status,
+        url=tournament_url,
+        found_at=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        player_count=player_count,
+        completion_pct=completion_pct,
+        entry_fee=entry_fee
+    )
+    
+    log(f"✓ Successfully extracted tournament info")
+    log(f"  Name: {tournament_name}")
+    log(f"  Date: {tournament_date}")
+    log(f"  Time: {start_time_str}")
+    log(f"  Status: {actual_status.value}")
+    return tournament_info
+
+
+def save_card_debug(debug_dir, idx, card_html, card_text):
+    """Save one card's HTML and text to the debug directory"""
+    if not debug_dir:
+        return
+    try:
+        if card_html is not None:
+            with open(f"{debug_dir}/card_{idx}_html.html", 'w', encoding='utf-8') as f:
+                f.write(card_html)
+        with open(f"{debug_dir}/card_{idx}_text.txt", 'w', encoding='utf-8') as f:
+            f.write(card_text)
+        log(f"Saved card {idx} debug files")
+    except Exception as e:
+        log(f"Could not save debug for card {idx}: {e}")
+
+
+def log_matching_card(debug_dir, idx, card_text):
+    log(f"\n{'='*50}")
+    log(f"Card {idx} - Found matching venue!")
+    log(f"{'='*50}")
+    log(f"Card text:\n{card_text}\n")
+    
+    # DEBUG: Mark this as the matching card
+    if debug_dir:
+        try:
+            with open(f"{debug_dir}/MATCHING_CARD_{idx}.txt", 'w') as f:
+                f.write(f"This is the matching tournament card!\n\n{card_text}")
+            log(f"★ Marked card {idx} as MATCHING CARD")
+        except:
+            pass
+
+
+def parse_listing_html(page_html, base_url, date_from=None, date_to=None, debug_dir=None):
+    """
+    Parse tournaments straight from the listing page HTML, one card at a time
+    Only cards mentioning the venue, city and a date in range get the full parse.
+    Returns the tournaments, or None if the page has no recognisable cards.
+    """
+    stream = CardStream(page_html, needles=(VENUE_NAME, VENUE_CITY), date_from=date_from, date_to=date_to)
+    tournaments = []
+    
+    for idx, fragment, date in stream:
+        try:
+            card = parse_card_fragment(fragment)
+            save_card_debug(debug_dir, idx, fragment, card.text)
+            
+            log_matching_card(debug_dir, idx, card.text)
+            link_url = next((h for h in card.hrefs if '/tournaments/' in h), None)
+            if link_url:
+                link_url = urllib.parse.urljoin(base_url, link_url)
+            tournaments.append(build_tournament(card.text, card.headings, card.title, link_url))
+        except Exception as e:
+            log(f"Error parsing tournament card {idx}: {e}")
+            import traceback
+            log(traceback.format_exc())
+            continue
+    
+    if not stream.scanned:
+        return None
+    
+    log(f"Streamed {stream.scanned} card(s): {stream.matched} passed the venue/date prefilter"
+        + (" (stopped early - listing moved past the date range)" if stream.stopped_early else ""))
+    return tournaments
+
+
+def parse_card_elements(driver, date_from=None, date_to=None, debug_dir=None):
+    """
+    Fallback when the page HTML has no .ant-card fragments: find cards with
+    WebDriver selectors and read each one through the browser
+    """
+    from selenium.webdriver.common.by import By
+    
+    tournaments = []
+    
+    # Try multiple selector strategies to find tournament cards
+    card_selectors = [
+        "[class*='tournament']",
+        "[class*='TournamentCard']",
+        ".card",
+        "div[class*='Card']"
+    ]
+    
+    tournament_cards = []
+    card_texts = None
+    for selector in card_selectors:
+        try:
+            cards = driver.find_elements(By.CSS_SELECTOR, selector)
+            if cards:
+                log(f"Found {len(cards)} elements with selector: {selector}")
+                tournament_cards = cards
+                # Read every card's text in one round trip instead of one per card
+                card_texts = driver.execute_script(
+                    "return Array.from(document.querySelectorAll(arguments[0]), e => (e.innerText || '').trim());",
+                    selector
+                )
+                if not isinstance(card_texts, list) or len(card_texts) != len(cards):
+                    card_texts = None
+                break
+        except:
+            continue
+    
+    if not tournament_cards:
+        log("Could not find tournament cards with standard selectors, trying alternative approach...")
+        # Fallback: look for any div that contains both venue and date pattern
+        all_divs = driver.find_elements(By.TAG_NAME, "div")
+        tournament_cards = [div for div in all_divs 
+                          if VENUE_NAME in div.text and re.search(r'\d{4}/\d{2}/\d{2}', div.text)]
+        log(f"Found {len(tournament_cards)} potential tournament divs with venue and date")
+    
+    log(f"Processing {len(tournament_cards)} potential tournament cards")
+    
+    for idx, card in enumerate(tournament_cards):
+        try:
+            card_text = card_texts[idx] if card_texts else card.text
+            
+            # Check if this card is for Bankshot Billiards in Hilliard
+            if VENUE_NAME not in card_text:
+                continue
+            
+            if VENUE_CITY not in card_text:
+                log(f"Card {idx}: Found {VENUE_NAME} but not in {VENUE_CITY}, skipping")
+                continue
+            
+            date_match = re.search(r'(\d{4}/\d{2}/\d{2})', card_text)
+            card_date = date_match.group(1) if date_match else None
+            if (date_from and (not card_date or card_date < date_from)) or \
+                    (date_to and (not card_date or card_date > date_to)):
+                continue
+            
+            save_card_debug(debug_dir, idx, card.get_attribute('outerHTML') if debug_dir else None, card_text)
+            log_matching_card(debug_dir, idx, card_text)
+            
+            headings = {}
+            for tag in ['h1', 'h2', 'h3', 'h4', 'h5']:
+                try:
+                    headings[tag] = card.find_element(By.TAG_NAME, tag).text
+                except:
+                    continue
+            
+            title_text = None
             try:
-                parsed = datetime.datetime.strptime(time_str, fmt)
-                return parsed.time()
+                title_elem = card.find_element(By.CSS_SELECTOR, "[class*='title'], [class*='Title'], [class*='name'], [class*='Name']")
+                title_text = title_elem.text
             except:
-                continue
-        return None
-    except:
-        return None
+                pass
+            
+            link_url = None
+            try:
+                link_element = card.find_element(By.CSS_SELECTOR, "a[href*='/tournaments/']")
+                link_url = link_element.get_attribute('href')
+            except:
+                pass
+            
+            tournaments.append(build_tournament(card_text, headings, title_text, link_url))
+            
+        except Exception as e:
+            log(f"Error parsing tournament card {idx}: {e}")
+            import traceback
+            log(traceback.format_exc())
+            continue
+    
+    return tournaments, len(tournament_cards)
 
 
-def search_tournaments_on_page(driver):
-    """Search for Bankshot tournaments on the current page using DOM parsing"""
+def search_tournaments_on_page(driver, date_from=None, date_to=None):
+    """
+    Search for Bankshot tournaments on the current page
+    Cards are streamed from the page HTML; date_from/date_to (YYYY/MM/DD)
+    limit which cards get the full parse
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.common.exceptions import NoSuchElementException
+    
     tournaments = []
     
     try:
@@ -113,7 +647,7 @@ def search_tournaments_on_page(driver):
         
         if not search_input:
             log("✗ Could not find search input")
-            return []
+            return None
         
         search_input.click()
         time.sleep(0.5)
@@ -126,7 +660,6 @@ def search_tournaments_on_page(driver):
         
         time.sleep(1)
         
-        from selenium.webdriver.common.keys import Keys
         search_input.send_keys(Keys.ENTER)
         
         log("Waiting for search results...")
@@ -138,331 +671,32 @@ def search_tournaments_on_page(driver):
         driver.execute_script("window.scrollTo(0, 0);")
         time.sleep(2)
         
+        page_html = driver.page_source
+        
         # DEBUG: Save page source for inspection
         try:
             with open('/tmp/digitalpool_page.html', 'w', encoding='utf-8') as f:
-                f.write(driver.page_source)
+                f.write(page_html)
             log("Saved page source to /tmp/digitalpool_page.html for debugging")
         except:
             pass
         
-        # Try multiple selector strategies to find tournament cards
-        card_selectors = [
-            ".ant-card",
-            "[class*='tournament']",
-            "[class*='TournamentCard']",
-            ".card",
-            "div[class*='Card']"
-        ]
-        
-        tournament_cards = []
-        for selector in card_selectors:
-            try:
-                cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                if cards:
-                    log(f"Found {len(cards)} elements with selector: {selector}")
-                    tournament_cards = cards
-                    break
-            except:
-                continue
-        
-        if not tournament_cards:
-            log("Could not find tournament cards with standard selectors, trying alternative approach...")
-            # Fallback: look for any div that contains both venue and date pattern
-            all_divs = driver.find_elements(By.TAG_NAME, "div")
-            tournament_cards = [div for div in all_divs 
-                              if VENUE_NAME in div.text and re.search(r'\d{4}/\d{2}/\d{2}', div.text)]
-            log(f"Found {len(tournament_cards)} potential tournament divs with venue and date")
-        
-        log(f"Processing {len(tournament_cards)} potential tournament cards")
-        
         # DEBUG: Save all card HTML and text for inspection
         debug_dir = "/tmp/tournament_debug"
         try:
-            import os
             os.makedirs(debug_dir, exist_ok=True)
             log(f"Created debug directory: {debug_dir}")
         except:
             debug_dir = None
         
-        for idx, card in enumerate(tournament_cards):
-            try:
-                card_text = card.text
-                
-                # DEBUG: Save this card's HTML and text
-                if debug_dir:
-                    try:
-                        # Save HTML
-                        card_html = card.get_attribute('outerHTML')
-                        with open(f"{debug_dir}/card_{idx}_html.html", 'w', encoding='utf-8') as f:
-                            f.write(card_html)
-                        
-                        # Save text
-                        with open(f"{debug_dir}/card_{idx}_text.txt", 'w', encoding='utf-8') as f:
-                            f.write(card_text)
-                        
-                        log(f"Saved card {idx} debug files")
-                    except Exception as e:
-                        log(f"Could not save debug for card {idx}: {e}")
-                
-                # Check if this card is for Bankshot Billiards in Hilliard
-                if VENUE_NAME not in card_text:
-                    continue
-                
-                if VENUE_CITY not in card_text:
-                    log(f"Card {idx}: Found {VENUE_NAME} but not in {VENUE_CITY}, skipping")
-                    continue
-                
-                log(f"\n{'='*50}")
-                log(f"Card {idx} - Found matching venue!")
-                log(f"{'='*50}")
-                log(f"Card text:\n{card_text}\n")
-                
-                # DEBUG: Mark this as the matching card
-                if debug_dir:
-                    try:
-                        with open(f"{debug_dir}/MATCHING_CARD_{idx}.txt", 'w') as f:
-                            f.write(f"This is the matching tournament card!\n\n{card_text}")
-                        log(f"★ Marked card {idx} as MATCHING CARD")
-                    except:
-                        pass
-                
-                # Extract tournament name - try multiple strategies
-                tournament_name = None
-                
-                # Strategy 1: Look for heading elements
-                for tag in ['h1', 'h2', 'h3', 'h4', 'h5']:
-                    try:
-                        heading = card.find_element(By.TAG_NAME, tag)
-                        if heading.text and heading.text.strip() and VENUE_NAME not in heading.text:
-                            tournament_name = heading.text.strip()
-                            log(f"Found name in {tag}: {tournament_name}")
-                            break
-                    except:
-                        continue
-                
-                # Strategy 2: Look for elements with 'title' class
-                if not tournament_name:
-                    try:
-                        title_elem = card.find_element(By.CSS_SELECTOR, "[class*='title'], [class*='Title'], [class*='name'], [class*='Name']")
-                        if title_elem.text and title_elem.text.strip():
-                            tournament_name = title_elem.text.strip()
-                            log(f"Found name in title element: {tournament_name}")
-                    except:
-                        pass
-                
-                # Strategy 3: Look for first meaningful text line
-                if not tournament_name:
-                    lines = card_text.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if (line and 
-                            len(line) > 5 and 
-                            VENUE_NAME not in line and
-                            VENUE_CITY not in line and
-                            not re.match(r'^\d{4}/\d{2}/\d{2}', line) and
-                            'Showing tournaments' not in line):
-                            tournament_name = line
-                            log(f"Found name from text parsing: {tournament_name}")
-                            break
-                
-                if not tournament_name:
-                    tournament_name = f"Tournament at {VENUE_NAME}"
-                    log(f"Using default name: {tournament_name}")
-                
-                # Extract date
-                date_match = re.search(r'(\d{4}/\d{2}/\d{2})', card_text)
-                tournament_date = date_match.group(1) if date_match else None
-                log(f"Date: {tournament_date}")
-                
-                # Extract time - prioritize tournament start time over registration/check-in
-                start_time_str = None
-                all_times_found = []
-                
-                # First, try to find times with specific context keywords (most reliable)
-                priority_patterns = [
-                    (r'(?:Tournament\s+)?Start[s]?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Tournament Start'),
-                    (r'(?:Play\s+)?Start[s]?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Play Start'),
-                    (r'Start\s+Time[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Start Time'),
-                    (r'Begins?[:\s]+(\d{1,2}(?::\d{2})?\s*[AP]\.?M\.?)', 'Begins'),
-                ]
-                
-                for pattern, label in priority_patterns:
-                    time_match = re.search(pattern, card_text, re.IGNORECASE)
-                    if time_match:
-                        start_time_str = time_match.group(1).strip()
-                        log(f"Found time with priority pattern '{label}': {start_time_str}")
-                        break
-                
-                # If no priority pattern found, collect ALL times and filter out registration/check-in
-                if not start_time_str:
-                    log("No priority time pattern found, scanning for all times...")
-                    
-                    # Find all times in the card
-                    all_time_patterns = [
-                        r'(\d{1,2}:\d{2}\s*[AP]\.?M\.?)',  # 7:00 PM, 7:00PM
-                        r'(\d{1,2}\s*[AP]\.?M\.?)',         # 7 PM, 7PM
-                    ]
-                    
-                    for pattern in all_time_patterns:
-                        matches = re.finditer(pattern, card_text, re.IGNORECASE)
-                        for match in matches:
-                            time_val = match.group(1).strip()
-                            # Get context around the time (50 chars before and after)
-                            start_pos = max(0, match.start() - 50)
-                            end_pos = min(len(card_text), match.end() + 50)
-                            context = card_text[start_pos:end_pos]
-                            
-                            all_times_found.append({
-                                'time': time_val,
-                                'context': context
-                            })
-                    
-                    log(f"Found {len(all_times_found)} time(s) in card")
-                    
-                    # Filter out registration/check-in times
-                    filtered_times = []
-                    exclude_keywords = ['registration', 'check-in', 'check in', 'checkin', 'sign-in', 
-                                       'signin', 'sign in', 'doors', 'door open']
-                    
-                    for time_info in all_times_found:
-                        context_lower = time_info['context'].lower()
-                        is_excluded = any(keyword in context_lower for keyword in exclude_keywords)
-                        
-                        if is_excluded:
-                            log(f"  Excluding time {time_info['time']} (context suggests registration/check-in)")
-                            log(f"    Context: {time_info['context'][:100]}")
-                        else:
-                            filtered_times.append(time_info)
-                            log(f"  Keeping time {time_info['time']}")
-                            log(f"    Context: {time_info['context'][:100]}")
-                    
-                    # Use the LAST remaining time (tournament start is usually listed after registration)
-                    if filtered_times:
-                        start_time_str = filtered_times[-1]['time']
-                        log(f"Selected last filtered time as tournament start: {start_time_str}")
-                    elif all_times_found:
-                        # If all were filtered out, use the last one anyway
-                        start_time_str = all_times_found[-1]['time']
-                        log(f"All times were filtered, using last time anyway: {start_time_str}")
-                
-                if not start_time_str:
-                    log("No start time found in card text")
-                
-                start_time = parse_time_string(start_time_str) if start_time_str else None
-                
-                # Extract status - check for explicit keywords first, then infer from context
-                actual_status = "Unknown"
-                player_count = 0
-                
-                # Extract player count
-                player_match = re.search(r'(\d+)\s+Players?', card_text, re.IGNORECASE)
-                if player_match:
-                    player_count = int(player_match.group(1))
-                    log(f"  Player count: {player_count}")
-                
-                # First check for explicit status keywords
-                status_indicators = {
-                    "In Progress": ["In Progress", "Live", "Active", "Playing"],
-                    "Upcoming": ["Upcoming", "Scheduled", "Future"],
-                    "Completed": ["Completed", "Finished", "Final", "Ended"]
-                }
-                
-                for status, keywords in status_indicators.items():
-                    if any(keyword in card_text for keyword in keywords):
-                        actual_status = status
-                        log(f"Status from keyword: {actual_status}")
-                        break
-                
-                # If no explicit keyword, infer from context
-                if actual_status == "Unknown":
-                    log("No explicit status keyword found, inferring from context...")
-                    
-                    # Look for completion percentage
-                    completion_match = re.search(r'(\d+)%\s*Complete', card_text, re.IGNORECASE)
-                    if completion_match:
-                        completion_pct = int(completion_match.group(1))
-                        log(f"Found completion: {completion_pct}%")
-                        
-                        if completion_pct == 100:
-                            actual_status = "Completed"
-                            log("Status inferred: Completed (100% complete)")
-                        elif completion_pct == 0:
-                            # KEY CHANGE: Check if players are registered
-                            if player_count > 0:
-                                actual_status = "In Progress"
-                                log(f"Status inferred: In Progress (0% complete but {player_count} players registered)")
-                            else:
-                                actual_status = "Upcoming"
-                                log("Status inferred: Upcoming (0% complete, no players)")
-                        elif completion_pct > 0 and completion_pct < 100:
-                            actual_status = "In Progress"
-                            log("Status inferred: In Progress (partial completion)")
-                    else:
-                        # No completion percentage - check players and date/time
-                        if player_count > 0:
-                            actual_status = "In Progress"
-                            log(f"Status inferred: In Progress ({player_count} players registered)")
-                        elif tournament_date:
-                            # Check if today's date matches tournament date
-                            today = datetime.date.today()
-                            today_str = today.strftime("%Y/%m/%d")
-                            
-                            if tournament_date == today_str:
-                                # Today's tournament with no completion info - probably upcoming
-                                actual_status = "Upcoming"
-                                log("Status inferred: Upcoming (today's tournament, no completion data)")
-                            elif tournament_date < today_str:
-                                # Past tournament - probably completed
-                                actual_status = "Completed"
-                                log("Status inferred: Completed (past date)")
-                
-                log(f"Final status: {actual_status}")
-                
-                # Get tournament URL from link element
-                tournament_url = None
-                try:
-                    link_element = card.find_element(By.CSS_SELECTOR, "a[href*='/tournaments/']")
-                    tournament_url = link_element.get_attribute('href')
-                    log(f"Found URL from link: {tournament_url}")
-                except:
-                    # Fallback: construct URL
-                    if tournament_date and tournament_name:
-                        date_no_slashes = tournament_date.replace('/', '')
-                        
-                        # Remove date from tournament name to avoid duplication in URL
-                        # Tournament names often start with date like "2025/11/19 Wednesday Night..."
-                        name_for_url = tournament_name
-                        name_for_url = re.sub(r'^\d{4}/\d{2}/\d{2}\s+', '', name_for_url)  # Remove date prefix
-                        
-                        name_slug = re.sub(r'[^a-z0-9-]', '', name_for_url.lower().replace(' ', '-'))
-                        name_slug = re.sub(r'-+', '-', name_slug).strip('-')
-                        tournament_url = f"https://digitalpool.com/tournaments/{date_no_slashes}-{name_slug}/"
-                        log(f"Constructed URL: {tournament_url}")
-                
-                tournament_info = {
-                    'name': tournament_name,
-                    'venue': f"{VENUE_NAME}, {VENUE_CITY}",
-                    'date': tournament_date,
-                    'start_time': start_time_str,
-                    'start_time_parsed': start_time.strftime("%H:%M") if start_time else None,
-                    'status': actual_status,
-                    'url': tournament_url,
-                    'found_at': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                tournaments.append(tournament_info)
-                log(f"✓ Successfully extracted tournament info")
-                log(f"  Name: {tournament_name}")
-                log(f"  Date: {tournament_date}")
-                log(f"  Time: {start_time_str}")
-                log(f"  Status: {actual_status}")
-                
-            except Exception as e:
-                log(f"Error parsing tournament card {idx}: {e}")
-                import traceback
-                log(traceback.format_exc())
-                continue
+        if date_from or date_to:
+            log(f"Parsing cards dated {date_from or 'any'} to {date_to or 'any'}")
+        
+        tournaments = parse_listing_html(page_html, driver.current_url, date_from, date_to, debug_dir)
+        cards_found = len(tournaments or [])
+        if tournaments is None:
+            log("No .ant-card elements in page HTML - falling back to element search")
+            tournaments, cards_found = parse_card_elements(driver, date_from, date_to, debug_dir)
         
         if not tournaments:
             log("✗ No tournaments found for Hilliard location")
@@ -478,13 +712,13 @@ def search_tournaments_on_page(driver):
                     f.write("TOURNAMENT SCRAPER DEBUG SUMMARY\n")
                     f.write("="*60 + "\n\n")
                     f.write(f"Search Term: {search_term}\n")
-                    f.write(f"Total Cards Found: {len(tournament_cards)}\n")
+                    f.write(f"Total Cards Found: {cards_found}\n")
                     f.write(f"Matching Tournaments: {len(tournaments)}\n\n")
                     
                     f.write("FILES SAVED:\n")
                     f.write(f"- Full page HTML: /tmp/digitalpool_page.html\n")
-                    f.write(f"- Card HTML files: {debug_dir}/card_*_html.html\n")
-                    f.write(f"- Card text files: {debug_dir}/card_*_text.txt\n")
+                    f.write(f"- Card HTML files (prefiltered cards only): {debug_dir}/card_*_html.html\n")
+                    f.write(f"- Card text files (prefiltered cards only): {debug_dir}/card_*_text.txt\n")
                     f.write(f"- Matching cards: {debug_dir}/MATCHING_CARD_*.txt\n\n")
                     
                     if tournaments:
@@ -492,12 +726,12 @@ def search_tournaments_on_page(driver):
                         f.write("-"*60 + "\n")
                         for i, t in enumerate(tournaments, 1):
                             f.write(f"\nTournament {i}:\n")
-                            f.write(f"  Name: {t['name']}\n")
-                            f.write(f"  Venue: {t['venue']}\n")
-                            f.write(f"  Date: {t['date']}\n")
-                            f.write(f"  Start Time: {t['start_time']}\n")
-                            f.write(f"  Status: {t['status']}\n")
-                            f.write(f"  URL: {t['url']}\n")
+                            f.write(f"  Name: {t.name}\n")
+                            f.write(f"  Venue: {t.venue}\n")
+                            f.write(f"  Date: {t.date}\n")
+                            f.write(f"  Start Time: {t.start_time}\n")
+                            f.write(f"  Status: {t.status.value}\n")
+                            f.write(f"  URL: {t.url}\n")
                     else:
                         f.write("NO TOURNAMENTS FOUND\n")
                         f.write("\nPossible reasons:\n")
@@ -525,69 +759,386 @@ def search_tournaments_on_page(driver):
         log(f"Error searching tournaments: {e}")
         import traceback
         traceback.print_exc()
-        return []
+        return None
 
 
-def get_all_todays_tournaments():
-    """Get all tournaments at Bankshot for today"""
+def search_digitalpool(date_from=None, date_to=None, deadline=None):
+    """
+    Run the full DigitalPool venue search
+    Returns every matching tournament dated within date_from..date_to (any
+    date when not given), or None if the fetch failed or ran past deadline
+    (a time.monotonic() value - the browser is closed then, which stops it)
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+    
     driver = None
+    watchdog = None
+    overran = threading.Event()
+    
+    def stop_search():
+        overran.set()
+        log("✗ DigitalPool search ran past the source deadline - closing its browser")
+        close_browser(driver)
     
     try:
         log("="*60)
-        log("Searching for ALL Bankshot tournaments today...")
+        log("Searching for ALL Bankshot tournaments...")
         log("="*60)
         
-        driver = setup_driver(headless=True)
-        driver.get("https://www.digitalpool.com/tournaments")
+        with PROFILER.phase('browser_setup'):
+            driver = open_browser(headless=True)
         
-        log("Waiting for page to load...")
-        try:
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input"))
-            )
-            log("✓ Page loaded")
-        except TimeoutException:
-            log("✗ Page load timeout")
-            return []
+        if deadline is not None:
+            remaining = max(1, deadline - time.monotonic())
+            driver.set_page_load_timeout(remaining)
+            watchdog = threading.Timer(remaining, stop_search)
+            watchdog.daemon = True
+            watchdog.start()
         
-        time.sleep(3)
+        with PROFILER.phase('page_load'):
+            driver.get(DIGITALPOOL_URL)
+            
+            log("Waiting for page to load...")
+            try:
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input"))
+                )
+                log("✓ Page loaded")
+            except TimeoutException:
+                log("✗ Page load timeout")
+                return None
+            
+            time.sleep(3)
         
         # Search for tournaments
         log("Searching for tournaments...")
-        all_tournaments = search_tournaments_on_page(driver)
-        
-        if not all_tournaments:
-            log("No tournaments found")
-            return []
-        
-        # Filter to today's date
-        today = datetime.date.today()
-        today_str = today.strftime("%Y/%m/%d")
-        
-        todays_tournaments = [t for t in all_tournaments if t['date'] == today_str]
-        
-        log(f"\n{'='*60}")
-        log(f"Found {len(todays_tournaments)} tournament(s) for today ({today_str})")
-        log(f"{'='*60}")
-        
-        for t in todays_tournaments:
-            log(f"\n  Tournament: {t['name']}")
-            log(f"  Start time: {t['start_time']}")
-            log(f"  Status: {t['status']}")
-        
-        return todays_tournaments
+        with PROFILER.phase('search'):
+            tournaments = search_tournaments_on_page(driver, date_from, date_to)
+        return None if overran.is_set() else tournaments
         
     except Exception as e:
+        if overran.is_set():
+            return None
         log(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return None
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+            watchdog.join()  # If it is closing the browser right now, let it finish
+        if driver and not overran.is_set():
+            close_browser(driver)
+
+
+class DigitalPoolSource(TournamentSource):
+    """
+    DigitalPool's venue search. Cards are read during the browser session
+    (the element fallback needs the live page), so fetch already returns
+    Tournaments and parse only applies the date range.
+    """
+    
+    name = 'digitalpool'
+    
+    def fetch(self, date_from=None, date_to=None, deadline=None):
+        tournaments = search_digitalpool(date_from, date_to, deadline)
+        if tournaments is None:
+            raise SourceError("venue search failed")
+        return tournaments
+    
+    def parse(self, raw, date_from=None, date_to=None):
+        return [t for t in raw if in_range(t, date_from, date_to)]
+
+
+def configured_sources():
+    """DigitalPool first (it wins merges), then any extra feeds"""
+    return [DigitalPoolSource()] + [JsonFeedSource(url) for url in TOURNAMENT_FEEDS]
+
+
+def fetch_all_tournaments(date_from=None, date_to=None):
+    """
+    Fetch from every configured source at once, merged and de-duplicated
+    Returns the tournaments dated within date_from..date_to, or None if
+    DigitalPool (the primary source) could not be read
+    """
+    tournaments, _ = fetch_sources(configured_sources(), date_from, date_to, log=log)
+    return tournaments
+
+
+def record_changes(tournaments):
+    """Diff parsed tournaments against the previous snapshot and append change events"""
+    if not tournaments:
         return []
+    
+    try:
+        yesterday_str = today_string(datetime.date.today() - datetime.timedelta(days=1))
+        with PROFILER.phase('events'):
+            events = update_snapshot(SNAPSHOT_FILE, tournaments, keep_since=yesterday_str)
+            append_events(EVENTS_FILE, events)
+    except Exception as e:
+        log(f"✗ Error recording change events: {e}")
+        return []
+    
+    for event in events:
+        log(f"  Event: {event['type']} - {event.get('name')} ({event['old']} → {event['new']})")
+    return events
+
+
+def track_progress(tournaments, progress=None):
+    """Add completion samples to the progress series and log each ETA"""
+    progress = progress if progress is not None else load_progress(PROGRESS_FILE)
+    if not tournaments:
+        return progress
+    
+    progress.observe(tournaments)
+    progress.prune()
+    try:
+        save_progress(progress, PROGRESS_FILE)
+    except Exception as e:
+        log(f"✗ Error saving progress to {PROGRESS_FILE}: {e}")
+    
+    for t in tournaments:
+        eta = progress.eta(t.url) if t.url else None
+        if eta and t.status is TournamentStatus.IN_PROGRESS:
+            log(f"  ETA: {t.name} {t.completion_pct}% complete, expected to finish ~{format_epoch(eta)}")
+    return progress
+
+
+def log_todays_tournaments(todays_tournaments, today_str):
+    """Log the tournaments found for today"""
+    log(f"\n{'='*60}")
+    log(f"Found {len(todays_tournaments)} tournament(s) for today ({today_str})")
+    log(f"{'='*60}")
+    
+    for t in todays_tournaments:
+        log(f"\n  Tournament: {t.name}")
+        log(f"  Start time: {t.start_time}")
+        log(f"  Status: {t.status.value}")
+
+
+def get_all_todays_tournaments():
+    """Get all tournaments at Bankshot for today (None if the fetch failed)"""
+    today_str = today_string()
+    all_tournaments = fetch_all_tournaments(date_from=today_str, date_to=today_str)
+    
+    if all_tournaments is None:
+        log("✗ Listing search failed")
+        return None
+    
+    if not all_tournaments:
+        log("No tournaments found")
+        return []
+    
+    # Filter to today's date
+    todays_tournaments = [t for t in all_tournaments if t.is_on(today_str)]
+    log_todays_tournaments(todays_tournaments, today_str)
+    record_changes(todays_tournaments)
+    track_progress(todays_tournaments)
+    
+    return todays_tournaments
+
+
+def sync_schedule(today_str):
+    """
+    Scrape the full upcoming list once and store it as the indexed schedule
+    Returns the new Schedule, or None if the scrape failed
+    """
+    all_tournaments = fetch_all_tournaments(date_from=today_str)
+    
+    if all_tournaments is None:
+        log("✗ Schedule sync failed - keeping previous schedule")
+        return None
+    
+    schedule = Schedule.from_tournaments(all_tournaments, today_str)
+    record_changes([t for day in schedule.days.values() for t in day])
+    
+    try:
+        save_schedule(schedule, SCHEDULE_FILE)
+        log(f"✓ Schedule synced to {SCHEDULE_FILE}")
+    except Exception as e:
+        log(f"✗ Error saving schedule to {SCHEDULE_FILE}: {e}")
+    
+    for date_str, day in sorted(schedule.days.items()):
+        log(f"  {date_str}: {len(day)} tournament(s)")
+    
+    return schedule
+
+
+def tournament_page_ready(driver):
+    """Readiness check for a tournament page: loaded and has body text"""
+    return driver.execute_script(
+        "return document.readyState === 'complete' && !!document.body && document.body.innerText.length > 0"
+    )
+
+
+def read_tournament_page(driver, tournament):
+    """
+    Refresh a tournament's status and player count from its loaded page
+    Returns an updated Tournament, or None if the status could not be read
+    """
+    from selenium.webdriver.common.by import By
+    
+    page_text = driver.find_element(By.TAG_NAME, "body").text
+    status, player_count, completion_pct = parse_status_from_text(page_text, tournament.date)
+    if status is TournamentStatus.UNKNOWN:
+        log(f"✗ Could not determine status from tournament page: {tournament.name}")
+        return None
+    
+    matches = parse_bracket(page_text)
+    if matches and tournament.url:
+        LIVE_BRACKETS[tournament.url] = matches
+    
+    return Tournament(
+        tournament.name,
+        venue=tournament.venue,
+        date=tournament.date,
+        start_time=tournament.start_time,
+        start_time_parsed=tournament.start_time_parsed,
+        status=status,
+        url=tournament.url,
+        found_at=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        player_count=player_count,
+        completion_pct=completion_pct,
+        entry_fee=parse_entry_fee(page_text) or tournament.entry_fee
+    )
+
+
+def recheck_tournament_by_url(driver, tournament):
+    """
+    Load a tournament's own page and refresh its status and player count
+    Returns an updated Tournament, or None if the page could not be read
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
+    if not tournament.url:
+        return None
+    
+    try:
+        log(f"Re-checking {tournament.name} at {tournament.url}")
+        driver.get(tournament.url)
+        WebDriverWait(driver, 20).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+        time.sleep(PAGE_SETTLE)
+        return read_tournament_page(driver, tournament)
+    except Exception as e:
+        log(f"✗ Could not load tournament page: {e}")
+        return None
+
+
+def recheck_tournaments(tournaments, progress=None):
+    """
+    Re-check each tournament through its own URL, loading the pages in
+    parallel tabs of a single browser
+    Tournaments whose completion ETA is still far off keep their cached copy
+    Returns the updated list, or None if any of them could not be read
+    """
+    driver = None
+    
+    # Completed tournaments stay completed - no need to fetch them again
+    due = [t for t in tournaments if t.status is not TournamentStatus.COMPLETED]
+    if progress is not None:
+        now = time.time()
+        for t in [t for t in due if t.url and not progress.is_due(t.url, now)]:
+            log(f"○ {t.name}: {t.completion_pct}% complete, next check at "
+                f"{format_epoch(progress.next_check_at(t.url))} (ETA {format_epoch(progress.eta(t.url))})")
+            due.remove(t)
+    if not due:
+        return list(tournaments)
+    if any(not t.url for t in due):
+        log("✗ Tournament without a URL - cannot re-check by URL")
+        return None
+    
+    try:
+        with PROFILER.phase('browser_setup'):
+            driver = open_browser(headless=True, page_load_strategy='none')
+        pool = BrowserPool(driver, max_tabs=RECHECK_TABS, log=log)
+        
+        tasks = {}
+        for tournament in due:
+            log(f"Re-checking {tournament.name} at {tournament.url}")
+            tasks[tournament.url] = BrowserTask(
+                tournament.name,
+                tournament.url,
+                lambda d, t=tournament: read_tournament_page(d, t),
+                ready=tournament_page_ready,
+                timeout=RECHECK_TIMEOUT,
+                settle=PAGE_SETTLE
+            )
+        
+        with PROFILER.phase('recheck'):
+            pool.run_all(list(tasks.values()))
+        
+        rechecked = []
+        for tournament in tournaments:
+            task = tasks.get(tournament.url)
+            if task is None:
+                rechecked.append(tournament)
+            elif not task.ok or task.result is None:
+                return None
+            else:
+                rechecked.append(task.result)
+        return rechecked
+    except Exception as e:
+        log(f"Error re-checking tournaments: {e}")
+        return None
     finally:
         if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            close_browser(driver)
+
+
+def get_todays_tournaments(force_sync=False):
+    """
+    Get today's tournaments using the week-ahead schedule cache:
+    - Sync the full upcoming list once a day (or when forced)
+    - Otherwise re-check only the tournaments scheduled for today
+    - Skip scraping entirely when nothing is scheduled today
+    Returns None if DigitalPool could not be read
+    """
+    today_str = today_string()
+    with PROFILER.phase('schedule'):
+        schedule = load_schedule(SCHEDULE_FILE)
+    
+    if force_sync or not schedule.is_synced_for(today_str):
+        log("Schedule not synced for today - running schedule sync")
+        synced = sync_schedule(today_str)
+        if synced is None:
+            return None
+        todays_tournaments = synced.tournaments_on(today_str)
+        log_todays_tournaments(todays_tournaments, today_str)
+        track_progress(todays_tournaments)
+        return todays_tournaments
+    
+    due = schedule.tournaments_on(today_str)
+    if not due:
+        log(f"Nothing scheduled for {today_str} - skipping scrape")
+        return []
+    
+    log(f"{len(due)} tournament(s) scheduled for {today_str} - re-checking by URL")
+    progress = load_progress(PROGRESS_FILE)
+    rechecked = recheck_tournaments(due, progress)
+    
+    if rechecked is None:
+        log("Re-check failed - falling back to full listing search")
+        return get_all_todays_tournaments()
+    
+    schedule.update(rechecked)
+    record_changes(rechecked)
+    # Only freshly read tournaments are new progress samples
+    cached = {id(t) for t in due}
+    track_progress([t for t in rechecked if id(t) not in cached], progress)
+    try:
+        save_schedule(schedule, SCHEDULE_FILE)
+    except Exception as e:
+        log(f"✗ Error saving schedule to {SCHEDULE_FILE}: {e}")
+    
+    log_todays_tournaments(rechecked, today_str)
+    return rechecked
 
 
 def determine_which_tournament_to_display(tournaments):
@@ -607,7 +1158,7 @@ def determine_which_tournament_to_display(tournaments):
     log("="*60)
     
     # Check for any "In Progress" tournaments
-    in_progress = [t for t in tournaments if t['status'] == 'In Progress']
+    in_progress = [t for t in tournaments if t.status is TournamentStatus.IN_PROGRESS]
     
     if in_progress:
         log(f"Found {len(in_progress)} tournament(s) in progress")
@@ -615,14 +1166,12 @@ def determine_which_tournament_to_display(tournaments):
         # If multiple in progress, show the latest one (by start time)
         if len(in_progress) > 1:
             # Sort by start time
-            sorted_in_progress = sorted(in_progress, 
-                                       key=lambda x: x['start_time_parsed'] if x['start_time_parsed'] else "00:00",
-                                       reverse=True)
+            sorted_in_progress = sorted(in_progress, key=lambda x: x.sort_key, reverse=True)
             selected = sorted_in_progress[0]
-            log(f"Multiple in progress - selecting latest: {selected['name']} at {selected['start_time']}")
+            log(f"Multiple in progress - selecting latest: {selected.name} at {selected.start_time}")
         else:
             selected = in_progress[0]
-            log(f"Selecting in-progress tournament: {selected['name']}")
+            log(f"Selecting in-progress tournament: {selected.name}")
         
         return selected
     
@@ -630,19 +1179,18 @@ def determine_which_tournament_to_display(tournaments):
     log("No tournaments in progress")
     
     # Filter out completed tournaments
-    not_completed = [t for t in tournaments if t['status'] != 'Completed']
+    not_completed = [t for t in tournaments if t.status is not TournamentStatus.COMPLETED]
     
     if not not_completed:
         log("All tournaments are completed - no tournament to display")
         return None
     
     # Sort by start time to get first scheduled
-    sorted_tournaments = sorted(not_completed,
-                                key=lambda x: x['start_time_parsed'] if x['start_time_parsed'] else "00:00")
+    sorted_tournaments = sorted(not_completed, key=lambda x: x.sort_key)
     
     selected = sorted_tournaments[0]
-    log(f"Selecting first scheduled tournament: {selected['name']} at {selected['start_time']}")
-    log(f"Status: {selected['status']}")
+    log(f"Selecting first scheduled tournament: {selected.name} at {selected.start_time}")
+    log(f"Status: {selected.status.value}")
     
     return selected
 
@@ -656,70 +1204,161 @@ def check_previous_tournament_still_active():
         with open(DATA_FILE, 'r') as f:
             prev_data = json.load(f)
         
+        prev = Tournament.from_record(prev_data)
+        
         # Check if we were displaying a tournament
-        if prev_data.get('display_tournament') and prev_data.get('status') == 'In Progress':
-            tournament_date = prev_data.get('date')
+        if prev and prev.display and prev.status is TournamentStatus.IN_PROGRESS:
+            tournament_date = prev.date
             
             # If tournament was from yesterday but still in progress
             if tournament_date:
                 prev_date = datetime.datetime.strptime(tournament_date, "%Y/%m/%d").date()
                 today = datetime.date.today()
                 
-                if prev_date < today:
+                # Only carry over last night's tournament, not stale records
+                if prev_date == today - datetime.timedelta(days=1):
                     log(f"Previous tournament from {tournament_date} may still be active")
                     log(f"Will need to verify status on DigitalPool")
-                    return prev_data
+                    return prev
         
         return None
     except:
         return None
 
 
+def recheck_previous_tournament(prev_tournament):
+    """
+    Fast path for the after-midnight case: re-check only last night's tournament
+    through its stored URL (no listing search) and keep it selected until it
+    reports Completed. One check per run - the run cadence does the polling,
+    and the completion ETA decides whether this run loads the page at all.
+    Returns the tournament while it is still active, or None once it has completed.
+    """
+    progress = load_progress(PROGRESS_FILE)
+    if not progress.is_due(prev_tournament.url):
+        log(f"Previous tournament expected to finish ~{format_epoch(progress.eta(prev_tournament.url))} - "
+            f"next check at {format_epoch(progress.next_check_at(prev_tournament.url))}")
+        return prev_tournament
+    
+    driver = None
+    try:
+        with PROFILER.phase('browser_setup'):
+            driver = open_browser(headless=True)
+        
+        with PROFILER.phase('recheck'):
+            updated = recheck_tournament_by_url(driver, prev_tournament)
+        
+        if updated is None:
+            log("Could not re-check previous tournament - keeping it selected")
+            return prev_tournament
+        
+        record_changes([updated])
+        track_progress([updated], progress)
+        if updated.status is TournamentStatus.COMPLETED:
+            log(f"✓ Previous tournament completed: {updated.name}")
+            return None
+        
+        log(f"Previous tournament still {updated.status.value} ({updated.player_count} players)")
+        return updated
+    except Exception as e:
+        log(f"Error re-checking previous tournament: {e}")
+        return prev_tournament
+    finally:
+        if driver:
+            close_browser(driver)
+
+
+def lookup_payouts(tournament):
+    """
+    Payout rows for the tournament's entry fee and current field, from the
+    precomputed tables ([] when the venue hasn't configured that fee)
+    """
+    global PAYOUT_TABLES
+    if PAYOUT_TABLES is None:
+        PAYOUT_TABLES = load_payout_tables(PAYOUT_FILE, load_payout_structures(PAYOUT_STRUCTURE_FILE))
+    
+    fee = tournament.entry_fee or default_entry_fee(tournament.name)
+    rows = PAYOUT_TABLES.lookup(fee, tournament.player_count)
+    if PAYOUT_TABLES.dirty:
+        try:
+            save_payout_tables(PAYOUT_TABLES, PAYOUT_FILE)
+            if PAYOUT_TABLES.structures.get(str(fee)):
+                log(f"✓ Built payout tables for ${fee} entry")
+            else:
+                log(f"○ No payout structure for ${fee} entry in {PAYOUT_STRUCTURE_FILE} - display uses the static payout file")
+        except Exception as e:
+            log(f"✗ Error saving payout tables: {e}")
+    return rows
+
+
+def publish_bracket(tournament):
+    """Append the displayed tournament's bracket changes to the delta feed (if its page was read this run)"""
+    matches = LIVE_BRACKETS.get(tournament.url) if tournament and tournament.url else None
+    if not matches:
+        return
+    
+    try:
+        feed = BracketFeed.load(BRACKET_FILE)
+        ops = feed.update(tournament.url, matches)
+        if ops:
+            finished = sum(1 for op in ops if op.get('kind') == 'finished')
+            log(f"✓ Bracket version {feed.version}: {len(ops)} change(s), {finished} match(es) finished")
+    except Exception as e:
+        log(f"✗ Error updating bracket feed: {e}")
+
+
 def save_tournament_data(tournament):
     """Save tournament data to JSON files"""
     if not tournament:
-        output_data = {
-            'tournament_name': 'No tournaments to display',
-            'tournament_url': None,
-            'venue': None,
-            'date': None,
-            'start_time': None,
-            'status': None,
-            'payout_data': None,
-            'last_updated': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'display_tournament': False
-        }
+        output_data = empty_record()
     else:
-        # Determine payout data
+        # Static payout file: the PHP page's table, and the static page's when there are no rows
         payout_data = 'payouts15.json'
-        if tournament['name']:
-            if '8-ball' in tournament['name'].lower():
+        if tournament.name:
+            if '8-ball' in tournament.name.lower():
                 payout_data = 'payouts20.json'
         
         # Display if status is "In Progress" OR "Upcoming"
-        should_display = (tournament['status'] in ['In Progress', 'Upcoming'])
-        
-        output_data = {
-            'tournament_name': tournament['name'],
-            'tournament_url': tournament['url'],
-            'venue': tournament['venue'],
-            'date': tournament['date'],
-            'start_time': tournament['start_time'],
-            'status': tournament['status'],
-            'payout_data': payout_data,
-            'last_updated': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'display_tournament': should_display
-        }
-        
-        log(f"\nTournament to display: {tournament['name']}")
-        log(f"Status: {tournament['status']}")
+        should_display = tournament.status.is_displayable
+        
+        output_data = tournament.to_record(payout_data=payout_data, payouts=lookup_payouts(tournament))
+        
+        log(f"\nTournament to display: {tournament.name}")
+        log(f"Status: {tournament.status.value}")
         log(f"Display flag: {should_display}")
         if should_display:
             log("✓ Tournament will be displayed (Upcoming or In Progress)")
         else:
             log("○ Tournament will NOT be displayed (status is not Upcoming/In Progress)")
     
-    # Save to both locations
+    # Tell consumers when what's on screen changes
+    previous = load_record(DATA_FILE) or {}
+    watched = ('tournament_url', 'status', 'display_tournament')
+    if any(previous.get(key) != output_data.get(key) for key in watched):
+        event = make_event(
+            EventType.DISPLAY_CHANGED,
+            tournament,
+            old={key: previous.get(key) for key in watched},
+            new={key: output_data.get(key) for key in watched}
+        )
+        try:
+            append_events(EVENTS_FILE, [event])
+        except Exception as e:
+            log(f"✗ Error recording display change: {e}")
+    
+    output_data['stale'] = False
+    stamp_scrape(output_data, previous)
+    write_record(output_data)
+    publish_bracket(tournament)
+    
+    try:
+        save_last_good(LAST_GOOD_FILE, output_data)
+    except Exception as e:
+        log(f"✗ Error saving last-known-good snapshot: {e}")
+
+
+def write_record(output_data):
+    """Save a record to both locations"""
     for file_path in [DATA_FILE, DATA_FILE_BACKUP]:
         try:
             with open(file_path, 'w') as f:
@@ -727,27 +1366,138 @@ def save_tournament_data(tournament):
             log(f"✓ Saved to {file_path}")
         except Exception as e:
             log(f"✗ Error saving to {file_path}: {e}")
+    
+    # Render the static display page once per state change (not in CI, where
+    # the web directory is relative and there is no display)
+    if RENDER_DIR:
+        try:
+            rendered = render_if_changed(output_data, RENDER_DIR)
+            if rendered:
+                log(f"✓ Rendered static display page {rendered}")
+        except Exception as e:
+            log(f"✗ Error rendering display page: {e}")
 
 
-def main():
-    """Main execution"""
+def serve_last_good_record():
+    """
+    Keep the last good record on the displays while DigitalPool is unreachable,
+    marked stale with its age instead of being replaced by "No tournaments"
+    Returns the exit code for this run
+    """
+    record = load_record(DATA_FILE)
+    if not record:
+        log("○ No last good record to serve")
+        return 1
+    
+    try:
+        last_good = datetime.datetime.strptime(record.get('last_updated'), '%Y-%m-%d %H:%M:%S')
+        age = int((datetime.datetime.now() - last_good).total_seconds())
+    except (TypeError, ValueError):
+        age = None
+    
+    record['stale'] = True
+    record['stale_age_seconds'] = age
+    log(f"Serving last good record ({age}s old): {record.get('tournament_name')}")
+    write_record(record)
+    
+    return 0 if record.get('display_tournament') else 1
+
+
+def publish_last_good():
+    """
+    Warm start: publish the last-known-good snapshot immediately if it is
+    still plausible for the current date and time. Returns True if published.
+    """
+    record = warm_start_record(LAST_GOOD_FILE)
+    if record is None:
+        log("○ No plausible last-known-good snapshot to publish")
+        return False
+    
+    log(f"⚡ Warm start: publishing last-known-good record: {record.get('tournament_name')}")
+    write_record(record)
+    return True
+
+
+def persist_breaker(breaker):
+    try:
+        save_breaker(breaker, BREAKER_FILE)
+    except Exception as e:
+        log(f"✗ Error saving circuit breaker state: {e}")
+
+
+def run(sync_schedule=False, force=False):
+    """
+    Run one monitor pass - unless another trigger's pass is running (wait
+    for it and share its result) or finished under SCRAPE_FRESH_SECONDS ago
+    force (and sync_schedule) skip the freshness check but still wait their turn
+    Returns the process exit code: 0 if a tournament is selected, 1 otherwise
+    """
+    install_browser_hooks()
+    fresh_for = 0 if force or sync_schedule else SCRAPE_FRESH_SECONDS
+    flight = SingleFlight(SCRAPE_STATE_FILE, fresh_for=fresh_for, log=log)
+    return flight.run(lambda: run_pass(sync_schedule))
+
+
+def run_pass(sync_schedule=False):
+    """
+    Run one monitor pass and save the result
+    Returns the process exit code: 0 if a tournament is selected, 1 otherwise
+    """
     log("\n" + "="*60)
     log("BANKSHOT BILLIARDS TOURNAMENT MONITOR - MULTI-TOURNAMENT")
     log("="*60)
     
+    # Don't burn page-load timeouts on a site that keeps failing
+    breaker = load_breaker(BREAKER_FILE)
+    breaker_state = breaker.state()
+    
+    if breaker_state is BreakerState.OPEN:
+        log(f"Circuit breaker OPEN after {breaker.consecutive_failures} failure(s) - not scraping")
+        return serve_last_good_record()
+    
+    if breaker_state is BreakerState.HALF_OPEN:
+        log("Circuit breaker half-open - probing DigitalPool...")
+        if not probe(DIGITALPOOL_URL):
+            breaker.record_failure("probe failed")
+            persist_breaker(breaker)
+            log(f"✗ Probe failed - backing off for {breaker.backoff}s")
+            return serve_last_good_record()
+        log("✓ Probe succeeded - resuming full scrapes")
+    
     # Check if previous tournament might still be active (after midnight)
     prev_tournament = check_previous_tournament_still_active()
     if prev_tournament:
         log("Checking if previous day's tournament is still active...")
+        with PROFILER.phase('previous_tournament'):
+            still_active = recheck_previous_tournament(prev_tournament)
+        
+        if still_active:
+            save_tournament_data(still_active)
+            log("\n" + "="*60)
+            log("MONITOR COMPLETED - previous tournament still active")
+            log("="*60)
+            return 0
     
-    # Get all today's tournaments
-    tournaments = get_all_todays_tournaments()
+    # Get all today's tournaments (schedule cache decides how much to scrape)
+    tournaments = get_todays_tournaments(force_sync=sync_schedule)
+    
+    if tournaments is None:
+        breaker.record_failure("scrape failed")
+        persist_breaker(breaker)
+        log(f"✗ DigitalPool fetch failed ({breaker.consecutive_failures} in a row)")
+        return serve_last_good_record()
+    
+    if breaker_state is not BreakerState.CLOSED or breaker.consecutive_failures:
+        breaker.record_success()
+        persist_breaker(breaker)
     
     # Determine which one to display
-    selected_tournament = determine_which_tournament_to_display(tournaments)
+    with PROFILER.phase('select'):
+        selected_tournament = determine_which_tournament_to_display(tournaments)
     
     # Save results
-    save_tournament_data(selected_tournament)
+    with PROFILER.phase('save'):
+        save_tournament_data(selected_tournament)
     
     log("\n" + "="*60)
     log("MONITOR COMPLETED")
@@ -755,10 +1505,75 @@ def main():
     
     if selected_tournament:
         log(f"✓ Selected tournament to display")
-        sys.exit(0)
+        return 0
     else:
         log("○ No tournament to display")
-        sys.exit(1)
+        return 1
+
+
+def install_browser_hooks():
+    """
+    Once per process, from whichever trigger runs first (CLI, smart switcher,
+    supervisor thread): reap Chrome left behind by killed runs and make sure
+    this process's own browsers are reaped at exit
+    """
+    global BROWSER_HOOKS_INSTALLED
+    with BROWSER_HOOKS:
+        if BROWSER_HOOKS_INSTALLED:
+            return
+        BROWSER_HOOKS_INSTALLED = True
+        
+        browser_run().reap_orphans()
+        atexit.register(finish_browsers)
+        # Turn SIGTERM into a normal exit so the finally blocks and the exit hook run - unless
+        # the host process handles SIGTERM itself (signals can only be set from the main thread)
+        if threading.current_thread() is threading.main_thread() \
+                and signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None):
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+
+
+def finish_browsers():
+    """Exit hook: reap any browser this run still has open and log the run's browser usage"""
+    run = browser_run()
+    run.close_all()
+    summary = run.summary()
+    if summary:
+        log(summary)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Bankshot Billiards tournament monitor")
+    parser.add_argument('--sync-schedule', action='store_true',
+                        help="Force a full schedule sync instead of re-checking today's cached tournaments")
+    parser.add_argument('--warm-start', action='store_true',
+                        help="Publish the last-known-good snapshot first, then refresh it with a normal run")
+    parser.add_argument('--publish-last-good', action='store_true',
+                        help="Only publish the last-known-good snapshot (if still plausible) and exit")
+    parser.add_argument('--force', action='store_true',
+                        help=f"Scrape even if the last run finished less than {SCRAPE_FRESH_SECONDS}s ago "
+                             "(still waits for a run already in progress)")
+    parser.add_argument('--backend', choices=BROWSER_BACKENDS, default=None,
+                        help="Browser backend: chromedriver (default) or direct Chrome DevTools Protocol "
+                             "(also settable with TOURNAMENT_BROWSER_BACKEND)")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    
+    global PROFILER, BROWSER_BACKEND
+    PROFILER = make_profiler(args.profile, "bankshot_monitor")
+    if args.backend:
+        BROWSER_BACKEND = args.backend
+    
+    if args.publish_last_good:
+        sys.exit(0 if publish_last_good() else 1)
+    
+    # A killed run (CI timeout, crash) can leave Chrome behind - clean up before starting another
+    install_browser_hooks()
+    
+    if args.warm_start:
+        publish_last_good()
+    
+    sys.exit(run(sync_schedule=args.sync_schedule, force=args.force))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Live Bracket Feed
+Reads the bracket (players, matches, scores) of the displayed tournament
+from its DigitalPool page into a small normalized structure and publishes
+changes as versioned deltas, so a display only downloads what changed
+instead of the whole bracket page.
+
+The feed is an append-only JSONL log: a snapshot line followed by delta
+lines, each with the version it produces.
+
+    {"v": 1, "url": "...", "snapshot": {"players": [...], "matches": {...}}}
+    {"v": 2, "ops": [{"op": "match", "id": "7", "kind": "finished", "set": {...}}]}
+
+A display that is behind replays the deltas after its version; one that is
+too far behind (or on another tournament) gets a snapshot instead. The log
+is rewritten as a single snapshot line once it grows past MAX_DELTAS, and
+whenever the tournament changes or a match disappears.
+"""
+
+import json
+import os
+import re
+
+
+MAX_DELTAS = 200  # Delta lines kept before the log is compacted into a snapshot
+MAX_REPLAY = 50  # Further behind than this, a snapshot is smaller than the deltas
+
+NO_PLAYER = {'tbd', 'bye', ''}
+
+# 'Match 7: Alice Smith 7 - 3 Bob Jones (Completed)' / 'Match 9: Alice Smith vs TBD'
+# This is the line shape expected in the page's innerText, not a documented
+# DigitalPool format; a page without such lines yields no matches, so nothing
+# is published and the display page shows no match table
+_SCORED_MATCH = re.compile(
+    r'^Match\s+(\d+):?\s+(.+?)\s+(\d+)\s*[-–]\s*(\d+)\s+(.+?)(?:\s+\(([^)]*)\))?$', re.IGNORECASE)
+_OPEN_MATCH = re.compile(r'^Match\s+(\d+):?\s+(.+?)\s+vs\.?\s+(.+?)(?:\s+\(([^)]*)\))?$', re.IGNORECASE)
+_ROUND = re.compile(r'^(?:(Winners|Losers)\s+)?Round\s+(\d+)$', re.IGNORECASE)
+_FINALS = re.compile(r'^(Hot Seat|(?:True\s+)?Finals?)$', re.IGNORECASE)
+
+
+def _player_name(text):
+    name = ' '.join(text.split())
+    return None if name.lower() in NO_PLAYER else name
+
+
+def _match_status(label, scores):
+    label = (label or '').strip().lower()
+    if label in ('completed', 'final', 'finished'):
+        return 'completed'
+    if label in ('in progress', 'live', 'playing') or any(scores):
+        return 'in_progress'
+    return 'pending'
+
+
+def parse_bracket(page_text):
+    """
+    Matches from a tournament page's text, in page order
+    Each is {id, round, names: [a, b], scores: [a, b], status}; names are
+    None for open slots (TBD/Bye) and scores None before a match starts
+    """
+    matches = []
+    current_round = None
+    for line in (page_text or '').splitlines():
+        line = line.strip()
+        round_match = _ROUND.match(line)
+        if round_match:
+            side, number = round_match.groups()
+            current_round = f"{(side or 'R')[0].upper()}{number}"
+            continue
+        if _FINALS.match(line):
+            current_round = line.title()
+            continue
+
+        scored = _SCORED_MATCH.match(line)
+        if scored:
+            match_id, first, score1, score2, second, label = scored.groups()
+            scores = [int(score1), int(score2)]
+        else:
+            scored = _OPEN_MATCH.match(line)
+            if not scored:
+                continue
+            match_id, first, second, label = scored.groups()
+            scores = [None, None]
+        matches.append({
+            'id': match_id,
+            'round': current_round,
+            'names': [_player_name(first), _player_name(second)],
+            'scores': scores,
+            'status': _match_status(label, [s for s in scores if s]),
+        })
+    return matches
+
+
+class BracketState:
+    """Normalized bracket: players by id, matches by DigitalPool match number"""
+
+    __slots__ = ('url', 'version', 'players', 'matches')
+
+    def __init__(self):
+        self.url = None
+        self.version = 0
+        self.players = []
+        self.matches = {}
+
+    def snapshot(self):
+        return {'players': list(self.players), 'matches': json.loads(json.dumps(self.matches))}
+
+    def load_snapshot(self, url, version, snapshot):
+        self.url = url
+        self.version = version
+        self.players = list(snapshot.get('players', []))
+        self.matches = snapshot.get('matches', {})
+
+    def apply(self, version, ops):
+        """Apply one delta's ops and move to its version"""
+        for op in ops:
+            if op['op'] == 'player':
+                self.players.append(op['name'])
+            elif op['op'] == 'match':
+                self.matches.setdefault(op['id'], {}).update(op['set'])
+        self.version = version
+
+    def to_dict(self):
+        return {'url': self.url, 'version': self.version, **self.snapshot()}
+
+
+class BracketFeed(BracketState):
+    """The scraper's side: diffs each read of the bracket and appends the deltas to the log"""
+
+    __slots__ = ('path', 'base', 'deltas')
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.base = 0
+        self.deltas = []
+
+    @classmethod
+    def load(cls, path):
+        """Replay the log (from its snapshot line); an unreadable log starts an empty feed"""
+        feed = cls(path)
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if 'snapshot' in entry:
+                        feed.load_snapshot(entry.get('url'), entry['v'], entry['snapshot'])
+                        feed.base = entry['v']
+                        feed.deltas = []
+                    else:
+                        feed.apply(entry['v'], entry['ops'])
+                        feed.deltas.append(entry)
+        except (OSError, ValueError, KeyError):
+            return cls(path)
+        return feed
+
+    def _player_id(self, name, ops):
+        if name is None:
+            return None
+        if name not in self.players:
+            ops.append({'op': 'player', 'id': len(self.players), 'name': name})
+            self.players.append(name)
+        return self.players.index(name)
+
+    def _normalize(self, match, ops):
+        ids = [self._player_id(name, ops) for name in match['names']]
+        winner = None
+        if match['status'] == 'completed' and None not in match['scores'] and match['scores'][0] != match['scores'][1]:
+            winner = ids[0] if match['scores'][0] > match['scores'][1] else ids[1]
+        return {'round': match['round'], 'players': ids, 'scores': match['scores'],
+                'status': match['status'], 'winner': winner}
+
+    def update(self, url, parsed):
+        """
+        Diff a fresh parse_bracket() read against the feed and log the change
+        Returns the ops of the new version ([] if nothing changed)
+        """
+        if url != self.url or not set(self.matches) <= {m['id'] for m in parsed}:
+            # Another tournament, or the bracket was redrawn: start over from a snapshot
+            self.url = url
+            self.players = []
+            self.matches = {}
+            ops = []
+            for match in parsed:
+                self.matches[match['id']] = self._normalize(match, ops)
+            self.version += 1
+            self._rewrite()
+            return ops + [{'op': 'match', 'id': m_id, 'kind': 'added', 'set': m}
+                          for m_id, m in self.matches.items()]
+
+        ops = []
+        for match in parsed:
+            new = self._normalize(match, ops)
+            old = self.matches.get(match['id'])
+            changed = {k: v for k, v in new.items() if old is None or old.get(k) != v}
+            if not changed:
+                continue
+            if old is None:
+                kind = 'added'
+            elif changed.get('status') == 'completed':
+                kind = 'finished'
+            elif set(changed) == {'scores'} or set(changed) == {'scores', 'status'}:
+                kind = 'score'
+            else:
+                kind = 'changed'
+            ops.append({'op': 'match', 'id': match['id'], 'kind': kind, 'set': changed})
+            self.matches.setdefault(match['id'], {}).update(changed)
+
+        if not ops:
+            return []
+        self.version += 1
+        entry = {'v': self.version, 'ops': ops}
+        self.deltas.append(entry)
+        if len(self.deltas) > MAX_DELTAS:
+            self._rewrite()
+        else:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        return ops
+
+    def _rewrite(self):
+        """Replace the log with one snapshot line at the current version"""
+        self.base = self.version
+        self.deltas = []
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            entry = {'v': self.version, 'url': self.url, 'snapshot': self.snapshot()}
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def since(self, version):
+        """
+        What a display at `version` needs: the deltas after it, or a
+        snapshot when the log no longer reaches back that far
+        """
+        response = {'url': self.url, 'version': self.version}
+        if version == self.version:
+            response['deltas'] = []
+        elif self.base <= version < self.version and self.version - version <= MAX_REPLAY:
+            response['deltas'] = [d for d in self.deltas if d['v'] > version]
+        else:
+            response['snapshot'] = self.snapshot()
+        return response
+
+
+class BracketReplica(BracketState):
+    """A display's copy of the bracket, kept current from since() responses"""
+
+    __slots__ = ()
+
+    def catch_up(self, response):
+        """
+        Apply a since() response
+        Returns False if a delta is missing (ask again from version 0 for a snapshot)
+        """
+        if 'snapshot' in response:
+            self.load_snapshot(response.get('url'), response['version'], response['snapshot'])
+            return True
+        for delta in response.get('deltas', []):
+            if delta['v'] <= self.version:
+                continue
+            if delta['v'] != self.version + 1:
+                return False
+            self.apply(delta['v'], delta['ops'])
+        return True
+
+
+def save_bracket(state, path):
+    """Write the full normalized bracket for the display page, atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state.to_dict(), f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_bracket(path):
+    """A display's saved bracket, or an empty one (version 0) if missing or invalid"""
+    replica = BracketReplica()
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        replica.load_snapshot(data.get('url'), data['version'], data)
+    except (OSError, ValueError, KeyError, TypeError):
+        return BracketReplica()
+    return replica
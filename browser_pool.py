@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Browser Work Pool - several tabs in one Chrome process
+Tasks (listing search, tournament detail, URL re-check) are scheduled onto
+free tabs up to a concurrency limit. Navigation is started without waiting,
+so all pages load at the same time; each tab is then polled until its task
+is ready, the task runs, and the tab takes the next task. N page fetches cost
+roughly one page load of wall time instead of N.
+
+The driver must be created with page_load_strategy='none' (see setup_driver)
+so that commands sent to one tab don't block while another is loading.
+
+A reused tab still shows its previous page until the new one replaces it,
+so the old document is marked before navigating and a task is only checked
+for readiness once its tab holds an unmarked document.
+"""
+
+import time
+
+
+DEFAULT_MAX_TABS = 3
+DEFAULT_TASK_TIMEOUT = 30
+POLL_INTERVAL = 0.25
+
+
+STALE_MARK = 'data-pool-stale'
+
+
+def document_ready(driver):
+    """Default readiness check: the document has finished loading"""
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+class BrowserTask:
+    """One page fetch: navigate to url, wait until ready(driver), then run(driver)"""
+
+    __slots__ = ('name', 'url', 'run', 'ready', 'timeout', 'settle',
+                 'result', 'error', 'elapsed', '_started', '_ready_at')
+
+    def __init__(self, name, url, run, ready=document_ready, timeout=DEFAULT_TASK_TIMEOUT, settle=0):
+        self.name = name
+        self.url = url
+        self.run = run
+        self.ready = ready
+        self.timeout = timeout
+        self.settle = settle  # Extra seconds to let client-side rendering finish
+        self.result = None
+        self.error = None
+        self.elapsed = None
+        self._started = None
+        self._ready_at = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.elapsed is not None
+
+
+class BrowserPool:
+    """Runs BrowserTasks concurrently across the tabs of one WebDriver session"""
+
+    def __init__(self, driver, max_tabs=DEFAULT_MAX_TABS, log=print):
+        self.driver = driver
+        self.max_tabs = max(1, max_tabs)
+        self.log = log
+        self.handles = [driver.current_window_handle]
+
+    def _tab(self, index):
+        """Window handle for tab index, opening new tabs on demand"""
+        while len(self.handles) <= index:
+            self.driver.switch_to.new_window('tab')
+            self.handles.append(self.driver.current_window_handle)
+        return self.handles[index]
+
+    def _start(self, index, task):
+        self.driver.switch_to.window(self._tab(index))
+        task._started = time.monotonic()
+        # Mark the page being left, then kick off navigation without waiting for the load
+        self.driver.execute_script(
+            "if (document.documentElement) document.documentElement.setAttribute(arguments[1], '');"
+            "window.location.href = arguments[0];",
+            task.url, STALE_MARK
+        )
+
+    def _navigated(self):
+        """True once the current tab no longer shows the page it was sent away from"""
+        return self.driver.execute_script(
+            "return !!document.documentElement && !document.documentElement.hasAttribute(arguments[0]);",
+            STALE_MARK
+        )
+
+    def _finish(self, task, error=None):
+        task.elapsed = time.monotonic() - task._started
+        task.error = error
+        if error:
+            self.log(f"✗ Task {task.name} failed after {task.elapsed:.1f}s: {error}")
+        else:
+            self.log(f"✓ Task {task.name} finished in {task.elapsed:.1f}s")
+
+    def _step(self, index, task):
+        """Poll one busy tab; returns True when its task is done"""
+        now = time.monotonic()
+        if now - task._started > task.timeout:
+            self._finish(task, f"timed out after {task.timeout}s")
+            # Stop the slow page so it doesn't keep using CPU
+            try:
+                self.driver.switch_to.window(self.handles[index])
+                self.driver.execute_script("window.stop();")
+            except Exception:
+                pass
+            return True
+
+        try:
+            self.driver.switch_to.window(self.handles[index])
+            if task._ready_at is None:
+                if not self._navigated() or not task.ready(self.driver):
+                    return False
+                task._ready_at = now
+            if now - task._ready_at < task.settle:
+                return False
+            task.result = task.run(self.driver)
+            self._finish(task)
+        except Exception as e:
+            self._finish(task, e)
+        return True
+
+    def run_all(self, tasks):
+        """Run every task, at most max_tabs at a time; returns the tasks in order"""
+        pending = list(tasks)
+        busy = {}  # tab index -> task
+        started = time.monotonic()
+
+        while pending or busy:
+            for index in range(self.max_tabs):
+                if index not in busy and pending:
+                    task = pending.pop(0)
+                    try:
+                        self._start(index, task)
+                        busy[index] = task
+                    except Exception as e:
+                        task._started = time.monotonic()
+                        self._finish(task, e)
+
+            for index, task in list(busy.items()):
+                if self._step(index, task):
+                    del busy[index]
+
+            if busy:
+                time.sleep(POLL_INTERVAL)
+
+        self.log(f"Browser pool ran {len(tasks)} task(s) in {time.monotonic() - started:.1f}s "
+                 f"using up to {min(self.max_tabs, len(tasks))} tab(s)")
+        return tasks
+
+    def close(self):
+        """Close the extra tabs, leaving the first one open"""
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.handles = self.handles[:1]
+        try:
+            self.driver.switch_to.window(self.handles[0])
+        except Exception:
+            pass
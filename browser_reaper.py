@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Browser Reaper
+Keeps headless Chrome and chromedriver from piling up on the Pi when a
+scraper run is killed (CI timeout-minutes, a crash, SIGKILL) before its
+driver.quit() runs.
+
+Every browser a run starts is recorded in a small run file (owner PID and
+the root PID of the browser tree, each with its /proc start time so a reused
+PID is never mistaken for it), and its Chrome profile directory is named
+tournament-chrome-<owner pid>-... so the Chrome processes can be recognised
+from their --user-data-dir even without the run file. Leftovers whose owner
+is gone are reaped at startup and on exit.
+
+When a browser is closed, the CPU time (utime + stime, including reaped
+children) and peak memory (VmHWM) of its process tree are logged.
+"""
+
+import fcntl
+import glob
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
+
+
+PROFILE_PREFIX = 'tournament-chrome-'
+CDP_PROFILE_PREFIX = 'tournament-cdp-'  # cdp_driver's profiles
+REAP_GRACE = 5  # Seconds between SIGTERM and SIGKILL
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def profile_dir(prefix=PROFILE_PREFIX):
+    """A fresh Chrome profile directory that names this process as its owner"""
+    return tempfile.mkdtemp(prefix=f"{prefix}{os.getpid()}-")
+
+
+def read_stat(pid):
+    """(ppid, start time, cpu ticks incl. reaped children, state) from /proc/<pid>/stat, or None"""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            # The command name is in parentheses and may contain spaces
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # fields[0] is the state (stat field 3): ppid is field 4, utime..cstime 14-17, starttime 22
+    return int(fields[1]), int(fields[19]), sum(int(v) for v in fields[11:15]), fields[0]
+
+
+def peak_memory_kb(pid):
+    """VmHWM (peak resident set) of a process, 0 if unknown"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def is_alive(pid, start=None):
+    """True if pid is running (and, given a start time, is still the same process)"""
+    stat = read_stat(pid)
+    return stat is not None and stat[3] != 'Z' and (start is None or stat[1] == start)
+
+
+def process_table():
+    """{pid: ppid} for every process"""
+    table = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            stat = read_stat(int(entry))
+            if stat is not None:
+                table[int(entry)] = stat[0]
+    return table
+
+
+def process_tree(root, table=None):
+    """root and all of its descendants"""
+    table = table if table is not None else process_table()
+    children = {}
+    for pid, ppid in table.items():
+        children.setdefault(ppid, []).append(pid)
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(children.get(pid, []))
+    return tree
+
+
+def tree_usage(root):
+    """(cpu seconds, summed peak memory in KB) of a live process tree"""
+    ticks = peak_kb = 0
+    for pid in process_tree(root):
+        stat = read_stat(pid)
+        if stat is None:
+            continue
+        ticks += stat[2]
+        peak_kb += peak_memory_kb(pid)
+    return ticks / CLOCK_TICKS, peak_kb
+
+
+def _marker_owner(cmdline):
+    """Owner PID from a --user-data-dir=.../tournament-chrome-<pid>-... argument"""
+    for arg in cmdline:
+        if arg.startswith('--user-data-dir='):
+            name = os.path.basename(arg.split('=', 1)[1].rstrip('/'))
+            for prefix in (PROFILE_PREFIX, CDP_PROFILE_PREFIX):
+                owner = name[len(prefix):].split('-', 1)[0] if name.startswith(prefix) else ''
+                if owner.isdigit():
+                    return int(owner)
+    return None
+
+
+def marked_processes():
+    """{pid: owner pid} of every Chrome process started with one of our profile directories"""
+    marked = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                cmdline = f.read().decode('utf-8', 'replace').split('\0')
+        except OSError:
+            continue
+        owner = _marker_owner(cmdline)
+        if owner is not None:
+            marked[int(entry)] = owner
+    return marked
+
+
+def kill_processes(pids, grace=REAP_GRACE):
+    """SIGTERM, then SIGKILL whatever is still there after grace seconds; returns how many existed"""
+    starts = {pid: read_stat(pid) for pid in pids}
+    targets = [pid for pid, stat in starts.items() if stat is not None and pid != os.getpid()]
+    for pid in targets:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline and any(is_alive(pid, starts[pid][1]) for pid in targets):
+        time.sleep(0.1)
+    for pid in targets:
+        if is_alive(pid, starts[pid][1]):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    return len(targets)
+
+
+class BrowserRun:
+    """The browsers this process started, mirrored into the shared run file"""
+
+    __slots__ = ('path', 'browsers', 'cpu_seconds', 'peak_kb', 'closed', 'log')
+
+    def __init__(self, path, log=print):
+        self.path = path
+        self.browsers = {}  # id(driver) -> (root pid, start time, profile dir)
+        self.cpu_seconds = 0.0
+        self.peak_kb = 0
+        self.closed = 0
+        self.log = log
+
+    def _update_file(self, change):
+        """Read-modify-write the run file under an exclusive lock"""
+        with open(f"{self.path}.lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f).get('browsers', [])
+            except (OSError, ValueError, AttributeError):
+                entries = []
+            result = change(entries)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'browsers': entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+            return result
+
+    def track(self, driver, root_pid, profile=None):
+        """Record a freshly started browser tree"""
+        stat = read_stat(root_pid)
+        if stat is None:
+            return
+        self.browsers[id(driver)] = (root_pid, stat[1], profile)
+        owner = read_stat(os.getpid())
+        entry = {'owner': [os.getpid(), owner[1] if owner else None], 'pid': [root_pid, stat[1]],
+                 'profile': profile, 'started_at': time.time()}
+        try:
+            self._update_file(lambda entries: entries.append(entry))
+        except OSError as e:
+            self.log(f"✗ Could not record browser PID {root_pid}: {e}")
+
+    def close(self, driver):
+        """Quit a browser, account its usage and make sure its whole tree is gone"""
+        root_pid, start, profile = self.browsers.pop(id(driver), (None, None, None))
+        tree = {}
+        if root_pid is not None and is_alive(root_pid, start):
+            for pid in process_tree(root_pid):
+                stat = read_stat(pid)
+                if stat is not None:
+                    tree[pid] = stat[1]
+            cpu, peak = tree_usage(root_pid)
+            self.cpu_seconds += cpu
+            self.peak_kb = max(self.peak_kb, peak)
+            self.closed += 1
+            self.log(f"Browser tree {root_pid}: {cpu:.1f}s CPU, peak {peak / 1024:.0f} MB across {len(tree)} process(es)")
+
+        try:
+            driver.quit()
+        except Exception as e:
+            self.log(f"✗ Error quitting browser: {e}")
+
+        # Anything quit() left behind (a hung chromedriver, a detached renderer)
+        leftovers = [pid for pid, pid_start in tree.items() if is_alive(pid, pid_start)]
+        if leftovers:
+            self.log(f"✗ {len(leftovers)} browser process(es) survived quit() - killing them")
+            kill_processes(leftovers)
+        if profile:
+            shutil.rmtree(profile, ignore_errors=True)
+        if root_pid is not None:
+            def untrack(entries):
+                entries[:] = [e for e in entries if e.get('pid') != [root_pid, start]]
+            try:
+                self._update_file(untrack)
+            except OSError as e:
+                self.log(f"✗ Could not update browser run file: {e}")
+
+    def close_all(self):
+        """Reap every browser this run still has open (exit path)"""
+        for key, (root_pid, start, profile) in list(self.browsers.items()):
+            del self.browsers[key]
+            if is_alive(root_pid, start):
+                killed = kill_processes(process_tree(root_pid))
+                self.log(f"✓ Reaped {killed} process(es) of browser {root_pid} at exit")
+            if profile:
+                shutil.rmtree(profile, ignore_errors=True)
+
+    def summary(self):
+        if not self.closed:
+            return None
+        return f"Browser usage this run: {self.closed} browser(s), {self.cpu_seconds:.1f}s CPU, peak {self.peak_kb / 1024:.0f} MB"
+
+    def reap_orphans(self):
+        """
+        Kill browser trees left by runs that are gone (from the run file and
+        from the profile markers) and remove their profiles
+        Returns the number of processes killed
+        """
+        def take_orphans(entries):
+            orphans = [e for e in entries if not is_alive(*e['owner'])]
+            for e in orphans:
+                entries.remove(e)
+            return orphans
+
+        try:
+            orphans = self._update_file(take_orphans)
+        except OSError as e:
+            self.log(f"✗ Could not read browser run file: {e}")
+            orphans = []
+
+        table = process_table()
+        doomed = set()
+        for entry in orphans:
+            pid, start = entry['pid']
+            if is_alive(pid, start):
+                doomed.update(process_tree(pid, table))
+        for pid, owner in marked_processes().items():
+            if not is_alive(owner):
+                doomed.update(process_tree(pid, table))
+
+        killed = kill_processes(sorted(doomed)) if doomed else 0
+
+        # Profiles of dead owners (Chrome doesn't remove a --user-data-dir)
+        for prefix in (PROFILE_PREFIX, CDP_PROFILE_PREFIX):
+            for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{prefix}*")):
+                owner = os.path.basename(path)[len(prefix):].split('-', 1)[0]
+                if owner.isdigit() and not is_alive(int(owner)):
+                    shutil.rmtree(path, ignore_errors=True)
+
+        if killed:
+            self.log(f"✓ Reaped {killed} orphaned browser process(es) from earlier runs")
+        return killed
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Streaming Card Parser for DigitalPool listing pages
+Walks the page HTML tag by tag (no DOM is built) and yields one tournament
+card fragment at a time. A substring prefilter on the venue and the card's
+date, matched against the fragment's tag-stripped, unescaped text, decides
+which fragments get the full parse, and the stream stops early
+once the listing has moved past the wanted date range, so work scales with
+the matching cards instead of the page size.
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+
+
+CARD_CLASS = "ant-card"
+
+# Comments, raw-text elements and tags, in document order
+_TOKEN_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b[^>]*>.*?</\1\s*>'
+    r'|<(/?)([a-zA-Z][a-zA-Z0-9-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.S | re.I
+)
+_CLASS_RE = re.compile(r'\bclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.I)
+_DATE_RE = re.compile(r'(\d{4}/\d{2}/\d{2})')
+
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+))
+BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'section', 'table', 'tr', 'ul',
+))
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5')
+TITLE_CLASS_MARKERS = ('title', 'Title', 'name', 'Name')
+
+
+def _classes(attrs):
+    match = _CLASS_RE.search(attrs)
+    if not match:
+        return ()
+    return (match.group(1) or match.group(2) or match.group(3) or '').split()
+
+
+def iter_card_fragments(page_html, card_class=CARD_CLASS):
+    """
+    Yield the outer HTML of each element whose class list contains card_class
+    Nested cards are part of their outer card's fragment
+    """
+    depth = 0
+    start = None
+    for match in _TOKEN_RE.finditer(page_html):
+        tag = match.group(3)
+        if tag is None:
+            continue  # Comment or script/style block
+        tag = tag.lower()
+        closing = match.group(2) == '/'
+        attrs = match.group(4) or ''
+
+        if start is None:
+            if not closing and card_class in _classes(attrs):
+                if tag in VOID_TAGS or attrs.rstrip().endswith('/'):
+                    yield match.group(0)
+                    continue
+                start = match.start()
+                depth = 1
+            continue
+
+        if tag in VOID_TAGS or attrs.rstrip().endswith('/'):
+            continue
+        depth += -1 if closing else 1
+        if depth == 0:
+            yield page_html[start:match.end()]
+            start = None
+
+
+def _token_text(match):
+    if match.group(3) is None:
+        return ''  # Comment or script/style block
+    return '\n' if match.group(3).lower() in BLOCK_TAGS else ''
+
+
+def fragment_text(fragment):
+    """
+    A fragment's text with tags stripped and entities unescaped, laid out
+    like the parsed card text ("Bankshot&nbsp;<b>Billiards</b>" still matches)
+    """
+    return _clean_text(html.unescape(_TOKEN_RE.sub(_token_text, fragment)))
+
+
+def card_date(text):
+    """First YYYY/MM/DD date in a card's text, or None"""
+    match = _DATE_RE.search(text)
+    return match.group(1) if match else None
+
+
+class CardStream:
+    """
+    Iterate (index, fragment, date) for cards that pass the prefilter
+
+    needles:   substrings every wanted card must contain (e.g. venue and city)
+    date_from: skip cards dated before this (YYYY/MM/DD), None for no limit
+    date_to:   skip cards dated after this, None for no limit
+
+    Once two different dates show the listing is sorted, the stream stops as
+    soon as a card lies beyond the range in the sort direction. The counters
+    are filled in as the stream is consumed.
+    """
+
+    def __init__(self, page_html, needles=(), date_from=None, date_to=None, card_class=CARD_CLASS):
+        self.page_html = page_html
+        self.needles = tuple(needles)
+        self.date_from = date_from
+        self.date_to = date_to
+        self.card_class = card_class
+        self.scanned = 0
+        self.matched = 0
+        self.stopped_early = False
+
+    def _in_range(self, date):
+        if self.date_from and (not date or date < self.date_from):
+            return False
+        if self.date_to and (not date or date > self.date_to):
+            return False
+        return True
+
+    def __iter__(self):
+        ascending = descending = True
+        last_date = None
+        distinct_dates = 0
+
+        for index, fragment in enumerate(iter_card_fragments(self.page_html, self.card_class)):
+            self.scanned += 1
+            text = fragment_text(fragment)
+            date = card_date(text)
+
+            if date:
+                if last_date is not None and date != last_date:
+                    distinct_dates += 1
+                    ascending = ascending and date > last_date
+                    descending = descending and date < last_date
+                last_date = date
+
+                if distinct_dates:
+                    if ascending and self.date_to and date > self.date_to:
+                        self.stopped_early = True
+                        return
+                    if descending and self.date_from and date < self.date_from:
+                        self.stopped_early = True
+                        return
+
+            if not all(needle in text for needle in self.needles):
+                continue
+            if not self._in_range(date):
+                continue
+
+            self.matched += 1
+            yield index, fragment, date
+
+
+class CardData:
+    """What the card parser needs from one card: text, headings, title text and links"""
+
+    __slots__ = ('text', 'headings', 'title', 'hrefs')
+
+    def __init__(self, text, headings, title, hrefs):
+        self.text = text
+        self.headings = headings  # {tag: text of the first heading with that tag}
+        self.title = title  # Text of the first title/name-class element
+        self.hrefs = hrefs
+
+
+class _CardExtractor(HTMLParser):
+    """Approximates innerText and collects headings, title text and hrefs"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.hrefs = []
+        self.headings = {}
+        self.title = None
+        self._capture = []  # [kind, tag, depth, parts]
+        self._depth = 0
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in ('script', 'style'):
+            self._skip += 1
+            return
+        if tag in BLOCK_TAGS:
+            self.parts.append('\n')
+        if tag == 'a' and attrs.get('href'):
+            self.hrefs.append(attrs['href'])
+        if tag in VOID_TAGS:
+            return
+
+        self._depth += 1
+        if tag in HEADING_TAGS and tag not in self.headings:
+            self._capture.append(['heading', tag, self._depth, []])
+        if self.title is None and any(marker in (attrs.get('class') or '') for marker in TITLE_CLASS_MARKERS):
+            if not any(c[0] == 'title' for c in self._capture):
+                self._capture.append(['title', tag, self._depth, []])
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style'):
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag in VOID_TAGS:
+            return
+        for capture in [c for c in self._capture if c[2] == self._depth]:
+            self._capture.remove(capture)
+            text = _clean_text(''.join(capture[3]))
+            if capture[0] == 'heading':
+                self.headings.setdefault(capture[1], text)
+            elif self.title is None and text:
+                self.title = text
+        self._depth -= 1
+        if tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.parts.append(data)
+        for capture in self._capture:
+            capture[3].append(data)
+
+
+def _clean_text(raw):
+    """Collapse whitespace within lines and drop blank lines, like innerText"""
+    lines = (' '.join(line.split()) for line in raw.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_card_fragment(fragment):
+    """Extract CardData from one card's HTML"""
+    extractor = _CardExtractor()
+    extractor.feed(fragment)
+    extractor.close()
+    return CardData(
+        text=_clean_text(''.join(extractor.parts)),
+        headings=extractor.headings,
+        title=extractor.title,
+        hrefs=extractor.hrefs,  # HTMLParser already unescapes attribute values
+    )
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Cast Device Registry and Fan-Out Controller
+The registry lists every Chromecast/display in the room. The controller
+issues catt stop/cast to all target devices at once from a thread pool, so
+casting to N TVs takes about as long as the slowest one instead of the sum.
+Each device is retried on its own, and its state (what it is casting, last
+latency, last error) is tracked per device.
+"""
+
+import json
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+CATT_COMMAND = '/home/pi/.local/bin/catt'
+DEVICES_FILE = '/home/pi/cast_devices.json'
+STOP_TIMEOUT = 10
+CAST_TIMEOUT = 30
+STOP_SETTLE = 2  # Seconds between stop and cast on the same device
+RETRIES = 2  # Extra attempts per device after the first failure
+RETRY_DELAY = 3
+DEFAULT_KEY = 'default'  # catt's configured default device (no -d)
+
+
+class CastDevice:
+    """One cast target; name is what catt -d accepts (friendly name or IP)"""
+
+    __slots__ = ('name', 'enabled')
+
+    def __init__(self, name=None, enabled=True):
+        self.name = name
+        self.enabled = enabled
+
+    @property
+    def key(self):
+        return self.name or DEFAULT_KEY
+
+    def catt_args(self):
+        return ['-d', self.name] if self.name else []
+
+    def to_dict(self):
+        return {'name': self.name, 'enabled': self.enabled}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(name=data.get('name'), enabled=data.get('enabled', True))
+
+    def __repr__(self):
+        return f"CastDevice({self.key!r})"
+
+
+def load_devices(path=DEVICES_FILE):
+    """
+    Enabled devices from the registry file
+    Falls back to catt's default device when the registry is missing or empty
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        devices = [CastDevice.from_dict(d) for d in data.get('devices', [])]
+    except (OSError, ValueError, AttributeError):
+        devices = []
+    devices = [d for d in devices if d.enabled]
+    return devices or [CastDevice()]
+
+
+def save_devices(devices, path=DEVICES_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'devices': [d.to_dict() for d in devices]}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def scan_devices(catt_command=CATT_COMMAND, timeout=30):
+    """
+    Discover devices with `catt scan`
+    Lines look like "192.168.1.20 - Bar TV - Google Inc. Chromecast"
+    """
+    result = subprocess.run([catt_command, 'scan'], capture_output=True, text=True, timeout=timeout)
+    devices = []
+    for line in result.stdout.splitlines():
+        if ' - ' not in line:
+            continue
+        # Only the IP and the model are delimited - the device name can itself contain " - "
+        _, rest = line.split(' - ', 1)
+        name = rest.rsplit(' - ', 1)[0].strip() if ' - ' in rest else rest.strip()
+        if name:
+            devices.append(CastDevice(name))
+    return devices
+
+
+class CastResult:
+    """Outcome of one device's stop/cast"""
+
+    __slots__ = ('device', 'ok', 'attempts', 'latency', 'error')
+
+    def __init__(self, device, ok, attempts, latency, error=None):
+        self.device = device
+        self.ok = ok
+        self.attempts = attempts
+        self.latency = latency
+        self.error = error
+
+
+class CastController:
+    """Runs catt against many devices in parallel with per-device retries"""
+
+    def __init__(self, devices, catt_command=CATT_COMMAND, retries=RETRIES,
+                 retry_delay=RETRY_DELAY, log=print):
+        self.devices = list(devices)
+        self.catt_command = catt_command
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.log = log
+
+    def _catt(self, device, args, timeout):
+        """Run one catt command for a device; returns an error string or None"""
+        try:
+            result = subprocess.run(
+                [self.catt_command] + device.catt_args() + args,
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return str(e)
+        if result.returncode != 0:
+            return (result.stderr or result.stdout).strip() or f"exit code {result.returncode}"
+        return None
+
+    def _run_device(self, device, steps):
+        """Run the steps for one device, retrying the whole sequence on failure"""
+        started = time.monotonic()
+        error = None
+        for attempt in range(1, self.retries + 2):
+            for args, timeout, settle in steps:
+                error = self._catt(device, args, timeout)
+                if error:
+                    break
+                if settle:
+                    time.sleep(settle)
+            if not error:
+                return CastResult(device, True, attempt, time.monotonic() - started)
+            if attempt <= self.retries:
+                self.log(f"  {device.key}: attempt {attempt} failed ({error}) - retrying")
+                time.sleep(self.retry_delay)
+        return CastResult(device, False, self.retries + 1, time.monotonic() - started, error)
+
+    def _fan_out(self, steps, devices, action):
+        devices = list(devices if devices is not None else self.devices)
+        if not devices:
+            return {}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(devices)) as pool:
+            results = list(pool.map(lambda d: self._run_device(d, steps), devices))
+
+        for result in results:
+            if result.ok:
+                self.log(f"✓ {action} on {result.device.key} in {result.latency * 1000:.0f}ms "
+                         f"({result.attempts} attempt(s))")
+            else:
+                self.log(f"✗ {action} failed on {result.device.key} after {result.attempts} attempt(s): "
+                         f"{result.error}")
+        ok = sum(1 for r in results if r.ok)
+        self.log(f"{action}: {ok}/{len(results)} device(s) in {time.monotonic() - started:.1f}s")
+        return {r.device.key: r for r in results}
+
+    def cast_site(self, url, devices=None, stop_first=True):
+        """Stop (optionally) and cast url on every device at once; returns {key: CastResult}"""
+        steps = []
+        if stop_first:
+            steps.append((['stop'], STOP_TIMEOUT, STOP_SETTLE))
+        steps.append((['cast_site', url], CAST_TIMEOUT, 0))
+        return self._fan_out(steps, devices, f"Cast {url}")
+
+    def stop(self, devices=None):
+        return self._fan_out([(['stop'], STOP_TIMEOUT, 0)], devices, "Stop")
+
+
+def new_device_state():
+    return {
+        'is_casting_tournament': False,
+        'last_tournament_url': None,
+        'last_status': None,
+        'cast_started_at': None,
+        'last_latency_ms': None,
+        'last_error': None,
+        'failures': 0,
+    }
+
+
+def record_result(device_state, result, tournament_url=None, status=None):
+    """Update one device's state from a cast result"""
+    device_state['last_latency_ms'] = round(result.latency * 1000)
+    if result.ok:
+        device_state['is_casting_tournament'] = True
+        device_state['last_tournament_url'] = tournament_url
+        device_state['last_status'] = status
+        device_state['cast_started_at'] = datetime.now().isoformat()
+        device_state['last_error'] = None
+        device_state['failures'] = 0
+    else:
+        device_state['last_error'] = result.error
+        device_state['failures'] = device_state.get('failures', 0) + 1
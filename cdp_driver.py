@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Direct Chrome DevTools Protocol Backend
+Drives a headless Chrome over its DevTools websocket instead of going through
+/usr/bin/chromedriver. Every call is one Runtime.evaluate / callFunctionOn
+round trip straight to the browser (no chromedriver HTTP hop and no
+chromedriver process on the Pi).
+
+CDPDriver implements the subset of the Selenium WebDriver interface the
+scraper uses - get, find_element(s), execute_script, page_source, tabs,
+quit and element text/get_attribute/click/clear/send_keys/is_displayed/
+is_enabled - so the parsing code and WebDriverWait work unchanged.
+
+This module only needs the standard library; the websocket client is the
+minimum needed for CDP (text frames, ping/pong, close). Its element and
+script errors are Selenium's exception classes when Selenium is installed
+and look-alikes otherwise. The
+scraper itself still needs Selenium with this backend: its waits and
+locators come from selenium (WebDriverWait, expected_conditions, By, Keys).
+"""
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+try:
+    # Raise the same exceptions as Selenium so existing except clauses match
+    from selenium.common.exceptions import NoSuchElementException, JavascriptException
+except ImportError:
+    class NoSuchElementException(Exception):
+        pass
+
+    class JavascriptException(Exception):
+        pass
+
+
+CHROME_BINARIES = ('chromium-browser', 'chromium', 'google-chrome', 'google-chrome-stable')
+LAUNCH_TIMEOUT = 20  # Seconds to wait for Chrome to open its DevTools port
+COMMAND_TIMEOUT = 30
+PAGE_LOAD_TIMEOUT = 60
+POLL_INTERVAL = 0.1
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Selenium Keys values that need a real key event rather than inserted text
+SPECIAL_KEYS = {
+    '\ue003': ('Backspace', 8),
+    '\ue004': ('Tab', 9),
+    '\ue006': ('Enter', 13),  # Keys.RETURN
+    '\ue007': ('Enter', 13),  # Keys.ENTER
+    '\ue00c': ('Escape', 27),
+}
+
+# Finds elements under `root` for a Selenium locator strategy
+FIND_JS = """(root, by, value) => {
+    if (by === 'css selector') return Array.from(root.querySelectorAll(value));
+    if (by === 'tag name') return Array.from(root.getElementsByTagName(value));
+    if (by === 'xpath') {
+        const result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const found = [];
+        for (let i = 0; i < result.snapshotLength; i++) found.push(result.snapshotItem(i));
+        return found;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}"""
+
+
+def _css_for(by, value):
+    """Translate the simple Selenium strategies to CSS; others pass through"""
+    if by == 'id':
+        return 'css selector', f'[id="{value}"]'
+    if by == 'class name':
+        return 'css selector', f'.{value}'
+    if by == 'name':
+        return 'css selector', f'[name="{value}"]'
+    return by, value
+
+
+class WebSocket:
+    """Minimal RFC 6455 client: masked text frames out, unmasked frames in"""
+
+    def __init__(self, url, timeout=COMMAND_TIMEOUT):
+        parsed = urllib.parse.urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        self._buffer = b''
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {parsed.hostname}:{parsed.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode())
+
+        while b'\r\n\r\n' not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("websocket handshake: connection closed")
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(b'\r\n\r\n', 1)
+        lines = head.decode('latin-1').split('\r\n')
+        if ' 101 ' not in lines[0]:
+            raise ConnectionError(f"websocket handshake failed: {lines[0]}")
+
+        expected = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        headers = dict(line.split(': ', 1) for line in lines[1:] if ': ' in line)
+        accept = {k.lower(): v for k, v in headers.items()}.get('sec-websocket-accept')
+        if accept != expected:
+            raise ConnectionError("websocket handshake: bad Sec-WebSocket-Accept")
+
+    def _send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+        elif length < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+        mask = os.urandom(4)
+        key = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, 'big') ^ int.from_bytes(key, 'big')).to_bytes(length, 'big')
+        self.sock.sendall(header + mask + masked)
+
+    def _recv_exact(self, size):
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise ConnectionError("websocket closed by browser")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def send(self, text):
+        self._send_frame(0x1, text.encode('utf-8'))
+
+    def recv(self):
+        """Next complete text message (control frames are handled here)"""
+        message = b''
+        while True:
+            first, second = self._recv_exact(2)
+            fin, opcode, length = first & 0x80, first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', self._recv_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', self._recv_exact(8))[0]
+            if second & 0x80:
+                mask = self._recv_exact(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(self._recv_exact(length)))
+            else:
+                payload = self._recv_exact(length)
+
+            if opcode == 0x8:
+                raise ConnectionError("websocket closed by browser")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+
+            message += payload
+            if fin:
+                return message.decode('utf-8')
+
+    def close(self):
+        try:
+            self._send_frame(0x8, b'')
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class CDPSession:
+    """Request/response over one page target's websocket"""
+
+    def __init__(self, target_id, ws_url):
+        self.target_id = target_id
+        self.ws = WebSocket(ws_url)
+        self._next_id = 0
+
+    def call(self, method, params=None, timeout=COMMAND_TIMEOUT):
+        self._next_id += 1
+        message_id = self._next_id
+        self.ws.sock.settimeout(timeout)
+        self.ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get('id') != message_id:
+                continue  # An event - no domains are enabled, so nothing to keep
+            if 'error' in message:
+                raise JavascriptException(f"{method}: {message['error'].get('message')}")
+            return message.get('result', {})
+
+    def close(self):
+        self.ws.close()
+
+
+def _unwrap(result):
+    """Value of a Runtime result, raising page exceptions like Selenium does"""
+    if 'exceptionDetails' in result:
+        details = result['exceptionDetails']
+        description = details.get('exception', {}).get('description') or details.get('text')
+        raise JavascriptException(description)
+    return result.get('result', {}).get('value')
+
+
+class CDPElement:
+    """A DOM element held by its remote object id"""
+
+    def __init__(self, driver, session, object_id):
+        self._driver = driver
+        self._session = session
+        self.id = object_id
+
+    def _call(self, function, *args, by_value=True):
+        result = self._session.call('Runtime.callFunctionOn', {
+            'objectId': self.id,
+            'functionDeclaration': function,
+            'arguments': [{'value': a} for a in args],
+            'returnByValue': by_value,
+            'awaitPromise': True,
+        })
+        return result if not by_value else _unwrap(result)
+
+    @property
+    def text(self):
+        return self._call("function() { return (this.innerText || '').trim(); }")
+
+    @property
+    def tag_name(self):
+        return self._call("function() { return this.tagName.toLowerCase(); }")
+
+    def get_attribute(self, name):
+        # Selenium semantics: the property if it is a simple value, else the attribute
+        return self._call("""function(name) {
+            const value = this[name];
+            if (typeof value === 'string' || typeof value === 'number') return String(value);
+            if (typeof value === 'boolean') return value ? 'true' : null;
+            return this.getAttribute(name);
+        }""", name)
+
+    def is_displayed(self):
+        return self._call("""function() {
+            const style = window.getComputedStyle(this);
+            return !!(this.offsetWidth || this.offsetHeight || this.getClientRects().length)
+                && style.visibility !== 'hidden' && style.display !== 'none';
+        }""")
+
+    def is_enabled(self):
+        return self._call("function() { return !this.disabled; }")
+
+    def click(self):
+        self._call("function() { this.scrollIntoView({block: 'center'}); this.focus(); this.click(); }")
+
+    def clear(self):
+        # Use the native setter so React-controlled inputs see the change
+        self._call("""function() {
+            const proto = this instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, 'value').set.call(this, '');
+            this.dispatchEvent(new Event('input', {bubbles: true}));
+            this.dispatchEvent(new Event('change', {bubbles: true}));
+        }""")
+
+    def send_keys(self, *values):
+        self._call("function() { this.focus(); }")
+        text = ''.join(str(v) for v in values)
+        pending = ''
+        for char in text:
+            if char not in SPECIAL_KEYS:
+                pending += char
+                continue
+            if pending:
+                self._session.call('Input.insertText', {'text': pending})
+                pending = ''
+            self._driver._press_key(self._session, char)
+        if pending:
+            self._session.call('Input.insertText', {'text': pending})
+
+    def find_elements(self, by='css selector', value=None):
+        return self._driver._find(self._session, by, value, root=self)
+
+    def find_element(self, by='css selector', value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"no element for {by}={value!r}")
+        return found[0]
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        if handle not in self._driver._sessions:
+            raise NoSuchElementException(f"no such window: {handle}")
+        self._driver._current = handle
+
+    def new_window(self, type_hint='tab'):
+        self._driver._current = self._driver._open_target()
+
+
+class CDPDriver:
+    """Selenium-compatible subset over a Chrome launched with --remote-debugging-port"""
+
+    def __init__(self, process, port, user_data_dir, page_load_strategy=None):
+        self.process = process
+        self.port = port
+        self.user_data_dir = user_data_dir
+        self.page_load_strategy = page_load_strategy or 'normal'
+        self.page_load_timeout = PAGE_LOAD_TIMEOUT
+        self.switch_to = _SwitchTo(self)
+        self._sessions = {}
+        self._current = None
+
+        targets = self._http('GET', '/json/list')
+        page = next((t for t in targets if t.get('type') == 'page'), None)
+        if page is None:
+            self._current = self._open_target()
+        else:
+            self._current = page['id']
+            self._sessions[page['id']] = CDPSession(page['id'], page['webSocketDebuggerUrl'])
+
+    # -- plumbing ---------------------------------------------------------
+
+    def _http(self, method, path):
+        request = urllib.request.Request(f"http://127.0.0.1:{self.port}{path}", method=method)
+        with urllib.request.urlopen(request, timeout=COMMAND_TIMEOUT) as response:
+            body = response.read().decode('utf-8')
+        try:
+            return json.loads(body)
+        except ValueError:
+            return body
+
+    def _open_target(self):
+        target = self._http('PUT', '/json/new?about:blank')
+        self._sessions[target['id']] = CDPSession(target['id'], target['webSocketDebuggerUrl'])
+        return target['id']
+
+    @property
+    def _session(self):
+        session = self._sessions.get(self._current)
+        if session is None:
+            raise NoSuchElementException("no such window: current tab was closed")
+        return session
+
+    def _evaluate(self, expression, session=None, by_value=True):
+        result = (session or self._session).call('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': by_value,
+            'awaitPromise': True,
+        })
+        return result if not by_value else _unwrap(result)
+
+    def _find(self, session, by, value, root=None):
+        by, value = _css_for(by, value)
+        args = [{'value': by}, {'value': value}]
+        if root is None:
+            result = self._evaluate(
+                f"({FIND_JS})(document, {json.dumps(by)}, {json.dumps(value)})", session, by_value=False
+            )
+        else:
+            result = session.call('Runtime.callFunctionOn', {
+                'objectId': root.id,
+                'functionDeclaration': f"function(by, value) {{ return ({FIND_JS})(this, by, value); }}",
+                'arguments': args,
+                'returnByValue': False,
+            })
+        _unwrap(result)
+        array_id = result['result'].get('objectId')
+        if not array_id:
+            return []
+
+        # One round trip for all element handles in the array
+        properties = session.call('Runtime.getProperties', {'objectId': array_id, 'ownProperties': True})
+        session.call('Runtime.releaseObject', {'objectId': array_id})
+        elements = []
+        for prop in properties.get('result', []):
+            if prop['name'].isdigit() and prop.get('value', {}).get('objectId'):
+                elements.append((int(prop['name']), CDPElement(self, session, prop['value']['objectId'])))
+        return [element for _, element in sorted(elements, key=lambda item: item[0])]
+
+    def _press_key(self, session, char):
+        key, code = SPECIAL_KEYS[char]
+        event = {'key': key, 'code': key, 'windowsVirtualKeyCode': code, 'nativeVirtualKeyCode': code}
+        down = dict(event, type='keyDown')
+        if key == 'Enter':
+            down['text'] = '\r'
+        session.call('Input.dispatchKeyEvent', down)
+        session.call('Input.dispatchKeyEvent', dict(event, type='keyUp'))
+
+    # -- WebDriver subset -------------------------------------------------
+
+    def _loader_id(self, session):
+        """Loader of the main frame's current document"""
+        return session.call('Page.getFrameTree')['frameTree']['frame'].get('loaderId')
+
+    def get(self, url):
+        session = self._session
+        previous_loader = self._loader_id(session)
+        result = session.call('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise JavascriptException(f"navigation to {url} failed: {result['errorText']}")
+        if self.page_load_strategy == 'none':
+            return
+
+        # Until the new document commits, readyState is still the old page's 'complete';
+        # a same-document navigation (no loaderId) never replaces it
+        committed = not result.get('loaderId')
+        wanted = ('interactive', 'complete') if self.page_load_strategy == 'eager' else ('complete',)
+        deadline = time.monotonic() + self.page_load_timeout
+        while time.monotonic() < deadline:
+            try:
+                committed = committed or self._loader_id(session) != previous_loader
+                if committed and self._evaluate("document.readyState", session) in wanted:
+                    return
+            except JavascriptException:
+                pass  # Context destroyed mid-navigation
+            time.sleep(POLL_INTERVAL)
+        raise TimeoutError(f"page load timed out after {self.page_load_timeout}s: {url}")
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+
+    def execute_script(self, script, *args):
+        """Run script as a function body with arguments[]; returns JSON-able values"""
+        function = f"function() {{ {script} }}"
+        element = next((a for a in args if isinstance(a, CDPElement)), None)
+        if element is None:
+            return self._evaluate(f"({function}).apply(window, {json.dumps(list(args))})")
+
+        arguments = [{'objectId': a.id} if isinstance(a, CDPElement) else {'value': a} for a in args]
+        result = self._session.call('Runtime.callFunctionOn', {
+            'objectId': element.id,
+            'functionDeclaration': function,
+            'arguments': arguments,
+            'returnByValue': True,
+            'awaitPromise': True,
+        })
+        return _unwrap(result)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self._session.call(cmd, cmd_args)
+
+    def find_elements(self, by='css selector', value=None):
+        return self._find(self._session, by, value)
+
+    def find_element(self, by='css selector', value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"no element for {by}={value!r}")
+        return found[0]
+
+    @property
+    def page_source(self):
+        return self._evaluate("document.documentElement.outerHTML")
+
+    @property
+    def title(self):
+        return self._evaluate("document.title")
+
+    @property
+    def current_url(self):
+        return self._evaluate("location.href")
+
+    @property
+    def current_window_handle(self):
+        return self._current
+
+    @property
+    def window_handles(self):
+        return list(self._sessions)
+
+    def close(self):
+        """Close the current tab"""
+        session = self._sessions.pop(self._current, None)
+        if session is not None:
+            session.close()
+            self._http('GET', f"/json/close/{session.target_id}")
+
+    def quit(self):
+        for session in self._sessions.values():
+            try:
+                session.close()
+            except OSError:
+                pass
+        self._sessions = {}
+
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, signal.SIGTERM)
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+            except ProcessLookupError:
+                pass
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+def find_chrome():
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError(f"no Chrome binary found (tried {', '.join(CHROME_BINARIES)})")
+
+
+def setup_cdp_driver(headless=True, page_load_strategy=None, chrome_binary=None):
+    """Launch Chrome with a DevTools port and return a CDPDriver (same use as setup_driver)"""
+    # The owner PID in the name lets browser_reaper find Chrome left behind by a killed run
+    user_data_dir = tempfile.mkdtemp(prefix=f'tournament-cdp-{os.getpid()}-')
+    args = [
+        chrome_binary or find_chrome(),
+        '--remote-debugging-port=0',
+        f'--user-data-dir={user_data_dir}',
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--start-maximized',
+        '--user-agent=Mozilla/5.0 (X11; Linux armv7l) AppleWebKit/537.36',
+        '--disable-extensions',
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+        '--no-first-run',
+        '--no-default-browser-check',
+        'about:blank',
+    ]
+    if headless:
+        args.insert(1, '--headless')
+
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+
+    # Chrome writes the port it picked to DevToolsActivePort once it is listening
+    port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+    deadline = time.monotonic() + LAUNCH_TIMEOUT
+    port = None
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with open(port_file, 'r') as f:
+                port = int(f.readline().strip())
+            break
+        except (OSError, ValueError):
+            time.sleep(POLL_INTERVAL)
+
+    if port is None:
+        if process.poll() is None:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        raise RuntimeError("Chrome did not open its DevTools port")
+
+    try:
+        return CDPDriver(process, port, user_data_dir, page_load_strategy)
+    except Exception:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        raise
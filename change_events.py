@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Change Events - snapshot diffs and an append-only event log
+Each scraper run diffs its parsed tournaments against the previous snapshot
+and appends typed events to a JSONL log. Consumers remember the byte offset
+they have read up to and only act on new, relevant events.
+
+The log is committed by CI every run, so it is capped: once it would grow
+past MAX_EVENTS_BYTES it is truncated to a single log_rotated marker.
+Readers keep the log's generation (an id of its first line) next to their
+offset; a rotated or rewritten log has a new first line, so every reader
+starts over even once the new log has grown past its old offset.
+"""
+
+import datetime
+import fcntl
+import hashlib
+import json
+import os
+from enum import Enum
+
+from tournament_model import Tournament, TournamentStatus
+
+
+MAX_EVENTS_BYTES = 256 * 1024  # About a month of events at the venue's pace
+
+
+class EventType(Enum):
+    """Kinds of change the scraper reports"""
+    APPEARED = "tournament_appeared"
+    STATUS_CHANGED = "status_changed"
+    PLAYER_COUNT_CHANGED = "player_count_changed"
+    COMPLETED = "tournament_completed"
+    DISPLAY_CHANGED = "display_changed"
+    LOG_ROTATED = "log_rotated"
+
+
+def tournament_key(tournament):
+    """Identity used to match a tournament between runs"""
+    return tournament.url or f"{tournament.date}|{tournament.name}"
+
+
+def make_event(event_type, tournament=None, old=None, new=None):
+    """Build a single event record"""
+    event = {
+        'type': event_type.value,
+        'at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'old': old,
+        'new': new,
+    }
+    if tournament is not None:
+        event['url'] = tournament.url
+        event['name'] = tournament.name
+        event['date'] = tournament.date
+    return event
+
+
+def diff_tournaments(previous, current):
+    """
+    Compare two {key: Tournament} snapshots and return the list of events.
+    Tournaments missing from current are not reported - a run may only look
+    at today's tournaments.
+    """
+    events = []
+    for key, new in current.items():
+        old = previous.get(key)
+        if old is None:
+            events.append(make_event(EventType.APPEARED, new, new=new.status.value))
+            if new.status is TournamentStatus.COMPLETED:
+                events.append(make_event(EventType.COMPLETED, new))
+            continue
+
+        if old.status is not new.status:
+            events.append(make_event(EventType.STATUS_CHANGED, new, old=old.status.value, new=new.status.value))
+            if new.status is TournamentStatus.COMPLETED:
+                events.append(make_event(EventType.COMPLETED, new))
+
+        if old.player_count != new.player_count:
+            events.append(make_event(EventType.PLAYER_COUNT_CHANGED, new, old=old.player_count, new=new.player_count))
+    return events
+
+
+def load_snapshot(path):
+    """Load the previous run's {key: Tournament} snapshot"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return {key: Tournament.from_dict(t) for key, t in data.get('tournaments', {}).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_snapshot(path, snapshot):
+    """Write the snapshot atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'tournaments': {key: t.to_dict() for key, t in snapshot.items()}}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def update_snapshot(path, tournaments, keep_since=None):
+    """
+    Diff tournaments against the stored snapshot, merge them in and save
+    Entries dated before keep_since ('YYYY/MM/DD') are dropped
+    Returns the list of events
+    """
+    previous = load_snapshot(path)
+    current = {tournament_key(t): t for t in tournaments}
+    events = diff_tournaments(previous, current)
+
+    merged = dict(previous)
+    merged.update(current)
+    if keep_since:
+        merged = {key: t for key, t in merged.items() if not t.date or t.date >= keep_since}
+    save_snapshot(path, merged)
+    return events
+
+
+def append_events(path, events, max_bytes=MAX_EVENTS_BYTES):
+    """
+    Append events to the JSONL log under an exclusive lock, rotating it
+    first if it would grow past max_bytes
+    Returns the byte offset of the end of the log
+    """
+    if not events:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    payload = ''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in events)
+    with open(path, 'a', encoding='utf-8') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            size = f.seek(0, os.SEEK_END)
+            if size and size + len(payload.encode('utf-8')) > max_bytes:
+                # Start over from a marker; consumers reset when the log shrinks below their offset
+                f.truncate(0)
+                marker = make_event(EventType.LOG_ROTATED, old=size)
+                f.write(json.dumps(marker, separators=(',', ':')) + '\n')
+            f.write(payload)
+            f.flush()
+            return f.tell()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def first_line_generation(f):
+    """Generation of an open (binary) log: an id of its first line, '' while it is empty"""
+    f.seek(0)
+    line = f.readline()
+    return hashlib.sha1(line).hexdigest()[:16] if line else ''
+
+
+def log_generation(path):
+    """Generation of the log at path, '' if it is missing or empty"""
+    try:
+        with open(path, 'rb') as f:
+            return first_line_generation(f)
+    except OSError:
+        return ''
+
+
+def read_events(path, offset=0, generation=None):
+    """
+    Read events appended after offset in the given log generation
+    Returns (events, new_offset, generation). Each event carries its own
+    'offset'. A partially written last line is left for the next read; if
+    the log's generation changed (rotated or rewritten), it was replaced by
+    a shorter one, or - with no generation to compare - offset no longer
+    falls on a line boundary, reading restarts from the beginning.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return [], 0, ''
+
+    if offset > size:
+        offset = 0
+
+    events = []
+    with open(path, 'rb') as f:
+        current = first_line_generation(f)
+        if offset and generation is not None and generation != current:
+            offset = 0
+        if offset:
+            f.seek(offset - 1)
+            if f.read(1) != b'\n':
+                offset = 0
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                event = json.loads(line)
+                event['offset'] = offset
+                events.append(event)
+            except ValueError:
+                pass
+            offset += len(line)
+    return events, offset, current
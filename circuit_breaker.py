@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker for DigitalPool fetches
+Tracks consecutive scrape failures across runs. After FAILURE_THRESHOLD
+failures the breaker opens and runs stop launching Chrome; the last good
+record keeps being served (marked stale) until the backoff expires. The first
+run after that probes DigitalPool with a cheap HTTP request before going back
+to full scrapes. Each failure while open doubles the backoff.
+"""
+
+import json
+import os
+import time
+from enum import Enum
+
+
+FAILURE_THRESHOLD = 2  # Consecutive failures before the breaker opens
+BASE_BACKOFF = 5 * 60  # Seconds the breaker stays open after opening
+MAX_BACKOFF = 2 * 60 * 60
+PROBE_TIMEOUT = 10
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"  # Normal operation
+    OPEN = "open"  # Failing - serve the last good record, don't scrape
+    HALF_OPEN = "half_open"  # Backoff expired - probe before scraping
+
+
+class CircuitBreaker:
+    """Failure tracking persisted between scraper runs"""
+
+    __slots__ = ('consecutive_failures', 'open_until', 'backoff', 'last_failure', 'last_success')
+
+    def __init__(self, consecutive_failures=0, open_until=None, backoff=0,
+                 last_failure=None, last_success=None):
+        self.consecutive_failures = consecutive_failures
+        self.open_until = open_until
+        self.backoff = backoff
+        self.last_failure = last_failure
+        self.last_success = last_success
+
+    def state(self, now=None):
+        now = now if now is not None else time.time()
+        if self.open_until is None:
+            return BreakerState.CLOSED
+        if now < self.open_until:
+            return BreakerState.OPEN
+        return BreakerState.HALF_OPEN
+
+    def record_success(self, now=None):
+        self.consecutive_failures = 0
+        self.open_until = None
+        self.backoff = 0
+        self.last_success = now if now is not None else time.time()
+
+    def record_failure(self, reason, now=None):
+        """Count a failure and open (or re-open with a longer backoff) if needed"""
+        now = now if now is not None else time.time()
+        self.consecutive_failures += 1
+        self.last_failure = {'at': now, 'reason': reason}
+
+        if self.open_until is not None:
+            # Failed while open/half-open (e.g. the probe) - back off further
+            self.backoff = min(max(self.backoff, BASE_BACKOFF) * 2, MAX_BACKOFF)
+            self.open_until = now + self.backoff
+        elif self.consecutive_failures >= FAILURE_THRESHOLD:
+            self.backoff = BASE_BACKOFF
+            self.open_until = now + self.backoff
+
+    def to_dict(self):
+        return {
+            'consecutive_failures': self.consecutive_failures,
+            'open_until': self.open_until,
+            'backoff': self.backoff,
+            'last_failure': self.last_failure,
+            'last_success': self.last_success,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            consecutive_failures=data.get('consecutive_failures', 0),
+            open_until=data.get('open_until'),
+            backoff=data.get('backoff', 0),
+            last_failure=data.get('last_failure'),
+            last_success=data.get('last_success'),
+        )
+
+
+def load_breaker(path):
+    """Load breaker state, starting closed if missing or invalid"""
+    try:
+        with open(path, 'r') as f:
+            return CircuitBreaker.from_dict(json.load(f))
+    except (OSError, ValueError, AttributeError):
+        return CircuitBreaker()
+
+
+def save_breaker(breaker, path):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(breaker.to_dict(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def probe(url, timeout=PROBE_TIMEOUT):
+    """
+    Cheap reachability check: one HTTP request, no browser
+    Returns True if the site answers with a non-5xx status
+    """
+    # Only the probe needs an HTTP client
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, method='HEAD', headers={'User-Agent': 'Mozilla/5.0'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status < 500
+    except urllib.error.HTTPError as e:
+        return e.code < 500
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tournament Completion ETA
+Keeps a small time series of each tournament's completion percentage and
+player count (from the "N Players" / "X% Complete" text DigitalPool shows)
+and estimates when it will finish from the rate of progress.
+
+The scheduler uses the estimate to back off while the end is still far away
+and to poll densely once it is near, instead of polling a long event (or
+last night's event after midnight) at a fixed interval until it finally
+reports "Completed".
+"""
+
+import datetime
+import json
+import os
+import time
+
+
+PROGRESS_VERSION = 1
+MAX_SAMPLES = 48  # Samples kept per tournament
+RATE_WINDOW = 90 * 60  # Only the last 90 minutes of samples set the rate
+MIN_RATE_SPAN = 10 * 60  # Samples must span this long before the rate is trusted
+NEAR_END = 20 * 60  # Poll densely from this long before the estimated end
+DENSE_INTERVAL = 2 * 60  # Seconds between checks near the end
+MAX_BACKOFF = 45 * 60  # Never skip checks for longer than this, however far the ETA
+KEEP_SECONDS = 2 * 24 * 60 * 60  # Forget tournaments not seen for two days
+
+
+class ProgressSeries:
+    """(epoch, completion_pct, player_count) samples for one tournament"""
+
+    __slots__ = ('url', 'samples')
+
+    def __init__(self, url, samples=None):
+        self.url = url
+        self.samples = samples or []
+
+    def add(self, pct, players, now=None):
+        now = now if now is not None else time.time()
+        self.samples.append([now, pct, players or 0])
+        del self.samples[:-MAX_SAMPLES]
+
+    @property
+    def last_seen(self):
+        return self.samples[-1][0] if self.samples else None
+
+    def _rate_samples(self):
+        """
+        Recent samples that share the current bracket size; a late entry
+        changes the player count and re-bases the percentage
+        """
+        if not self.samples:
+            return []
+        last_t, _, players = self.samples[-1]
+        recent = []
+        for sample in reversed(self.samples):
+            if sample[1] is None or sample[2] != players or last_t - sample[0] > RATE_WINDOW:
+                break
+            recent.append(sample)
+        recent.reverse()
+        return recent
+
+    def rate(self):
+        """Least-squares completion rate in percent per second, or None if unknown"""
+        samples = self._rate_samples()
+        if len(samples) < 2 or samples[-1][0] - samples[0][0] < MIN_RATE_SPAN:
+            return None
+        n = len(samples)
+        mean_t = sum(s[0] for s in samples) / n
+        mean_p = sum(s[1] for s in samples) / n
+        var_t = sum((s[0] - mean_t) ** 2 for s in samples)
+        if not var_t:
+            return None
+        slope = sum((s[0] - mean_t) * (s[1] - mean_p) for s in samples) / var_t
+        return slope if slope > 0 else None
+
+    def eta(self):
+        """Estimated completion epoch, or None until there is a usable rate"""
+        if not self.samples or self.samples[-1][1] is None:
+            return None
+        last_t, pct, _ = self.samples[-1]
+        if pct >= 100:
+            return last_t
+        rate = self.rate()
+        if rate is None:
+            return None
+        return last_t + (100 - pct) / rate
+
+    def next_check_at(self):
+        """When this tournament is next worth re-checking"""
+        if not self.samples:
+            return 0
+        last_t = self.samples[-1][0]
+        eta = self.eta()
+        if eta is None or eta - last_t <= NEAR_END:
+            return last_t + DENSE_INTERVAL
+        return last_t + min(eta - NEAR_END - last_t, MAX_BACKOFF)
+
+
+class ProgressTracker:
+    """Progress series for every tournament, keyed by URL"""
+
+    __slots__ = ('series',)
+
+    def __init__(self, series=None):
+        self.series = series or {}
+
+    def observe(self, tournaments, now=None):
+        """Add a sample for each tournament that reports a completion percentage"""
+        now = now if now is not None else time.time()
+        for t in tournaments:
+            if not t.url or t.completion_pct is None:
+                continue
+            self.series.setdefault(t.url, ProgressSeries(t.url)).add(t.completion_pct, t.player_count, now)
+
+    def eta(self, url):
+        series = self.series.get(url)
+        return series.eta() if series else None
+
+    def next_check_at(self, url):
+        series = self.series.get(url)
+        return series.next_check_at() if series else 0
+
+    def is_due(self, url, now=None):
+        """True unless the ETA says a re-check now would be wasted"""
+        now = now if now is not None else time.time()
+        return now >= self.next_check_at(url)
+
+    def prune(self, now=None):
+        now = now if now is not None else time.time()
+        self.series = {
+            url: s for url, s in self.series.items()
+            if s.last_seen is not None and now - s.last_seen < KEEP_SECONDS
+        }
+
+    def to_dict(self):
+        return {
+            'version': PROGRESS_VERSION,
+            'tournaments': {url: s.samples for url, s in sorted(self.series.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data or data.get('version') != PROGRESS_VERSION:
+            return cls()
+        return cls({url: ProgressSeries(url, samples) for url, samples in data.get('tournaments', {}).items()})
+
+
+def load_progress(path):
+    """Load the progress series, returning an empty tracker if missing or invalid"""
+    try:
+        with open(path, 'r') as f:
+            return ProgressTracker.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return ProgressTracker()
+
+
+def save_progress(tracker, path):
+    """Write the progress series atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(tracker.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+def format_epoch(epoch):
+    """Local 'HH:MM AM' for an epoch (for log lines)"""
+    if epoch is None:
+        return '?'
+    return datetime.datetime.fromtimestamp(epoch).strftime('%I:%M %p')
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Freshness Stamps and Watchdog
+Measures how long a change on DigitalPool takes to reach the TV. Each hop
+stamps the tournament record (epoch seconds):
+
+    change_id          hash of the DigitalPool state that is displayed
+    change_seen_after  last scrape that still saw the previous state
+    change_scraped_at  first scrape that saw this state
+    scraped_at         this scrape
+    published_at       committed and pushed by the GitHub workflow
+    fetched_at         first pulled by this display Pi
+    cast_at            on screen (recorded by catt_monitor in the samples)
+
+The watchdog keeps a rolling window of samples, computes per-hop and
+end-to-end latency percentiles, and alerts when freshness goes over the SLO.
+The true moment of the DigitalPool change is only known to lie between
+change_seen_after and change_scraped_at, so detect and end-to-end latencies
+are upper bounds.
+
+    python3 freshness.py stamp tournament_data.json published_at
+    python3 freshness.py report --slo 900
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+
+SAMPLES_FILE = "/var/www/html/freshness.json"
+WINDOW_SIZE = 200  # Samples kept in the rolling window
+WINDOW_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_SLO = float(os.environ.get('TOURNAMENT_FRESHNESS_SLO', 20 * 60))  # End-to-end seconds
+PERCENTILES = (50, 90, 99)
+
+# Record fields whose change is a "source change"
+CHANGE_FIELDS = ('tournament_url', 'status', 'player_count', 'display_tournament')
+
+# hop name -> (from stamp, to stamp)
+HOPS = {
+    'detect': ('change_seen_after', 'change_scraped_at'),
+    'publish': ('change_scraped_at', 'published_at'),
+    'fetch': ('published_at', 'fetched_at'),
+    'cast': ('fetched_at', 'cast_at'),
+    'end_to_end': ('change_seen_after', 'cast_at'),
+}
+
+
+def change_id(record):
+    """Short hash of the displayed DigitalPool state"""
+    state = {field: record.get(field) for field in CHANGE_FIELDS}
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def stamp_scrape(record, previous, now=None):
+    """Stamp a freshly scraped record, carrying change stamps over while the state is unchanged"""
+    now = now if now is not None else time.time()
+    previous = previous or {}
+    record['change_id'] = change_id(record)
+    if previous.get('change_id') == record['change_id']:
+        record['change_seen_after'] = previous.get('change_seen_after')
+        record['change_scraped_at'] = previous.get('change_scraped_at')
+    else:
+        record['change_seen_after'] = previous.get('scraped_at')
+        record['change_scraped_at'] = now
+    record['scraped_at'] = now
+    return record
+
+
+def stamp_fetch(record, previous, now=None):
+    """Stamp fetched_at the first time this Pi sees a published record"""
+    now = now if now is not None else time.time()
+    previous = previous or {}
+    published = record.get('published_at') or record.get('scraped_at')
+    if published and published == (previous.get('published_at') or previous.get('scraped_at')) \
+            and previous.get('fetched_at'):
+        record['fetched_at'] = previous['fetched_at']
+    else:
+        record['fetched_at'] = now
+    return record
+
+
+def hop_latencies(sample):
+    """Seconds per hop for one sample (None where a stamp is missing)"""
+    latencies = {}
+    for hop, (start, end) in HOPS.items():
+        if sample.get(start) is not None and sample.get(end) is not None:
+            latencies[hop] = max(0.0, sample[end] - sample[start])
+        else:
+            latencies[hop] = None
+    return latencies
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class FreshnessWatchdog:
+    """Rolling window of end-to-end samples with percentile stats and an SLO check"""
+
+    def __init__(self, path=SAMPLES_FILE, slo=DEFAULT_SLO, window_size=WINDOW_SIZE,
+                 window_seconds=WINDOW_SECONDS, log=logging.warning):
+        self.path = path
+        self.slo = slo
+        self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.log = log
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('samples', [])
+        except (OSError, ValueError, AttributeError):
+            return []
+
+    def stats(self, samples):
+        per_hop = {hop: [] for hop in HOPS}
+        for sample in samples:
+            for hop, value in hop_latencies(sample).items():
+                if value is not None:
+                    per_hop[hop].append(value)
+        return {
+            hop: dict({f"p{p}": percentile(values, p) for p in PERCENTILES}, count=len(values))
+            for hop, values in per_hop.items()
+        }
+
+    def record(self, record, cast_at=None, now=None):
+        """
+        Add a sample built from a record's stamps plus cast_at
+        Returns the list of SLO alerts (empty when fresh)
+        """
+        now = now if now is not None else time.time()
+        sample = {stamp: record.get(stamp) for pair in HOPS.values() for stamp in pair}
+        sample['change_id'] = record.get('change_id')
+        sample['cast_at'] = cast_at if cast_at is not None else now
+
+        samples = [s for s in self.load() if now - (s.get('cast_at') or 0) < self.window_seconds]
+        samples.append(sample)
+        samples = samples[-self.window_size:]
+        stats = self.stats(samples)
+
+        alerts = self.check(hop_latencies(sample), stats)
+        report = {
+            'updated_at': now,
+            'slo_seconds': self.slo,
+            'latest': hop_latencies(sample),
+            'stats': stats,
+            'alerts': alerts,
+            'samples': samples,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+        for alert in alerts:
+            self.log(f"⚠ Freshness SLO: {alert}")
+        return alerts
+
+    def check(self, latest, stats):
+        alerts = []
+        end_to_end = latest.get('end_to_end')
+        if end_to_end is not None and end_to_end > self.slo:
+            alerts.append(f"latest change took {end_to_end:.0f}s to reach the TV (SLO {self.slo:.0f}s)")
+        p90 = stats['end_to_end'].get('p90')
+        if p90 is not None and p90 > self.slo:
+            alerts.append(f"p90 end-to-end latency is {p90:.0f}s over {stats['end_to_end']['count']} "
+                          f"change(s) (SLO {self.slo:.0f}s)")
+        return alerts
+
+
+def stamp_file(path, field, now=None):
+    """Set one epoch stamp in a record file (used by the GitHub workflow)"""
+    with open(path, 'r') as f:
+        record = json.load(f)
+    record[field] = now if now is not None else time.time()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def print_report(watchdog):
+    samples = watchdog.load()
+    if not samples:
+        print("No freshness samples yet")
+        return 0
+    stats = watchdog.stats(samples)
+    print(f"{'hop':<12}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'count':>8}")
+    for hop, values in stats.items():
+        cells = "".join(f"{values[f'p{p}']:>9.0f}s" if values[f'p{p}'] is not None else f"{'-':>10}"
+                        for p in PERCENTILES)
+        print(f"{hop:<12}{cells}{values['count']:>8}")
+    alerts = watchdog.check(hop_latencies(samples[-1]), stats)
+    for alert in alerts:
+        print(f"⚠ {alert}")
+    return 1 if alerts else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournament freshness stamps and latency report")
+    sub = parser.add_subparsers(dest='command', required=True)
+    stamp = sub.add_parser('stamp', help="Set an epoch stamp field in a record file")
+    stamp.add_argument('file')
+    stamp.add_argument('field')
+    report = sub.add_parser('report', help="Print latency percentiles; exit 1 if over the SLO")
+    report.add_argument('--samples', default=SAMPLES_FILE)
+    report.add_argument('--slo', type=float, default=DEFAULT_SLO, help="End-to-end SLO in seconds")
+    args = parser.parse_args()
+
+    if args.command == 'stamp':
+        stamp_file(args.file, args.field)
+        print(f"✓ Stamped {args.field} in {args.file}")
+        return 0
+    return print_report(FreshnessWatchdog(args.samples, slo=args.slo))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
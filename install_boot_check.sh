@@ -59,6 +59,29 @@ EOF
 
 echo "✓ Systemd service created"
 
+# Publish the last-known-good tournament record as soon as the filesystem is
+# up, without waiting for the network - the boot check refreshes it afterwards
+sudo tee /etc/systemd/system/tournament-warm-start.service > /dev/null << 'EOF'
+[Unit]
+Description=Tournament Warm Start (publish last-known-good data)
+DefaultDependencies=no
+After=local-fs.target
+Before=tournament-boot-check.service
+
+[Service]
+Type=oneshot
+User=pi
+ExecStart=/usr/bin/python3 /home/pi/bankshot_monitor_multi.py --publish-last-good
+SuccessExitStatus=1
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+echo "✓ Warm start service created"
+
 echo ""
 echo "Step 3: Enable and start service"
 echo "--------------------------------------"
@@ -67,6 +90,7 @@ echo "--------------------------------------"
 sudo systemctl daemon-reload
 
 # Enable service to run on boot
+sudo systemctl enable tournament-warm-start.service
 sudo systemctl enable tournament-boot-check.service
 
 # Test the service now
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+LAN State Publisher / Subscriber
+One display Pi fetches the tournament record (git pull) and publishes it to
+the other Pis on the LAN over an HTTP long-poll, instead of every Pi pulling
+the same small JSON from GitHub.
+
+    GET /state?since=<version>&wait=<seconds>
+        200 + envelope as soon as the version differs from `since`
+        304 if nothing changed within `wait` seconds
+    GET /events?offset=<bytes>&generation=<id>
+        The change-event log from a byte offset in the subscriber's log
+        generation (X-Events-Reset: 1 when the log was rotated or rewritten
+        and the subscriber must start over)
+    GET /bracket?since=<version>
+        The live bracket's deltas after a version, or a snapshot when the
+        subscriber is too far behind (see bracket_feed.py)
+    GET /health
+
+The envelope is {version, checksum, published_at, record}. Versions only go
+up (they start from the publish time in ms, so they survive a restart) and
+the checksum is the sha256 of the record's canonical JSON; subscribers
+reject a record whose checksum doesn't match.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bracket_feed import BracketFeed
+from change_events import first_line_generation
+
+
+DEFAULT_PORT = 8765
+MAX_WAIT = 55  # Longest a long-poll is held open (seconds)
+REQUEST_SLACK = 10  # Extra client timeout on top of the long-poll wait
+
+
+def canonical_json(record):
+    return json.dumps(record, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def record_checksum(record):
+    return hashlib.sha256(canonical_json(record)).hexdigest()
+
+
+class StatePublisher:
+    """Holds the current record and wakes long-polling subscribers on change"""
+
+    def __init__(self, events_file=None, bracket_file=None):
+        self.events_file = events_file
+        self.bracket_file = bracket_file
+        self.version = 0
+        self.checksum = None
+        self.envelope = None
+        self.changed = threading.Condition()
+
+    def publish(self, record):
+        """Publish a record; returns True if it differed from the current one"""
+        checksum = record_checksum(record)
+        with self.changed:
+            if checksum == self.checksum:
+                return False
+            self.version = max(self.version + 1, int(time.time() * 1000))
+            self.checksum = checksum
+            self.envelope = json.dumps({
+                'version': self.version,
+                'checksum': checksum,
+                'published_at': time.time(),
+                'record': record,
+            }).encode('utf-8')
+            self.changed.notify_all()
+            return True
+
+    def wait_for_change(self, since, timeout):
+        """Envelope bytes once the version differs from since, or None on timeout"""
+        deadline = time.monotonic() + timeout
+        with self.changed:
+            while self.envelope is None or self.version == since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.changed.wait(remaining)
+            return self.envelope
+
+    def read_events(self, offset, generation=None):
+        """(bytes from offset, reset flag) of the event log"""
+        if not self.events_file or not os.path.exists(self.events_file):
+            return b'', False
+        size = os.path.getsize(self.events_file)
+        reset = offset > size
+        with open(self.events_file, 'rb') as f:
+            if offset and not reset and generation is not None:
+                # A rotated log can be longer than the offset again; its first line differs
+                reset = generation != first_line_generation(f)
+            elif offset and not reset:
+                f.seek(offset - 1)
+                reset = f.read(1) != b'\n'
+            f.seek(0 if reset else offset)
+            return f.read(), reset
+
+    def read_bracket(self, since):
+        """The bracket feed's since() response, or None if there is no feed"""
+        if not self.bracket_file or not os.path.exists(self.bracket_file):
+            return None
+        return BracketFeed.load(self.bracket_file).since(since)
+
+
+def _make_handler(publisher):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body=b'', headers=None):
+            self.send_response(code)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            url = urllib.parse.urlparse(self.path)
+            query = urllib.parse.parse_qs(url.query)
+
+            if url.path == '/health':
+                self._send(200, b'ok')
+            elif url.path == '/state':
+                try:
+                    since = int(query.get('since', ['0'])[0])
+                    wait = min(float(query.get('wait', ['0'])[0]), MAX_WAIT)
+                except ValueError:
+                    self._send(400)
+                    return
+                envelope = publisher.wait_for_change(since, wait)
+                if envelope is None:
+                    self._send(304)
+                else:
+                    self._send(200, envelope, {'Content-Type': 'application/json'})
+            elif url.path == '/events':
+                try:
+                    offset = int(query.get('offset', ['0'])[0])
+                except ValueError:
+                    self._send(400)
+                    return
+                data, reset = publisher.read_events(offset, query.get('generation', [None])[0])
+                self._send(200, data, {'Content-Type': 'application/x-ndjson',
+                                       'X-Events-Reset': '1' if reset else '0'})
+            elif url.path == '/bracket':
+                try:
+                    since = int(query.get('since', ['0'])[0])
+                except ValueError:
+                    self._send(400)
+                    return
+                response = publisher.read_bracket(since)
+                if response is None:
+                    self._send(404)
+                else:
+                    self._send(200, json.dumps(response, separators=(',', ':')).encode('utf-8'),
+                               {'Content-Type': 'application/json'})
+            else:
+                self._send(404)
+
+        def log_message(self, format, *args):
+            pass  # Long-polls would flood the log
+
+    return Handler
+
+
+def start_publisher_server(publisher, host='0.0.0.0', port=DEFAULT_PORT):
+    """Serve the publisher from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _make_handler(publisher))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='lan-publisher', daemon=True)
+    thread.start()
+    return server
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+class StateSubscriber:
+    """Long-polls a publisher and verifies each record it receives"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/')
+        self.version = 0
+        self.last_contact = None
+
+    def _get(self, path, timeout):
+        with urllib.request.urlopen(f"{self.url}{path}", timeout=timeout) as response:
+            self.last_contact = time.time()
+            return response.status, response.headers, response.read()
+
+    def poll(self, wait=MAX_WAIT):
+        """
+        Wait up to `wait` seconds for a newer record
+        Returns the record, or None if nothing changed; raises OSError when
+        the publisher can't be reached and ChecksumMismatch on a bad record
+        """
+        try:
+            status, _, body = self._get(f"/state?since={self.version}&wait={wait}", wait + REQUEST_SLACK)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                self.last_contact = time.time()
+                return None
+            raise
+
+        envelope = json.loads(body)
+        record = envelope.get('record')
+        if record_checksum(record) != envelope.get('checksum'):
+            raise ChecksumMismatch(f"record version {envelope.get('version')} failed its checksum")
+        self.version = envelope['version']
+        return record
+
+    def fetch_events(self, offset, generation=''):
+        """(new event-log bytes, reset flag) from the publisher"""
+        _, headers, body = self._get(f"/events?offset={offset}&generation={generation}", REQUEST_SLACK)
+        return body, headers.get('X-Events-Reset') == '1'
+
+    def fetch_bracket(self, since):
+        """The publisher's bracket deltas after `since` (or a snapshot), None if it has no bracket"""
+        try:
+            _, _, body = self._get(f"/bracket?since={since}", REQUEST_SLACK)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return json.loads(body)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Last-Known-Good Snapshot
+Every good tournament record is also persisted as a versioned snapshot with a
+validity window. At boot the snapshot is published straight away, if it is
+still plausible for the current date and time, so the display is right within
+a second while a fresh scrape or pull runs in the background.
+"""
+
+import datetime
+import json
+import os
+import time
+
+from tournament_model import Tournament, TournamentStatus
+
+
+SNAPSHOT_VERSION = 1
+MAX_AGE = 12 * 60 * 60  # Never trust a snapshot older than this
+CARRYOVER_HOUR = 3  # A tournament may still be running until this hour the next day
+
+
+def _end_of_plausibility(record, saved_at):
+    """Latest time the record can still describe reality (epoch seconds)"""
+    saved = datetime.datetime.fromtimestamp(saved_at)
+    tournament = Tournament.from_record(record)
+
+    if tournament and tournament.date:
+        try:
+            day = datetime.datetime.strptime(tournament.date, "%Y/%m/%d")
+        except ValueError:
+            day = saved.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        # "No tournaments" is only known to be true for the day it was written
+        day = saved.replace(hour=0, minute=0, second=0, microsecond=0)
+        return (day + datetime.timedelta(days=1)).timestamp()
+
+    return (day + datetime.timedelta(days=1, hours=CARRYOVER_HOUR)).timestamp()
+
+
+def save_last_good(path, record, now=None):
+    """Persist a good record with its validity window (written atomically)"""
+    now = now if now is not None else time.time()
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': now,
+        'valid_until': min(now + MAX_AGE, _end_of_plausibility(record, now)),
+        'record': record,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_last_good(path):
+    """Load the snapshot, or None if missing, invalid or from another version"""
+    try:
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def plausible_record(snapshot, now=None):
+    """
+    Return the snapshot's record if it can still be right at `now`, else None:
+    inside its validity window, not a finished tournament, and either dated
+    today or last night's tournament still in progress before CARRYOVER_HOUR
+    """
+    if not snapshot or not isinstance(snapshot.get('record'), dict):
+        return None
+
+    now = now if now is not None else time.time()
+    if now >= snapshot.get('valid_until', 0):
+        return None
+
+    record = snapshot['record']
+    tournament = Tournament.from_record(record)
+    if tournament is None:
+        return record
+
+    if tournament.status is TournamentStatus.COMPLETED:
+        return None
+
+    today = datetime.datetime.fromtimestamp(now)
+    today_str = today.strftime("%Y/%m/%d")
+    yesterday_str = (today - datetime.timedelta(days=1)).strftime("%Y/%m/%d")
+
+    if tournament.date == today_str:
+        return record
+    if (tournament.date == yesterday_str and tournament.status is TournamentStatus.IN_PROGRESS
+            and today.hour < CARRYOVER_HOUR):
+        return record
+    return None
+
+
+def warm_start_record(path, now=None):
+    """The record to publish at boot, marked as a warm start, or None"""
+    record = plausible_record(load_last_good(path), now)
+    if record is None:
+        return None
+    record = dict(record)
+    record['warm_start'] = True
+    return record
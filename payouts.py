@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Payout Tables
+Works out the payout table from the entry fee ("$20 Entry") and player
+count ("24 Players") on the tournament card, instead of picking a static
+payouts15.json / payouts20.json by the tournament name.
+
+How a fee's pot is split is the venue's call, so it comes from a structure
+file the venue maintains (payout_structures.json) rather than from here:
+
+    {"fees": {"15": {"pot_per_entry": 15,
+                     "splits": [[8, [["1st", 65], ["2nd", 35]]],
+                                [16, [["1st", 50], ["2nd", 30], ["3rd", 20]]]]}}}
+
+Each split applies to fields up to its player count; the percentage of a
+line shared by several places ("5th-6th") is what each of them is paid. A fee without a structure (or a
+field larger than its last split) gets no rows, and the display keeps
+showing the venue's static payout file.
+
+A structure can be derived from one of those static files and the field
+size it was written for:
+
+    python3 payouts.py derive /var/www/html/payouts15.json --fee 15 --players 16
+
+Tables for every configured field size are built once per entry fee and
+kept in one compact file, so a player-count change is only a lookup.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+
+PAYOUT_VERSION = 2
+MIN_FIELD = 2
+DEFAULT_FEE = 15
+EIGHT_BALL_FEE = 20  # 8-ball events used payouts20.json before fees were read from the card
+
+_ENTRY_FEE = re.compile(r'\$\s*(\d+(?:\.\d{1,2})?)\s*Entry', re.IGNORECASE)
+_PLACE_RANGE = re.compile(r'^(\d+)\D+-(\d+)')
+_AMOUNT = re.compile(r'[^\d.]')
+
+
+def parse_entry_fee(text):
+    """Entry fee in whole dollars from card or page text ('$20 Entry'), or None"""
+    match = _ENTRY_FEE.search(text or '')
+    return int(float(match.group(1))) if match else None
+
+
+def default_entry_fee(name):
+    """Fee to assume when the card doesn't show one"""
+    return EIGHT_BALL_FEE if name and '8-ball' in name.lower() else DEFAULT_FEE
+
+
+def _places_sharing(label):
+    match = _PLACE_RANGE.match(str(label))
+    return int(match.group(2)) - int(match.group(1)) + 1 if match else 1
+
+
+def load_payout_structures(path):
+    """The venue's {fee: structure} map, or {} if the file is missing or invalid"""
+    try:
+        with open(path, 'r') as f:
+            fees = json.load(f).get('fees', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return {str(fee): structure for fee, structure in fees.items()
+            if isinstance(structure, dict) and structure.get('splits')}
+
+
+def compute_payouts(structure, fee, players):
+    """
+    [place, amount] rows for one field under a fee's structure; amounts are
+    whole dollars each and the rounding remainder goes to 1st (the split
+    need not pay out the whole pot)
+    Returns [] when the structure doesn't cover the field
+    """
+    if not structure or not fee or players < MIN_FIELD:
+        return []
+    split = next((places for largest, places in structure['splits'] if players <= largest), None)
+    if not split:
+        return []
+    pot = players * structure.get('pot_per_entry', fee)
+    rows = [[place, round(pot * percent / 100)] for place, percent in split]
+    paid = round(pot * sum(percent * _places_sharing(place) for place, percent in split) / 100)
+    rows[0][1] += paid - sum(amount * _places_sharing(place) for place, amount in rows)
+    return rows
+
+
+def derive_split(rows, fee, players):
+    """Percent-of-pot split from a static payout file's (place, amount each) rows for one field"""
+    pot = fee * players
+    split = []
+    for place, amount in rows:
+        amount = float(_AMOUNT.sub('', str(amount)) or 0)
+        split.append([str(place), round(amount * 100 / pot, 2)])
+    return split
+
+
+def _structure_key(structures):
+    """Changes whenever the venue's structures do, so stale tables are rebuilt"""
+    data = json.dumps(structures, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+class PayoutTables:
+    """Precomputed payout rows per entry fee, indexed by player count"""
+
+    __slots__ = ('structures', 'tables', 'dirty')
+
+    def __init__(self, structures=None, tables=None):
+        self.structures = structures or {}
+        self.tables = tables or {}
+        self.dirty = False
+
+    def table(self, fee):
+        """Rows for every configured field size for one fee, built on first use"""
+        key = str(fee)
+        if key not in self.tables:
+            structure = self.structures.get(key)
+            largest = max((largest for largest, _ in structure['splits']), default=0) if structure else 0
+            self.tables[key] = [compute_payouts(structure, fee, players) for players in range(MIN_FIELD, largest + 1)]
+            self.dirty = True
+        return self.tables[key]
+
+    def lookup(self, fee, players):
+        """[place, amount] rows for a field, or [] if nobody is paid yet or the fee isn't configured"""
+        if not fee or not players or players < MIN_FIELD:
+            return []
+        table = self.table(fee)
+        return table[players - MIN_FIELD] if players - MIN_FIELD < len(table) else []
+
+    def to_dict(self):
+        return {
+            'version': PAYOUT_VERSION,
+            'structure': _structure_key(self.structures),
+            'min_field': MIN_FIELD,
+            'fees': self.tables,
+        }
+
+    @classmethod
+    def from_dict(cls, data, structures=None):
+        if (not data or data.get('version') != PAYOUT_VERSION
+                or data.get('structure') != _structure_key(structures or {})
+                or data.get('min_field') != MIN_FIELD):
+            return cls(structures)
+        return cls(structures, data.get('fees', {}))
+
+
+def load_payout_tables(path, structures=None):
+    """Load the payout tables, returning an empty set if missing, invalid or out of date"""
+    try:
+        with open(path, 'r') as f:
+            return PayoutTables.from_dict(json.load(f), structures)
+    except (OSError, ValueError):
+        return PayoutTables(structures)
+
+
+def save_payout_tables(tables, path):
+    """Write the payout tables atomically (compact JSON)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(tables.to_dict(), f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    tables.dirty = False
+
+
+def main():
+    from render_display import load_payouts
+
+    parser = argparse.ArgumentParser(description="Venue payout structures")
+    sub = parser.add_subparsers(dest='command', required=True)
+    derive = sub.add_parser('derive', help="Add a split derived from a static payout file")
+    derive.add_argument('payout_file', help="payouts15.json-style file")
+    derive.add_argument('--fee', type=int, required=True, help="Entry fee the file was written for")
+    derive.add_argument('--players', type=int, required=True, help="Field size the file was written for")
+    derive.add_argument('--up-to', type=int, help="Largest field the split applies to (default --players)")
+    derive.add_argument('--structures', default='payout_structures.json', help="Structure file to update")
+    args = parser.parse_args()
+
+    rows = load_payouts(args.payout_file)
+    if not rows:
+        parser.error(f"no payout rows in {args.payout_file}")
+    split = derive_split(rows, args.fee, args.players)
+
+    try:
+        with open(args.structures, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    structure = data.setdefault('fees', {}).setdefault(str(args.fee), {'pot_per_entry': args.fee, 'splits': []})
+    largest = args.up_to or args.players
+    structure['splits'] = sorted([s for s in structure['splits'] if s[0] != largest] + [[largest, split]])
+
+    tmp_path = f"{args.structures}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, args.structures)
+    total = sum(percent * _places_sharing(place) for place, percent in split)
+    print(f"✓ ${args.fee} entry, fields up to {largest}: {split} ({total:.0f}% of the pot)")
+
+
+if __name__ == '__main__':
+    main()
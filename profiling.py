@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Profiling Mode - per-phase cProfile and tracemalloc reports
+Enabled with --profile on the scraper and the scripts/ monitors. Each named
+phase gets its own cProfile stats; top-level phases also get a tracemalloc
+allocation diff. Reports are written to a run directory as plain text so two
+runs can be compared with diff.
+
+When profiling is off every phase() is a shared no-op context manager.
+"""
+
+import atexit
+import contextlib
+import datetime
+import json
+import os
+import signal
+import sys
+import time
+
+
+DEFAULT_PROFILE_ROOT = "/tmp/tournament_profile"
+TOP_N = 25
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class NullProfiler:
+    """Profiling switched off - phases cost one attribute lookup and a with"""
+    enabled = False
+    run_dir = None
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def write_reports(self):
+        return None
+
+
+class Profiler:
+    """
+    Collects cProfile stats per phase (exclusive time - a nested phase pauses
+    its parent) and tracemalloc allocation diffs for top-level phases
+    """
+    enabled = True
+
+    def __init__(self, run_dir, top_n=TOP_N):
+        self.run_dir = run_dir
+        self.top_n = top_n
+        self.profiles = {}
+        self.wall_times = {}
+        self.calls = {}
+        self.allocations = {}
+        self._stack = []
+        self._written = False
+        os.makedirs(run_dir, exist_ok=True)
+        # Profiling modules are only imported when profiling is switched on
+        import cProfile
+        import tracemalloc
+        self._cprofile = cProfile
+        self._tracemalloc = tracemalloc
+        tracemalloc.start(10)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        tracemalloc = self._tracemalloc
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = self._cprofile.Profile()
+
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.disable()
+
+        top_level = parent is None
+        before = tracemalloc.take_snapshot() if top_level else None
+
+        self._stack.append(profile)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            self.wall_times[name] = self.wall_times.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+            if top_level:
+                self._record_allocations(name, before)
+            if parent is not None:
+                parent.enable()
+
+    def _record_allocations(self, name, before):
+        """Accumulate the allocation diff of one phase run, keyed by source line"""
+        tracemalloc = self._tracemalloc
+        after = tracemalloc.take_snapshot()
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        totals = self.allocations.setdefault(name, {})
+        for stat in stats:
+            if not stat.size_diff and not stat.count_diff:
+                continue
+            frame = stat.traceback[0]
+            key = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            size, count = totals.get(key, (0, 0))
+            totals[key] = (size + stat.size_diff, count + stat.count_diff)
+
+    def write_reports(self):
+        """Write <phase>.pstats, <phase>.txt, allocations.txt and summary.json"""
+        if self._written:
+            return self.run_dir
+        self._written = True
+        import io
+        import pstats
+
+        summary = {}
+        for name, profile in sorted(self.profiles.items()):
+            safe = name.replace('/', '_').replace(' ', '_')
+            try:
+                profile.dump_stats(os.path.join(self.run_dir, f"{safe}.pstats"))
+                out = io.StringIO()
+                stats = pstats.Stats(profile, stream=out)
+                stats.strip_dirs().sort_stats('cumulative').print_stats(self.top_n)
+                with open(os.path.join(self.run_dir, f"{safe}.txt"), 'w') as f:
+                    f.write(out.getvalue())
+            except (TypeError, ValueError):
+                # Phase was entered but never produced any samples
+                pass
+            summary[name] = {
+                'calls': self.calls.get(name, 0),
+                'wall_seconds': round(self.wall_times.get(name, 0.0), 4),
+            }
+
+        with open(os.path.join(self.run_dir, "allocations.txt"), 'w') as f:
+            for name, totals in sorted(self.allocations.items()):
+                f.write(f"== {name} (top {self.top_n} by net bytes) ==\n")
+                ranked = sorted(totals.items(), key=lambda item: (-item[1][0], item[0]))
+                for key, (size, count) in ranked[:self.top_n]:
+                    f.write(f"{size:>12} B {count:>8} blocks  {key}\n")
+                f.write("\n")
+
+        current, peak = self._tracemalloc.get_traced_memory()
+        summary['_tracemalloc'] = {'current_bytes': current, 'peak_bytes': peak}
+        with open(os.path.join(self.run_dir, "summary.json"), 'w') as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+
+        return self.run_dir
+
+
+def add_profile_argument(parser):
+    """Add the shared --profile [DIR] option to an argparse parser"""
+    parser.add_argument(
+        '--profile', nargs='?', const='', default=None, metavar='DIR',
+        help=f"Profile each phase with cProfile/tracemalloc and write reports to DIR "
+             f"(default: a new directory under {DEFAULT_PROFILE_ROOT})"
+    )
+
+
+def make_profiler(profile_arg, program):
+    """
+    Build the profiler for a --profile value (None means off)
+    Reports are written automatically at exit, including on SIGTERM
+    """
+    if profile_arg is None:
+        return NullProfiler()
+
+    run_dir = profile_arg or os.path.join(
+        DEFAULT_PROFILE_ROOT,
+        f"{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}-{program}"
+    )
+    profiler = Profiler(run_dir)
+
+    def _write():
+        path = profiler.write_reports()
+        print(f"Profile reports written to {path}", file=sys.stderr)
+
+    atexit.register(_write)
+    if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    return profiler
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Static Display Renderer
+Renders the tournament display page (name, start time, payout table, live
+matches, QR) to a plain HTML file whenever the tournament state changes, so
+kiosks and Chromecasts load a static file instead of running PHP on every
+refresh or the whole DigitalPool bracket page.
+
+The page is written atomically next to tournament_data.json. A render key
+(hash of the displayed record fields, the payout file, the bracket and the
+QR image) is stored alongside it, so unchanged state is never re-rendered
+and consumers can tell whether the static page is current.
+"""
+
+import hashlib
+import html
+import json
+import os
+
+
+WEB_ROOT = "/var/www/html"
+PAGE_NAME = "tournament.html"
+KEY_SUFFIX = ".key"
+QR_IMAGE = "qr_code.png"  # Written by generate_qr.php
+BRACKET_FILE = "bracket.json"  # Written by tournament_monitor.py from the bracket feed
+BRACKET_ROWS = 8  # Live matches plus the latest results shown on the page
+REFRESH_SECONDS = 60  # The page reloads itself to pick up a re-render
+
+# Record fields that change what is on screen (last_updated etc. don't)
+DISPLAY_FIELDS = (
+    'tournament_name', 'venue', 'date', 'start_time', 'status',
+    'player_count', 'entry_fee', 'payouts', 'payout_data', 'display_tournament', 'stale',
+)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{refresh}">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{name}</title>
+<style>
+body {{ margin: 0; background: #0b3d2e; color: #fff; font-family: sans-serif; }}
+main {{ display: flex; justify-content: space-between; padding: 3vh 4vw; }}
+h1 {{ font-size: 5vh; margin: 0 0 1vh; }}
+.meta {{ font-size: 3vh; color: #cfe8dc; margin-bottom: 3vh; }}
+.stale {{ background: #8a5a00; padding: 1vh 4vw; font-size: 2.2vh; }}
+table {{ border-collapse: collapse; font-size: 3.2vh; }}
+td {{ padding: 0.6vh 2vw; border-bottom: 1px solid #2e6b55; }}
+td.amount {{ text-align: right; font-weight: bold; }}
+h2 {{ font-size: 3vh; margin: 3vh 0 1vh; color: #cfe8dc; }}
+td.score {{ text-align: center; white-space: nowrap; }}
+.winner {{ font-weight: bold; }}
+tr.live td {{ color: #ffd54f; }}
+.qr img {{ width: 28vh; height: 28vh; background: #fff; padding: 1vh; }}
+.qr p {{ text-align: center; font-size: 2.2vh; }}
+</style>
+</head>
+<body>
+{stale}<main>
+<section>
+<h1>{name}</h1>
+<div class="meta">{meta}</div>
+{payouts}
+{bracket}
+</section>
+{qr}
+</main>
+</body>
+</html>
+"""
+
+
+def load_payouts(path):
+    """
+    Rows of (place, amount) from a payout JSON file
+    Accepts a list of {place, amount} objects, a list of pairs, a
+    {place: amount} mapping, or any of those under a 'payouts' key
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if isinstance(data, dict) and isinstance(data.get('payouts'), (list, dict)):
+        data = data['payouts']
+
+    rows = []
+    if isinstance(data, dict):
+        rows = [(k, v) for k, v in data.items() if not isinstance(v, (dict, list))]
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict):
+                place = item.get('place', item.get('position', item.get('label')))
+                amount = item.get('amount', item.get('payout', item.get('prize')))
+                if place is not None and amount is not None:
+                    rows.append((place, amount))
+            elif isinstance(item, (list, tuple)) and len(item) == 2:
+                rows.append((item[0], item[1]))
+    return rows
+
+
+def load_bracket_view(record, web_root=WEB_ROOT):
+    """The saved bracket if it belongs to the record's tournament, else None"""
+    try:
+        with open(os.path.join(web_root, BRACKET_FILE), 'r') as f:
+            bracket = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(bracket, dict) or not record.get('tournament_url') \
+            or bracket.get('url') != record['tournament_url']:
+        return None
+    return bracket
+
+
+def bracket_rows(bracket, limit=BRACKET_ROWS):
+    """
+    (round, [name, name], scores, winner index, live) for the matches in
+    play, then the most recently numbered finished ones
+    """
+    players = bracket.get('players', [])
+    matches = bracket.get('matches', {})
+
+    def number(match_id):
+        return int(match_id) if str(match_id).isdigit() else 0
+
+    live = sorted((m_id for m_id, m in matches.items() if m.get('status') == 'in_progress'), key=number)
+    done = sorted((m_id for m_id, m in matches.items() if m.get('status') == 'completed'), key=number, reverse=True)
+    rows = []
+    for m_id in (live + done)[:limit]:
+        match = matches[m_id]
+        ids = match.get('players') or [None, None]
+        names = [players[i] if isinstance(i, int) and i < len(players) else 'TBD' for i in ids]
+        winner = ids.index(match['winner']) if match.get('winner') is not None and match['winner'] in ids else None
+        rows.append((match.get('round'), names, match.get('scores') or [None, None], winner, m_id in live))
+    return rows
+
+
+def _render_bracket(bracket):
+    rows = bracket_rows(bracket) if bracket else []
+    if not rows:
+        return ""
+    lines = []
+    for round_name, names, scores, winner, live in rows:
+        cells = [html.escape(str(n)) for n in names]
+        if winner is not None:
+            cells[winner] = f'<span class="winner">{cells[winner]}</span>'
+        score = ' - '.join('' if s is None else str(s) for s in scores) if any(s is not None for s in scores) else 'vs'
+        row_class = ' class="live"' if live else ''
+        lines.append(f'<tr{row_class}><td>{html.escape(round_name or "")}</td>'
+                     f'<td>{cells[0]}</td><td class="score">{html.escape(score)}</td><td>{cells[1]}</td></tr>')
+    return "<h2>Matches</h2>\n<table>\n" + "\n".join(lines) + "\n</table>"
+
+
+def _format_amount(amount):
+    if isinstance(amount, (int, float)):
+        return f"${amount:,.0f}"
+    return str(amount)
+
+
+def _file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def render_key(record, web_root=WEB_ROOT):
+    """Hash of everything that affects the rendered page"""
+    parts = {field: record.get(field) for field in DISPLAY_FIELDS}
+    if record.get('payout_data'):
+        parts['_payouts'] = _file_digest(os.path.join(web_root, record['payout_data']))
+    bracket = load_bracket_view(record, web_root)
+    parts['_bracket'] = bracket.get('version') if bracket else None
+    parts['_qr'] = _file_digest(os.path.join(web_root, QR_IMAGE))
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def render_page(record, web_root=WEB_ROOT):
+    """The display page HTML for a record"""
+    name = html.escape(record.get('tournament_name') or 'Tournament')
+
+    meta = [record.get('date'), record.get('start_time') and f"Starts {record['start_time']}",
+            record.get('status'), record.get('player_count') and f"{record['player_count']} players",
+            record.get('entry_fee') and f"${record['entry_fee']} entry"]
+    meta = ' &middot; '.join(html.escape(str(m)) for m in meta if m)
+
+    # The scraper's rows for the current field; the static payout file is the fallback
+    rows = [tuple(row) for row in record.get('payouts') or []]
+    if not rows and record.get('payout_data'):
+        rows = load_payouts(os.path.join(web_root, record['payout_data']))
+    if rows:
+        payouts = "<table>\n" + "\n".join(
+            f"<tr><td>{html.escape(str(place))}</td><td class=\"amount\">{html.escape(_format_amount(amount))}</td></tr>"
+            for place, amount in rows
+        ) + "\n</table>"
+    else:
+        payouts = ""
+
+    qr = ""
+    if os.path.exists(os.path.join(web_root, QR_IMAGE)):
+        # Cache-bust with the image hash so a new QR shows up immediately
+        digest = (_file_digest(os.path.join(web_root, QR_IMAGE)) or '')[:12]
+        qr = (f'<aside class="qr"><img src="{QR_IMAGE}?v={digest}" alt="Bracket QR code">'
+              f'<p>Scan for the live bracket</p></aside>')
+
+    stale = ""
+    if record.get('stale'):
+        stale = '<div class="stale">Live results are temporarily unavailable - showing the last update</div>\n'
+
+    bracket = _render_bracket(load_bracket_view(record, web_root))
+
+    return PAGE_TEMPLATE.format(refresh=REFRESH_SECONDS, name=name, meta=meta,
+                                payouts=payouts, bracket=bracket, qr=qr, stale=stale)
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def page_path(web_root=WEB_ROOT):
+    return os.path.join(web_root, PAGE_NAME)
+
+
+def is_current(record, web_root=WEB_ROOT):
+    """True if the static page was rendered from this record's display state"""
+    try:
+        with open(page_path(web_root) + KEY_SUFFIX, 'r') as f:
+            return f.read().strip() == render_key(record, web_root)
+    except OSError:
+        return False
+
+
+def render_if_changed(record, web_root=WEB_ROOT):
+    """
+    Render the static page if the display state changed since the last render
+    Returns the page path if it was (re)written, None if it was already current
+    """
+    if not record or not record.get('display_tournament'):
+        return None
+
+    key = render_key(record, web_root)
+    path = page_path(web_root)
+    key_path = path + KEY_SUFFIX
+    try:
+        with open(key_path, 'r') as f:
+            if f.read().strip() == key and os.path.exists(path):
+                return None
+    except OSError:
+        pass
+
+    _write_atomic(path, render_page(record, web_root))
+    # Key last: a crash in between just means one extra render next time
+    _write_atomic(key_path, key)
+    return path
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Week-Ahead Schedule Cache
+The full upcoming tournament list is scraped once a day ("schedule sync") and
+stored indexed by date. Intraday runs only re-check the tournaments due that
+day and skip scraping entirely on days with nothing scheduled.
+"""
+
+import datetime
+import json
+import os
+import time
+
+from tournament_model import Tournament
+
+
+SCHEDULE_VERSION = 1
+SCHEDULE_MAX_AGE = 12 * 60 * 60  # Re-sync at least this often, even on the same day
+
+
+class Schedule:
+    """Upcoming tournaments keyed by date ('YYYY/MM/DD')"""
+
+    __slots__ = ('synced_on', 'synced_at', 'days')
+
+    def __init__(self, synced_on=None, synced_at=None, days=None):
+        self.synced_on = synced_on
+        self.synced_at = synced_at
+        self.days = days or {}
+
+    @classmethod
+    def from_tournaments(cls, tournaments, today_str):
+        """Index a freshly scraped listing, dropping anything before today"""
+        days = {}
+        for t in tournaments:
+            if not t.date or t.date < today_str:
+                continue
+            days.setdefault(t.date, []).append(t)
+        for day in days.values():
+            day.sort(key=lambda t: t.sort_key)
+        return cls(synced_on=today_str, synced_at=time.time(), days=days)
+
+    def is_synced_for(self, today_str, now=None, max_age=SCHEDULE_MAX_AGE):
+        """True if the schedule was synced today and is not older than max_age"""
+        if self.synced_on != today_str or not self.synced_at:
+            return False
+        now = now if now is not None else time.time()
+        return now - self.synced_at < max_age
+
+    def tournaments_on(self, date_str):
+        return list(self.days.get(date_str, []))
+
+    def update(self, tournaments):
+        """Replace scheduled entries with re-checked copies (matched by URL)"""
+        by_url = {t.url: t for t in tournaments if t.url}
+        for date_str, day in self.days.items():
+            self.days[date_str] = [by_url.get(t.url, t) for t in day]
+
+    def to_dict(self):
+        return {
+            'version': SCHEDULE_VERSION,
+            'synced_on': self.synced_on,
+            'synced_at': self.synced_at,
+            'days': {
+                date_str: [t.to_dict() for t in day]
+                for date_str, day in sorted(self.days.items())
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data or data.get('version') != SCHEDULE_VERSION:
+            return cls()
+        days = {
+            date_str: [Tournament.from_dict(t) for t in day]
+            for date_str, day in data.get('days', {}).items()
+        }
+        return cls(synced_on=data.get('synced_on'), synced_at=data.get('synced_at'), days=days)
+
+
+def load_schedule(path):
+    """Load the cached schedule, returning an empty (unsynced) one if missing or invalid"""
+    try:
+        with open(path, 'r') as f:
+            return Schedule.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return Schedule()
+
+
+def save_schedule(schedule, path):
+    """Write the schedule atomically so a reader never sees a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(schedule.to_dict(), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def today_string(today=None):
+    """Today's date in DigitalPool's 'YYYY/MM/DD' format"""
+    return (today or datetime.date.today()).strftime("%Y/%m/%d")
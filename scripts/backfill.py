@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Historical Backfill
+Fills a local SQLite archive with past Bankshot tournaments (name, date,
+start, status, players, entry fee) for capacity planning. The scraper itself
+only ever looks at today, and DigitalPool's listing only reaches a few days
+back, so past events are found the way the scraper's fallback finds URLs:
+the recurring tournament names seen so far are turned into candidate URLs
+for each date (construct_tournament_url) and their pages are read.
+
+    python3 scripts/backfill.py --from 2025/06/01 --to 2025/11/30
+    python3 scripts/backfill.py --from 2025/06/01 --to 2025/11/30 --workers 6 --name "Wednesday 8-Ball"
+
+Pages load in a bounded pool of browser tabs, a chunk of dates at a time.
+Every finished date is checkpointed in the archive, so an interrupted run
+resumes where it stopped, and tournaments are keyed by URL so nothing is
+stored twice. Throughput is reported in tournaments per minute.
+"""
+
+import argparse
+import datetime
+import re
+import sqlite3
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import bankshot_monitor_multi as monitor
+from browser_pool import BrowserPool, BrowserTask
+from change_events import load_snapshot
+from schedule_cache import load_schedule
+from tournament_model import Tournament
+
+DEFAULT_ARCHIVE = str(Path(monitor.STATE_DIR) / 'tournament_archive.db')
+DEFAULT_WORKERS = 4
+MAX_WORKERS = 8  # One Chrome on a Pi doesn't get faster past this many tabs
+CHUNK_DAYS = 7  # Dates whose pages are loaded together before a checkpoint
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    url TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    date TEXT,
+    start_time TEXT,
+    status TEXT,
+    player_count INTEGER,
+    entry_fee INTEGER,
+    completion_pct INTEGER,
+    fetched_at REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tournaments_by_date ON tournaments (date);
+CREATE TABLE IF NOT EXISTS backfill_days (
+    date TEXT PRIMARY KEY,
+    pages INTEGER,
+    found INTEGER,
+    done_at REAL
+) WITHOUT ROWID;
+"""
+
+
+class Archive:
+    """The SQLite archive: tournaments by URL plus the backfill checkpoint"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def names(self):
+        return [row[0] for row in self.db.execute("SELECT DISTINCT name FROM tournaments")]
+
+    def known_urls(self):
+        return {row[0] for row in self.db.execute("SELECT url FROM tournaments")}
+
+    def done_dates(self):
+        return {row[0] for row in self.db.execute("SELECT date FROM backfill_days")}
+
+    def store(self, tournaments):
+        """Insert or refresh tournaments (one row per URL); returns how many were new"""
+        before = self.count()
+        self.db.executemany(
+            """INSERT INTO tournaments (url, name, date, start_time, status, player_count,
+                                        entry_fee, completion_pct, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (url) DO UPDATE SET
+                   name = excluded.name, date = excluded.date,
+                   start_time = COALESCE(excluded.start_time, start_time),
+                   status = excluded.status, player_count = excluded.player_count,
+                   entry_fee = COALESCE(excluded.entry_fee, entry_fee),
+                   completion_pct = excluded.completion_pct, fetched_at = excluded.fetched_at""",
+            [(t.url, t.name, t.date, t.start_time, t.status.value, t.player_count,
+              t.entry_fee, t.completion_pct, time.time()) for t in tournaments]
+        )
+        return self.count() - before
+
+    def checkpoint(self, dates, pages, found):
+        """Mark dates as done, in the same transaction as their tournaments"""
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO backfill_days (date, pages, found, done_at) VALUES (?, ?, ?, ?)",
+            [(date, pages.get(date, 0), found.get(date, 0), now) for date in dates]
+        )
+        self.db.commit()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM tournaments").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def name_template(name):
+    """A tournament name without its date prefix ('2025/11/19 Wednesday 8-Ball' -> 'Wednesday 8-Ball')"""
+    return re.sub(r'^\d{4}/\d{2}/\d{2}\s+', '', name or '').strip()
+
+
+def seed_names(archive, extra_names):
+    """Recurring tournament names from the archive, the schedule cache, the snapshot and --name"""
+    names = list(extra_names) + archive.names()
+    names += [t.name for day in load_schedule(monitor.SCHEDULE_FILE).days.values() for t in day]
+    names += [t.name for t in load_snapshot(monitor.SNAPSHOT_FILE).values()]
+    templates = {}
+    for name in names:
+        template = name_template(name)
+        if template and not template.lower().startswith('no tournament'):
+            templates.setdefault(template.lower(), template)
+    return sorted(templates.values())
+
+
+def runs_on(template, day):
+    """Names that mention a weekday only run on that weekday"""
+    words = set(re.findall(r'[a-z]+', template.lower()))
+    named = words.intersection(WEEKDAYS)
+    return not named or WEEKDAYS[day.weekday()] in named
+
+
+def date_range(date_from, date_to):
+    day = datetime.datetime.strptime(date_from, '%Y/%m/%d').date()
+    last = datetime.datetime.strptime(date_to, '%Y/%m/%d').date()
+    while day <= last:
+        yield day
+        day += datetime.timedelta(days=1)
+
+
+def candidates_for(day, templates, skip_urls):
+    """Candidate Tournaments (name, date, constructed URL) for one date, minus known URLs"""
+    date_str = day.strftime('%Y/%m/%d')
+    found = {}
+    for template in templates:
+        if not runs_on(template, day):
+            continue
+        url = monitor.construct_tournament_url(date_str, template)
+        if url not in skip_urls and url not in found:
+            found[url] = Tournament(template, venue=f"{monitor.VENUE_NAME}, {monitor.VENUE_CITY}",
+                                    date=date_str, url=url)
+    return list(found.values())
+
+
+def tournament_path(url):
+    """A tournament URL's path, without host, quoting or trailing slash"""
+    return urllib.parse.unquote(urllib.parse.urlparse(url or '').path).rstrip('/').lower()
+
+
+def read_archive_page(driver, tournament):
+    """A tournament page read for the archive, or None if there is no such tournament"""
+    from selenium.webdriver.common.by import By
+
+    # The tab must be showing this candidate (not a redirect, or the page it showed before)
+    loaded = tournament_path(driver.current_url)
+    expected = tournament_path(tournament.url)
+    if not expected or not (loaded == expected or loaded.startswith(expected + '/')):
+        return None
+
+    page_text = driver.find_element(By.TAG_NAME, "body").text
+    # A made-up URL gets DigitalPool's not-found page, which doesn't name the venue
+    if monitor.VENUE_NAME.lower() not in page_text.lower():
+        return None
+    tournament = monitor.read_tournament_page(driver, tournament)
+    if tournament is not None and not tournament.start_time:
+        start_time = monitor.extract_start_time(page_text)
+        if start_time:
+            tournament = Tournament.from_dict({**tournament.to_dict(), 'start_time': start_time,
+                                               'start_time_parsed': None})
+    return tournament
+
+
+def fetch_chunk(pool, candidates):
+    """Load every candidate page in the pool; returns (tournaments found, pages that failed to load)"""
+    tasks = [
+        BrowserTask(t.name, t.url, lambda d, t=t: read_archive_page(d, t),
+                    ready=monitor.tournament_page_ready, timeout=monitor.RECHECK_TIMEOUT,
+                    settle=monitor.PAGE_SETTLE)
+        for t in candidates
+    ]
+    pool.run_all(tasks)
+    found = [task.result for task in tasks if task.ok and task.result is not None]
+    failed = [task for task in tasks if not task.ok]
+    return found, failed
+
+
+def backfill(archive, date_from, date_to, workers, extra_names, refresh=False):
+    """Walk the date range chunk by chunk; returns (tournaments read, new in the archive, minutes taken)"""
+    done = set() if refresh else archive.done_dates()
+    days = [day for day in date_range(date_from, date_to) if day.strftime('%Y/%m/%d') not in done]
+    if not days:
+        print(f"Every date from {date_from} to {date_to} is already archived")
+        return 0, 0, 0.0
+
+    templates = seed_names(archive, extra_names)
+    if not templates:
+        print("✗ No tournament names to look for - run the scraper first or pass --name")
+        return 0, 0, 0.0
+    print(f"{len(days)} date(s) to backfill, {len(templates)} recurring name(s): {', '.join(templates)}")
+    if done:
+        print(f"Resuming: {len(done)} date(s) already checkpointed")
+
+    known = set() if refresh else archive.known_urls()
+    started = time.monotonic()
+    read = stored = 0
+    driver = monitor.open_browser(headless=True, page_load_strategy='none')
+    try:
+        pool = BrowserPool(driver, max_tabs=workers, log=monitor.log)
+        for first in range(0, len(days), CHUNK_DAYS):
+            chunk = days[first:first + CHUNK_DAYS]
+            dates = [day.strftime('%Y/%m/%d') for day in chunk]
+            candidates = [t for day in chunk for t in candidates_for(day, templates, known)]
+
+            found, failed = fetch_chunk(pool, candidates) if candidates else ([], [])
+            monitor.LIVE_BRACKETS.clear()  # Only the live scraper publishes brackets
+
+            read += len(found)
+            stored += archive.store(found)
+            known.update(t.url for t in found)
+            pages, per_date = {}, {}
+            for t in candidates:
+                pages[t.date] = pages.get(t.date, 0) + 1
+            for t in found:
+                per_date[t.date] = per_date.get(t.date, 0) + 1
+            # A date with pages that didn't load is retried on the next run
+            retry = {task.url for task in failed}
+            complete = [date for date in dates if not any(t.date == date and t.url in retry for t in candidates)]
+            archive.checkpoint(complete, pages, per_date)
+
+            minutes = (time.monotonic() - started) / 60
+            print(f"  {dates[0]} - {dates[-1]}: {len(found)} tournament(s) from {len(candidates)} page(s)"
+                  f"{f', {len(failed)} failed' if failed else ''} - "
+                  f"{read / minutes if minutes else 0:.1f} tournaments/min")
+    finally:
+        monitor.close_browser(driver)
+
+    return read, stored, (time.monotonic() - started) / 60
+
+
+def main():
+    today = datetime.date.today()
+    parser = argparse.ArgumentParser(description="Backfill past tournaments into a local archive")
+    parser.add_argument('--from', dest='date_from', default=(today - datetime.timedelta(days=90)).strftime('%Y/%m/%d'),
+                        help="First date (YYYY/MM/DD, default 90 days ago)")
+    parser.add_argument('--to', dest='date_to', default=(today - datetime.timedelta(days=1)).strftime('%Y/%m/%d'),
+                        help="Last date (YYYY/MM/DD, default yesterday)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Pages loaded at the same time (1-{MAX_WORKERS})")
+    parser.add_argument('--name', action='append', default=[],
+                        help="Recurring tournament name to look for (repeatable)")
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE, help="SQLite archive to fill")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Ignore the checkpoint and re-read tournaments already archived")
+    args = parser.parse_args()
+
+    for value in (args.date_from, args.date_to):
+        if not re.match(r'^\d{4}/\d{2}/\d{2}$', value):
+            parser.error(f"dates must be YYYY/MM/DD, got {value!r}")
+    workers = max(1, min(args.workers, MAX_WORKERS))
+
+    monitor.browser_run().reap_orphans()
+    archive = Archive(args.archive)
+    try:
+        read, stored, minutes = backfill(archive, args.date_from, args.date_to, workers, args.name, args.refresh)
+        rate = read / minutes if minutes else 0
+        print("=" * 60)
+        print(f"✓ {read} tournament(s) read, {stored} new, in {minutes:.1f} min ({rate:.1f} tournaments/min)")
+        print(f"  Archive {args.archive}: {archive.count()} tournament(s)")
+        print("=" * 60)
+    except KeyboardInterrupt:
+        print("\n○ Interrupted - finished dates are checkpointed, run again to resume")
+        sys.exit(130)
+    finally:
+        archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Browser Backend Benchmark
+Compares the chromedriver path with the direct CDP backend on the same page:
+browser start, page load, per-element DOM extraction (one call per card, the
+way search_tournaments_on_page used to read cards), batched extraction (one
+execute_script for all cards), quit, and resident memory of the whole browser
+process tree (chromedriver included).
+
+    python3 scripts/benchmark_backends.py --runs 5
+    python3 scripts/benchmark_backends.py --url file:///tmp/digitalpool_page.html --json results.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bankshot_monitor_multi as monitor
+
+CARD_SELECTOR = ".ant-card"
+SETTLE_SECONDS = 3
+
+
+def process_tree_rss_kb(root_pid):
+    """Sum VmRSS of a process and all of its descendants"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # Field 4 is the parent pid; the command name may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def root_pid(driver, backend):
+    if backend == 'cdp':
+        return driver.process.pid
+    # chromedriver is the parent of the Chrome processes
+    return driver.service.process.pid
+
+
+def run_once(backend, url):
+    """One benchmark pass; returns a dict of timings in ms and memory in KB"""
+    from selenium.webdriver.common.by import By
+
+    monitor.BROWSER_BACKEND = backend
+    result = {}
+
+    started = time.perf_counter()
+    driver = monitor.open_browser(headless=True)
+    result['start_ms'] = (time.perf_counter() - started) * 1000
+
+    try:
+        started = time.perf_counter()
+        driver.get(url)
+        result['load_ms'] = (time.perf_counter() - started) * 1000
+        time.sleep(SETTLE_SECONDS)
+
+        started = time.perf_counter()
+        cards = driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
+        texts = [card.text for card in cards]
+        for card in cards:
+            try:
+                card.find_element(By.CSS_SELECTOR, "a[href*='/tournaments/']").get_attribute('href')
+            except Exception:
+                pass
+        result['per_element_ms'] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        batched = driver.execute_script(
+            "return Array.from(document.querySelectorAll(arguments[0]), e => {"
+            "  const link = e.querySelector(\"a[href*='/tournaments/']\");"
+            "  return [(e.innerText || '').trim(), link ? link.href : null];"
+            "});",
+            CARD_SELECTOR
+        )
+        result['batched_ms'] = (time.perf_counter() - started) * 1000
+
+        result['cards'] = len(cards)
+        result['batched_cards'] = len(batched or [])
+        result['text_chars'] = sum(len(t) for t in texts)
+        result['rss_kb'] = process_tree_rss_kb(root_pid(driver, backend))
+    finally:
+        started = time.perf_counter()
+        monitor.close_browser(driver)
+        result['quit_ms'] = (time.perf_counter() - started) * 1000
+
+    return result
+
+
+def summarize(runs):
+    keys = [k for k in runs[0] if k.endswith('_ms') or k == 'rss_kb']
+    return {k: statistics.median(r[k] for r in runs) for k in keys}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chromedriver vs direct CDP browser backends")
+    parser.add_argument('--url', default=monitor.DIGITALPOOL_URL, help="Page to load (default: DigitalPool)")
+    parser.add_argument('--runs', type=int, default=3, help="Passes per backend (medians are reported)")
+    parser.add_argument('--backends', nargs='+', choices=monitor.BROWSER_BACKENDS,
+                        default=list(monitor.BROWSER_BACKENDS))
+    parser.add_argument('--json', metavar='FILE', help="Also write the raw results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for backend in args.backends:
+        runs = []
+        for i in range(args.runs):
+            try:
+                runs.append(run_once(backend, args.url))
+                print(f"  {backend} run {i + 1}: {runs[-1]}")
+            except Exception as e:
+                print(f"  ✗ {backend} run {i + 1} failed: {e}")
+        if runs:
+            results[backend] = {'runs': runs, 'median': summarize(runs)}
+
+    if not results:
+        print("✗ No backend completed a run")
+        sys.exit(1)
+
+    columns = ['start_ms', 'load_ms', 'per_element_ms', 'batched_ms', 'quit_ms', 'rss_kb']
+    print("\n" + "=" * 60)
+    print(f"{'backend':<14}" + "".join(f"{c:>15}" for c in columns))
+    for backend, data in results.items():
+        print(f"{backend:<14}" + "".join(f"{data['median'][c]:>15.1f}" for c in columns))
+    print("=" * 60)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'url': args.url, 'results': results}, f, indent=2)
+        print(f"Raw results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,30 +5,57 @@ Automatically switches Chromecast display based on tournament status
 FIXED: Works with bankshot_monitor_multi.py data format
 """
 
+import argparse
 import json
-import subprocess
+import sys
 import time
 import socket
 import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tournament_model import Tournament, load_record
+from change_events import EventType, read_events
+from profiling import NullProfiler, add_profile_argument, make_profiler
+from render_display import PAGE_NAME, REFRESH_SECONDS, is_current
+from freshness import FreshnessWatchdog
+from cast_devices import CastController, load_devices, save_devices, scan_devices, new_device_state, record_result
+
 # Configuration
 TOURNAMENT_DATA_FILE = '/var/www/html/tournament_data.json'
-STATE_FILE = '/var/www/html/cast_state.json'
+STATE_FILE = '/var/www/html/cast_devices_state.json'
+LEGACY_STATE_FILE = '/var/www/html/cast_state.json'  # Single-device state before the registry
+DEVICES_FILE = '/home/pi/cast_devices.json'
+EVENTS_FILE = '/var/www/html/tournament_events.jsonl'
+FRESHNESS_FILE = '/var/www/html/freshness.json'
 LOG_FILE = '/var/log/catt_monitor.log'
 CHECK_INTERVAL = 30  # Check every 30 seconds
 CATT_COMMAND = '/home/pi/.local/bin/catt'
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+# Events that can change what should be on the Chromecast (player counts are
+# part of freshness change_id, so they are re-evaluated to be sampled)
+RELEVANT_EVENTS = {
+    EventType.DISPLAY_CHANGED.value,
+    EventType.STATUS_CHANGED.value,
+    EventType.COMPLETED.value,
+    EventType.PLAYER_COUNT_CHANGED.value,
+}
+
+# Replaced by make_profiler() when --profile is given
+PROFILER = NullProfiler()
+
+
+def setup_logging():
+    """Setup logging (called from main so importing this module has no side effects)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
 
 def get_local_ip():
     """Get the local IP address of the Pi"""
@@ -45,115 +72,158 @@ def get_local_ip():
 def load_tournament_data():
     """Load tournament data from JSON file"""
     try:
-        if Path(TOURNAMENT_DATA_FILE).exists():
-            with open(TOURNAMENT_DATA_FILE, 'r') as f:
-                return json.load(f)
-        return None
+        return load_record(TOURNAMENT_DATA_FILE)
     except Exception as e:
         logging.error(f"Error loading tournament data: {e}")
         return None
 
-def load_cast_state():
-    """Load the current cast state"""
+def load_cast_state(devices):
+    """Load per-device cast state, adding an entry for any new device"""
+    state = {'events_offset': 0, 'events_generation': None, 'devices': {}}
     try:
         if Path(STATE_FILE).exists():
             with open(STATE_FILE, 'r') as f:
-                return json.load(f)
-        return {
-            'is_casting_tournament': False,
-            'last_tournament_url': None,
-            'last_status': None,
-            'cast_started_at': None,
-            'failsafe_check_done': False
-        }
+                state.update(json.load(f))
+        elif Path(LEGACY_STATE_FILE).exists():
+            # Keep our place in the event log when upgrading from cast_state.json
+            with open(LEGACY_STATE_FILE, 'r') as f:
+                state['events_offset'] = json.load(f).get('events_offset', 0)
     except Exception as e:
         logging.error(f"Error loading cast state: {e}")
-        return {
-            'is_casting_tournament': False,
-            'last_tournament_url': None,
-            'last_status': None,
-            'cast_started_at': None,
-            'failsafe_check_done': False
-        }
+    
+    for device in devices:
+        state['devices'].setdefault(device.key, new_device_state())
+    return state
 
 def save_cast_state(state):
     """Save the current cast state"""
     try:
-        with open(STATE_FILE, 'w') as f:
+        tmp_path = f"{STATE_FILE}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(state, f, indent=2)
+        Path(tmp_path).replace(STATE_FILE)
         return True
     except Exception as e:
         logging.error(f"Error saving cast state: {e}")
         return False
 
-def catt_stop():
-    """Stop current CATT cast"""
-    try:
-        logging.info("Stopping current cast...")
-        result = subprocess.run(
-            [CATT_COMMAND, 'stop'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            logging.info("Cast stopped successfully")
-            return True
-        else:
-            logging.warning(f"CATT stop returned non-zero: {result.stderr}")
-            return False
-    except Exception as e:
-        logging.error(f"Error stopping cast: {e}")
-        return False
-
-def catt_cast_site(url):
-    """Cast a website using CATT"""
-    try:
-        logging.info(f"Casting site: {url}")
-        result = subprocess.run(
-            [CATT_COMMAND, 'cast_site', url],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            logging.info("Site cast successfully")
-            return True
-        else:
-            logging.warning(f"CATT cast returned non-zero: {result.stderr}")
-            return False
-    except Exception as e:
-        logging.error(f"Error casting site: {e}")
-        return False
-
-def should_display_tournament(tournament_data):
+def should_display_tournament(tournament):
     """
     Determine if tournament should be displayed based on the scraper's display_tournament flag
     This flag is set by bankshot_monitor_multi.py based on smart logic
     """
-    try:
-        # Primary check: use the display_tournament flag from scraper
-        should_display = tournament_data.get('display_tournament', False)
-        
-        # Additional safety checks
-        status = tournament_data.get('status', '')
-        tournament_name = tournament_data.get('tournament_name', '')
-        
-        # Don't display if explicitly marked as "No tournaments"
-        if 'no tournament' in tournament_name.lower():
-            return False
+    # "No tournaments" records come back as None; status must be In Progress or Upcoming
+    return tournament is not None and tournament.should_display
+
+def read_relevant_events(state):
+    """
+    Tail the scraper's change-event log from our last offset
+    Returns the list of relevant events, or None if no event log is available
+    """
+    if not Path(EVENTS_FILE).exists():
+        return None
+    
+    events, offset, generation = read_events(EVENTS_FILE, state.get('events_offset', 0),
+                                             state.get('events_generation'))
+    if offset != state.get('events_offset') or generation != state.get('events_generation'):
+        state['events_offset'] = offset
+        state['events_generation'] = generation
+        save_cast_state(state)
+    
+    relevant = [e for e in events if e.get('type') in RELEVANT_EVENTS]
+    for event in relevant:
+        logging.info(f"Event: {event['type']} - {event.get('name')} ({event.get('old')} → {event.get('new')})")
+    return relevant
+
+def screen_time(tournament_data, cast_done):
+    """
+    When a record's change reached the screens: the end of the cast that
+    showed it, or else (already casting) the page's next self-refresh after
+    this Pi fetched and rendered the record
+    """
+    if cast_done is not None:
+        return cast_done
+    fetched = tournament_data.get('fetched_at')
+    return fetched + REFRESH_SECONDS if fetched else None
+
+def cast_step(tournament_data, devices, controller, state, watchdog):
+    """
+    Bring every device in line with one tournament record
+    Returns True once every device matches the record (nothing left to retry)
+    """
+    # Get tournament info
+    tournament = Tournament.from_record(tournament_data)
+    tournament_name = tournament.name if tournament else tournament_data.get('tournament_name', 'Unknown')
+    tournament_url = tournament.url if tournament else None
+    status = tournament.status.value if tournament else 'Unknown'
+    should_display = should_display_tournament(tournament)
+    
+    logging.debug(f"Tournament: {tournament_name}")
+    logging.debug(f"  Status: {status}, Should Display: {should_display}")
+    
+    # Get local IP for casting
+    local_ip = get_local_ip()
+    if not local_ip:
+        logging.error("Could not determine local IP address")
+        return False
+    
+    # Cast the pre-rendered static page when it matches the current record
+    if should_display and is_current(tournament_data, str(Path(TOURNAMENT_DATA_FILE).parent)):
+        cast_url = f"http://{local_ip}/{PAGE_NAME}"
+    else:
+        cast_url = f"http://{local_ip}/"
+    
+    device_states = state['devices']
+    cast_done = None
+    not_casting = [d for d in devices if not device_states[d.key]['is_casting_tournament']]
+    casting = [d for d in devices if device_states[d.key]['is_casting_tournament']]
+    
+    # SCENARIO 1: Tournament should be displayed on devices not casting it yet
+    if should_display and not_casting:
+        logging.info(f"🎱 Tournament ready to display")
+        logging.info(f"   Name: {tournament_name}")
+        logging.info(f"   Status: {status}")
+        logging.info(f"   Devices: {', '.join(d.key for d in not_casting)}")
         
-        # Status should be "In Progress" or "Upcoming"
-        if status not in ['In Progress', 'Upcoming', 'in_progress', 'upcoming']:
-            return False
+        # Stop and cast on every pending device at once
+        with PROFILER.phase('cast'):
+            results = controller.cast_site(cast_url, devices=not_casting)
+        cast_done = time.time()
         
-        return should_display
+        for key, result in results.items():
+            record_result(device_states[key], result, tournament_url, status)
+        save_cast_state(state)
         
-    except Exception as e:
-        logging.error(f"Error checking display status: {e}")
-        return False
+        if all(r.ok for r in results.values()):
+            logging.info("✓ Successfully started casting tournament display")
+    
+    # SCENARIO 2: Tournament no longer should be displayed - reset state
+    elif not should_display and casting:
+        logging.info("Tournament no longer should be displayed - Resetting state")
+        for device in casting:
+            device_states[device.key].update(
+                is_casting_tournament=False,
+                last_tournament_url=None,
+                last_status=None,
+                cast_started_at=None
+            )
+        save_cast_state(state)
+    
+    # Freshness: the first time a new DigitalPool change is on every screen
+    change = tournament_data.get('change_id')
+    on_screen = should_display and all(device_states[d.key]['is_casting_tournament'] for d in devices)
+    if change and on_screen and change != state.get('last_change_id'):
+        state['last_change_id'] = change
+        save_cast_state(state)
+        try:
+            watchdog.record(tournament_data, cast_at=screen_time(tournament_data, cast_done))
+        except Exception as e:
+            logging.error(f"Error recording freshness sample: {e}")
+    
+    # Keep re-evaluating every interval until every device matches the data
+    return all(
+        device_states[d.key]['is_casting_tournament'] == should_display for d in devices
+    )
 
 def monitor_and_cast():
     """Main monitoring and casting logic"""
@@ -161,63 +231,32 @@ def monitor_and_cast():
     logging.info("CATT Monitor Starting (Fixed for bankshot_monitor_multi.py)")
     logging.info("=" * 60)
     
-    state = load_cast_state()
+    devices = load_devices(DEVICES_FILE)
+    controller = CastController(devices, catt_command=CATT_COMMAND, log=logging.info)
+    state = load_cast_state(devices)
+    watchdog = FreshnessWatchdog(FRESHNESS_FILE)
+    logging.info(f"Cast devices: {', '.join(d.key for d in devices)}")
+    evaluated_once = False
     
     while True:
         try:
-            # Load current tournament data
-            tournament_data = load_tournament_data()
-            
-            if not tournament_data:
-                logging.debug("No tournament data found")
+            # Only re-evaluate when the scraper reports a relevant change
+            with PROFILER.phase('events'):
+                events = read_relevant_events(state)
+            if evaluated_once and events is not None and not events:
                 time.sleep(CHECK_INTERVAL)
                 continue
             
-            # Get tournament info
-            tournament_name = tournament_data.get('tournament_name', 'Unknown')
-            tournament_url = tournament_data.get('tournament_url')
-            status = tournament_data.get('status', 'Unknown')
-            should_display = should_display_tournament(tournament_data)
-            
-            logging.debug(f"Tournament: {tournament_name}")
-            logging.debug(f"  Status: {status}, Should Display: {should_display}")
+            # Load current tournament data
+            with PROFILER.phase('load'):
+                tournament_data = load_tournament_data()
             
-            # Get local IP for casting
-            local_ip = get_local_ip()
-            if not local_ip:
-                logging.error("Could not determine local IP address")
+            if not tournament_data:
+                logging.debug("No tournament data found")
                 time.sleep(CHECK_INTERVAL)
                 continue
             
-            cast_url = f"http://{local_ip}/"
-            
-            # SCENARIO 1: Tournament should be displayed and we're not casting yet
-            if should_display and not state['is_casting_tournament']:
-                logging.info(f"🎱 Tournament ready to display")
-                logging.info(f"   Name: {tournament_name}")
-                logging.info(f"   Status: {status}")
-                
-                catt_stop()
-                time.sleep(2)
-                
-                if catt_cast_site(cast_url):
-                    state['is_casting_tournament'] = True
-                    state['last_tournament_url'] = tournament_url
-                    state['last_status'] = status
-                    state['cast_started_at'] = datetime.now().isoformat()
-                    state['failsafe_check_done'] = False
-                    save_cast_state(state)
-                    logging.info("✓ Successfully started casting tournament display")
-            
-            # SCENARIO 2: Tournament no longer should be displayed - reset state
-            elif not should_display and state['is_casting_tournament']:
-                logging.info("Tournament no longer should be displayed - Resetting state")
-                state['is_casting_tournament'] = False
-                state['last_tournament_url'] = None
-                state['last_status'] = None
-                state['failsafe_check_done'] = False
-                state['cast_started_at'] = None
-                save_cast_state(state)
+            evaluated_once = cast_step(tournament_data, devices, controller, state, watchdog)
             
             time.sleep(CHECK_INTERVAL)
             
@@ -231,6 +270,24 @@ def monitor_and_cast():
             time.sleep(CHECK_INTERVAL)
 
 def main():
+    global PROFILER
+    parser = argparse.ArgumentParser(description="Smart CATT casting monitor")
+    parser.add_argument('--scan-devices', action='store_true',
+                        help=f"Discover Chromecasts with catt scan, write them to {DEVICES_FILE} and exit")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    setup_logging()
+    
+    if args.scan_devices:
+        devices = scan_devices(CATT_COMMAND)
+        if not devices:
+            logging.error("No cast devices found")
+            sys.exit(1)
+        save_devices(devices, DEVICES_FILE)
+        logging.info(f"Saved {len(devices)} device(s) to {DEVICES_FILE}: {', '.join(d.key for d in devices)}")
+        return
+    PROFILER = make_profiler(args.profile, "catt_monitor")
+    
     monitor_and_cast()
 
 if __name__ == '__main__':
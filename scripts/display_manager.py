@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+HDMI Display Manager
+Keeps Chromium in kiosk mode on the TV during business hours (and 30 minutes
+before today's tournament). Replaces the once-a-minute shell loop: the weekly
+open-hours table is built once, the manager sleeps until the next transition
+and supervises Chromium through its process handle. A new tournament file is
+noticed through inotify on its directory rather than by re-stating it.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import datetime
+import logging
+import os
+import select
+import signal
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tournament_model import Tournament, load_record
+from profiling import NullProfiler, add_profile_argument, make_profiler
+
+# Configuration
+DISPLAY_URL = "http://localhost/ads_display.html"
+TOURNAMENT_DATA = "/var/www/html/tournament_data.json"
+LOG_FILE = "/var/log/hdmi_display.log"
+CHROMIUM_COMMAND = "chromium"
+EARLY_START_MINUTES = 30  # Turn the display on this long before a tournament
+DATA_CHECK_INTERVAL = 10 * 60  # Re-stat the tournament file this often when inotify is unavailable
+MAX_SLEEP = 60 * 60  # Re-evaluate at least hourly in case the clock was stepped (NTP after boot)
+STOP_TIMEOUT = 5  # Seconds to wait for Chromium to exit before killing it
+
+CHROMIUM_ARGS = [
+    '--kiosk',
+    '--noerrdialogs',
+    '--disable-infobars',
+    '--no-first-run',
+    '--disable-session-crashed-bubble',
+    '--disable-restore-session-state',
+    '--disable-translate',
+    '--disable-features=Translate',
+    '--check-for-update-interval=31536000',
+]
+
+# Business hours: weekday (0=Mon .. 6=Sun) -> (opens, closes). A closing time
+# at or before the opening time means the venue closes after midnight.
+BUSINESS_HOURS = {
+    0: ("15:00", "01:00"),  # Monday 3pm - Tuesday 1am
+    1: ("12:00", "01:00"),  # Tuesday 12pm - Wednesday 1am
+    2: ("12:00", "01:00"),  # Wednesday 12pm - Thursday 1am
+    3: ("12:00", "01:00"),  # Thursday 12pm - Friday 1am
+    4: ("12:00", "02:30"),  # Friday 12pm - Saturday 2:30am
+    5: ("12:00", "02:30"),  # Saturday 12pm - Sunday 2:30am
+    6: ("12:00", "01:00"),  # Sunday 12pm - Monday 1am
+}
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# inotify(7) flags and the fixed part of each event (wd, mask, cookie, len)
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# Replaced by make_profiler() when --profile is given
+PROFILER = NullProfiler()
+
+
+def setup_logging():
+    """Setup logging (called from main so importing this module has no side effects)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def _hhmm_to_minutes(value):
+    """Convert 'HH:MM' into minutes since midnight"""
+    hours, minutes = value.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def build_weekly_intervals(hours=BUSINESS_HOURS):
+    """
+    Build the sorted list of open intervals as (start, end) minutes since
+    Monday 00:00. Intervals that run past Sunday midnight are split so every
+    interval lies inside [0, MINUTES_PER_WEEK).
+    """
+    intervals = []
+    for weekday, (opens, closes) in hours.items():
+        start = weekday * MINUTES_PER_DAY + _hhmm_to_minutes(opens)
+        end = weekday * MINUTES_PER_DAY + _hhmm_to_minutes(closes)
+        if end <= start:
+            end += MINUTES_PER_DAY
+        if end > MINUTES_PER_WEEK:
+            intervals.append((start, MINUTES_PER_WEEK))
+            intervals.append((0, end - MINUTES_PER_WEEK))
+        else:
+            intervals.append((start, end))
+
+    # Merge touching or overlapping intervals
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class OpenHours:
+    """Answers 'open now?' and 'when is the next change?' from the weekly table"""
+
+    def __init__(self, hours=BUSINESS_HOURS):
+        self.intervals = build_weekly_intervals(hours)
+
+    def _week_start(self, now):
+        """Local Monday 00:00 of the week containing now"""
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return midnight - datetime.timedelta(days=now.weekday())
+
+    def _absolute_intervals(self, now):
+        """Open intervals as datetimes for the current and following week"""
+        week_start = self._week_start(now)
+        result = []
+        for week in (0, 1):
+            base = week_start + datetime.timedelta(days=7 * week)
+            for start, end in self.intervals:
+                result.append((base + datetime.timedelta(minutes=start),
+                               base + datetime.timedelta(minutes=end)))
+        return result
+
+    def is_open(self, now):
+        return any(start <= now < end for start, end in self._absolute_intervals(now))
+
+    def next_transition(self, now):
+        """The next datetime after now at which the venue opens or closes"""
+        starts, ends = set(), set()
+        for start, end in self._absolute_intervals(now):
+            starts.add(start)
+            ends.add(end)
+        # A boundary that both ends and starts an interval (the Sunday/Monday
+        # split) is not a real transition
+        upcoming = [b for b in starts ^ ends if b > now]
+        return min(upcoming) if upcoming else now + datetime.timedelta(days=1)
+
+
+class TournamentWindow:
+    """The early-start window before today's tournament, reloaded only when the file changes"""
+
+    def __init__(self, path=TOURNAMENT_DATA):
+        self.path = path
+        self._mtime = None
+        self.start = None
+
+    def refresh(self):
+        """Reload the tournament start if the data file changed; returns True if it did"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+
+        if mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        self.load(load_record(self.path) if mtime else None)
+        return True
+
+    def load(self, record):
+        """Take the tournament start from a record already in memory"""
+        tournament = Tournament.from_record(record)
+        start = datetime.datetime.fromtimestamp(tournament.start_epoch) if tournament and tournament.start_epoch else None
+        if start and start != self.start:
+            logging.info(f"Tournament start loaded: {tournament.name} at {start.strftime('%Y-%m-%d %H:%M')}")
+        self.start = start
+
+    def _window(self, now):
+        """(early_start, start) for a tournament dated today, else None"""
+        if not self.start or self.start.date() != now.date():
+            return None
+        return (self.start - datetime.timedelta(minutes=EARLY_START_MINUTES), self.start)
+
+    def is_active(self, now):
+        window = self._window(now)
+        return bool(window) and window[0] <= now < window[1]
+
+    def next_transition(self, now):
+        window = self._window(now)
+        if not window:
+            return None
+        upcoming = [b for b in window if b > now]
+        return min(upcoming) if upcoming else None
+
+
+class DataFileWatch:
+    """
+    inotify watch on the tournament file's directory - the file is replaced
+    (os.replace, git pull) rather than rewritten, so watching the file itself
+    would lose track of it. fileno() is None when inotify is unavailable.
+    """
+
+    def __init__(self, path=TOURNAMENT_DATA):
+        self.name = os.fsencode(os.path.basename(path))
+        self.fd = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            if libc.inotify_add_watch(fd, os.fsencode(os.path.dirname(path) or '.'), mask) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+            self.fd = fd
+        except (OSError, AttributeError) as e:
+            logging.warning(f"inotify unavailable ({e}) - checking {path} every {DATA_CHECK_INTERVAL}s")
+
+    def fileno(self):
+        return self.fd
+
+    def drain(self):
+        """Consume pending events; returns True if any of them was for the tournament file"""
+        changed = False
+        while self.fd is not None:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                changed = changed or data[offset:offset + length].rstrip(b'\0') == self.name
+                offset += length
+        return changed
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class ChromiumSupervisor:
+    """Owns the Chromium process directly instead of pgrep/pkill"""
+
+    def __init__(self, url=DISPLAY_URL):
+        self.url = url
+        self.process = None
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        logging.info("Starting Chromium in kiosk mode")
+        env = dict(os.environ, DISPLAY=os.environ.get('DISPLAY', ':0'))
+        try:
+            self.process = subprocess.Popen(
+                [CHROMIUM_COMMAND] + CHROMIUM_ARGS + [self.url],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            logging.info(f"Chromium started (pid {self.process.pid})")
+        except OSError as e:
+            logging.error(f"Could not start Chromium: {e}")
+            self.process = None
+
+    def stop(self):
+        if not self.is_running():
+            self.process = None
+            return
+        logging.info("Stopping Chromium")
+        try:
+            # Chromium forks helpers into its own session; signal the whole group
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait(timeout=STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            logging.warning("Chromium did not exit - killing")
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+        self.process = None
+
+    def wait(self, timeout, wake_fds=()):
+        """
+        Sleep up to timeout seconds, returning early if Chromium exits or one
+        of wake_fds becomes readable.
+        Uses a pidfd so the sleep is a single blocking select() rather than
+        Popen.wait()'s polling loop.
+        """
+        fds = [fd for fd in wake_fds if fd is not None]
+        running = self.is_running()
+        pidfd = None
+        if running and hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(self.process.pid)
+                fds.append(pidfd)
+            except OSError:
+                pidfd = None
+
+        try:
+            if fds:
+                select.select(fds, [], [], timeout)
+            else:
+                time.sleep(timeout)
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+
+        if running and self.process.poll() is not None:
+            logging.warning(f"Chromium exited unexpectedly (code {self.process.returncode})")
+
+
+def display_step(hours, window, chromium, check_interval=MAX_SLEEP):
+    """
+    Start or stop Chromium for the current time
+    Returns the seconds to sleep before the next evaluation: until the next
+    open-hours or tournament-window transition, at most check_interval
+    """
+    with PROFILER.phase('evaluate'):
+        now = datetime.datetime.now()
+        early = window.is_active(now)
+        should_run = hours.is_open(now) or early
+
+    if should_run and not chromium.is_running():
+        if early:
+            logging.info(f"Early start for tournament ({EARLY_START_MINUTES} min before {window.start.strftime('%H:%M')})")
+        chromium.start()
+    elif not should_run and chromium.is_running():
+        logging.info("Outside business hours - stopping display")
+        chromium.stop()
+
+    transitions = [hours.next_transition(now)]
+    tournament_transition = window.next_transition(now)
+    if tournament_transition:
+        transitions.append(tournament_transition)
+    next_change = min(transitions)
+
+    delay = (next_change - datetime.datetime.now()).total_seconds()
+    delay = max(0.5, min(delay, check_interval))
+    logging.debug(f"Next transition at {next_change}, sleeping {delay:.0f}s")
+    return delay
+
+
+def run():
+    """Main loop: apply the desired state, then sleep until something can change"""
+    logging.info("=== HDMI Display Manager Starting ===")
+
+    hours = OpenHours()
+    window = TournamentWindow()
+    chromium = ChromiumSupervisor()
+    watch = DataFileWatch(window.path)
+    check_interval = MAX_SLEEP if watch.fileno() is not None else DATA_CHECK_INTERVAL
+
+    window.refresh()
+    try:
+        while True:
+            # Other files in the web directory wake us too; only re-read ours
+            with PROFILER.phase('refresh'):
+                if watch.drain() or watch.fileno() is None:
+                    window.refresh()
+
+            chromium.wait(display_step(hours, window, chromium, check_interval), (watch.fileno(),))
+    except KeyboardInterrupt:
+        logging.info("Display manager stopped by user")
+    finally:
+        watch.close()
+        chromium.stop()
+
+
+def main():
+    global PROFILER
+    parser = argparse.ArgumentParser(description="HDMI business-hours display manager")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    setup_logging()
+
+    # systemd stops us with SIGTERM - turn it into a clean shutdown
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    PROFILER = make_profiler(args.profile, "display_manager")
+    run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Soak Harness
+Runs the whole pipeline - scraper, LAN publisher, subscribing display Pi and
+cast monitor - against a local fake DigitalPool and a fake catt for
+thousands of accelerated cycles, and samples this process for leaks:
+
+    rss_kb    resident memory
+    fds       open file descriptors
+    threads   live Python threads
+    children  live descendant processes
+    chrome    Chrome/chromedriver processes on the machine above the baseline
+              (a browser orphaned by a failed quit() is reparented to init, so
+              it would not show up as a child)
+
+After a warm-up, each metric's trend is fitted per 1000 cycles; the run fails
+when a metric keeps growing past its allowance or a browser is left behind.
+The JSON report is meant to be kept and compared between releases:
+
+    python3 scripts/soak_harness.py --cycles 2000 --report soak.json
+    python3 scripts/soak_harness.py --cycles 2000 --report soak_new.json --compare soak.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+import bankshot_monitor_multi as monitor
+import cast_devices
+import completion_eta
+import catt_monitor
+import tournament_monitor
+from lan_publisher import StatePublisher, start_publisher_server
+from tournament_model import load_record
+
+REPORT_VERSION = 1
+SPEEDUP = 60  # Pipeline sleeps run this many times faster than real time
+CYCLES_PER_EVENT = 12  # Fake tournament lifetime: upcoming, in progress, completed
+WARMUP = 0.2  # Fraction of the samples ignored while caches and pools fill up
+
+# Allowed growth per metric between the start and end of the measured window
+LIMITS = {
+    'rss_kb': 32 * 1024,
+    'fds': 8,
+    'threads': 4,
+    'children': 2,
+    'chrome': 0,
+}
+
+FAKE_CATT = """#!/bin/sh
+# Fake catt for the soak harness: log the call and succeed
+echo "$*" >> "{log}"
+case "$*" in
+    *scan*) echo "127.0.0.1 - Soak TV 1 - Fake Chromecast"; echo "127.0.0.2 - Soak TV 2 - Fake Chromecast" ;;
+esac
+exit 0
+"""
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html><head><title>Tournaments</title></head>
+<body>
+<input class="ant-input" type="text" placeholder="Search tournaments">
+<div class="tournament-list">
+{cards}
+</div>
+</body></html>
+"""
+
+CARD = """<div class="ant-card"><div class="ant-card-body">
+<a href="/tournaments/{slug}/"><h3>{name}</h3></a>
+<p>Bankshot Billiards, Hilliard</p>
+<p>{date}</p>
+<p>Starts: 7:00 PM</p>
+<p>$20 Entry</p>
+<p>{players} Players</p>
+<p>{pct}% Complete</p>
+{status}
+</div></div>"""
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head><title>{name}</title></head>
+<body><h1>{name}</h1>
+<p>Bankshot Billiards, Hilliard</p>
+<p>{players} Players</p>
+<p>{pct}% Complete</p>
+{status}
+{bracket}
+</body></html>
+"""
+
+
+class AcceleratedTime:
+    """Stands in for the time module of the pipeline modules: every sleep is sped up"""
+
+    def __init__(self, speedup):
+        self.speedup = speedup
+
+    def sleep(self, seconds):
+        time.sleep(seconds / self.speedup)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class FakeDigitalPool:
+    """
+    Today's tournament listing and detail pages. Each tournament runs for
+    CYCLES_PER_EVENT cycles (upcoming, in progress, completed), then the
+    next one is listed under a new URL.
+    """
+
+    def __init__(self, cycles_per_event=CYCLES_PER_EVENT):
+        self.cycles_per_event = cycles_per_event
+        self.cycle = 0
+        self.lock = threading.Lock()
+
+    def advance(self, cycle):
+        with self.lock:
+            self.cycle = cycle
+
+    @property
+    def new_event(self):
+        return self.cycle % self.cycles_per_event == 0
+
+    def event(self):
+        with self.lock:
+            generation, step = divmod(self.cycle, self.cycles_per_event)
+        pct = min(100, step * 100 // max(1, self.cycles_per_event - 2))
+        today = datetime.date.today()
+        return {
+            'name': f"Soak 9-Ball {generation}",
+            'slug': f"{today.strftime('%Y%m%d')}-soak-9-ball-{generation}",
+            'date': today.strftime('%Y/%m/%d'),
+            'players': 16 if step else 0,
+            'pct': pct,
+            'status': '<p>Completed</p>' if pct >= 100 else '',
+            'bracket': self.bracket(step),
+        }
+
+    def bracket(self, step):
+        """First-round matches of the detail page; one more finishes every cycle"""
+        if not step:
+            return ''
+        lines = ['<p>Winners Round 1</p>']
+        for match in range(1, 9):
+            first, second = f"Player {2 * match - 1}", f"Player {2 * match}"
+            if match < step:
+                lines.append(f"<p>Match {match}: {first} 7 - {match % 7} {second} (Completed)</p>")
+            elif match == step:
+                lines.append(f"<p>Match {match}: {first} {step % 7} - 2 {second}</p>")
+            else:
+                lines.append(f"<p>Match {match}: {first} vs {second}</p>")
+        return '\n'.join(lines)
+
+    def page(self, path):
+        """(status code, html) for a request path"""
+        event = self.event()
+        if path.rstrip('/') == '/tournaments':
+            return 200, LISTING_PAGE.format(cards=CARD.format(**event))
+        if path.rstrip('/') == f"/tournaments/{event['slug']}":
+            return 200, DETAIL_PAGE.format(**event)
+        return 404, "<html><body>Not found</body></html>"
+
+
+def start_fake_digitalpool(site):
+    """Serve the fake site from a daemon thread; returns the server"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            code, page = site.page(self.path.split('?', 1)[0])
+            body = page.encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-digitalpool', daemon=True).start()
+    return server
+
+
+def process_table():
+    """{pid: (ppid, comm)} for every process"""
+    table = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # The command name is in parentheses and may contain spaces
+                head, tail = f.read().rsplit(')', 1)
+            table[int(entry)] = (int(tail.split()[1]), head.split('(', 1)[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return table
+
+
+def count_descendants(table, root):
+    children = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    count = 0
+    stack = list(children.get(root, []))
+    while stack:
+        pid = stack.pop()
+        count += 1
+        stack.extend(children.get(pid, []))
+    return count
+
+
+def count_browsers(table):
+    return sum(1 for _, comm in table.values() if comm.startswith('chrom') or comm == 'headless_shell')
+
+
+def rss_kb():
+    with open('/proc/self/status', 'r') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def take_sample(cycle, browser_baseline):
+    table = process_table()
+    return {
+        'cycle': cycle,
+        'at': time.time(),
+        'rss_kb': rss_kb(),
+        'fds': len(os.listdir('/proc/self/fd')),
+        'threads': threading.active_count(),
+        'children': count_descendants(table, os.getpid()),
+        'chrome': max(0, count_browsers(table) - browser_baseline),
+    }
+
+
+def slope_per_1000(points):
+    """Least-squares slope of (cycle, value) points, per 1000 cycles"""
+    if len(points) < 2:
+        return 0.0
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return 0.0
+    return 1000 * sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def analyze(samples, warmup=WARMUP, limits=LIMITS):
+    """Per-metric trend after warm-up; a metric fails if it grew past its limit and is still rising"""
+    measured = samples[int(len(samples) * warmup):] or samples
+    quarter = max(1, len(measured) // 4)
+    metrics = {}
+    for name, limit in limits.items():
+        values = [s[name] for s in measured]
+        head = statistics.median(values[:quarter])
+        tail = statistics.median(values[-quarter:])
+        slope = slope_per_1000([(s['cycle'], s[name]) for s in measured])
+        metrics[name] = {
+            'first': values[0],
+            'last': values[-1],
+            'min': min(values),
+            'max': max(values),
+            'growth': tail - head,
+            'slope_per_1000_cycles': round(slope, 3),
+            'limit': limit,
+            'ok': not (tail - head > limit and slope > 0),
+        }
+    return metrics
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', '-C', str(REPO_ROOT), 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def setup_pipeline(work_dir, site_url, publisher_url, speedup):
+    """Point every pipeline module at the work directory, the fake site and the fake catt"""
+    state_dir = work_dir / 'pi'
+    web_dir = work_dir / 'www'
+    state_dir.mkdir(parents=True, exist_ok=True)
+    web_dir.mkdir(parents=True, exist_ok=True)
+
+    catt = work_dir / 'catt'
+    catt.write_text(FAKE_CATT.format(log=work_dir / 'catt_calls.log'))
+    catt.chmod(0o755)
+
+    clock = AcceleratedTime(speedup)
+    for module in (monitor, cast_devices, catt_monitor, tournament_monitor):
+        module.time = clock
+
+    # Scraper (the CI side)
+    monitor.DIGITALPOOL_URL = f"{site_url}/tournaments"
+    monitor.DATA_FILE = str(state_dir / 'tournament_data.json')
+    monitor.DATA_FILE_BACKUP = str(web_dir / 'scraper_tournament_data.json')
+    monitor.LOG_FILE = str(work_dir / 'scraper.log')
+    monitor.STATE_DIR = str(state_dir)
+    monitor.SCHEDULE_FILE = str(state_dir / 'tournament_schedule.json')
+    monitor.SNAPSHOT_FILE = str(state_dir / 'tournament_snapshot.json')
+    monitor.EVENTS_FILE = str(state_dir / 'tournament_events.jsonl')
+    monitor.BREAKER_FILE = str(state_dir / 'circuit_breaker.json')
+    monitor.LAST_GOOD_FILE = str(state_dir / 'tournament_last_good.json')
+    monitor.PROGRESS_FILE = str(state_dir / 'tournament_progress.json')
+    monitor.PAYOUT_FILE = str(state_dir / 'payout_tables.json')
+    monitor.PAYOUT_STRUCTURE_FILE = str(state_dir / 'payout_structures.json')
+    monitor.BRACKET_FILE = str(state_dir / 'bracket_deltas.jsonl')
+    monitor.BROWSER_RUN_FILE = str(state_dir / 'browser_run.json')
+    monitor.SCRAPE_STATE_FILE = str(state_dir / 'scrape_flight.json')
+    monitor.SCRAPE_FRESH_SECONDS = 0  # Every cycle is a real scrape
+    monitor.RENDER_DIR = None
+
+    # The completion ETA works in wall-clock time, so its intervals are sped up too
+    for name in ('RATE_WINDOW', 'MIN_RATE_SPAN', 'NEAR_END', 'DENSE_INTERVAL', 'MAX_BACKOFF'):
+        setattr(completion_eta, name, getattr(completion_eta, name) / speedup)
+
+    # Display Pi following the publisher
+    tournament_monitor.OUTPUT_FILE = str(web_dir / 'tournament_data.json')
+    tournament_monitor.EVENTS_OUTPUT_FILE = str(web_dir / 'tournament_events.jsonl')
+    tournament_monitor.BRACKET_OUTPUT_FILE = str(web_dir / 'bracket.json')
+    tournament_monitor.LAST_GOOD_FILE = str(state_dir / 'pi_last_good.json')
+    tournament_monitor.SUBSCRIBE_FALLBACK_AFTER = float('inf')  # Never fall back to GitHub
+
+    # Cast monitor
+    catt_monitor.TOURNAMENT_DATA_FILE = tournament_monitor.OUTPUT_FILE
+    catt_monitor.EVENTS_FILE = tournament_monitor.EVENTS_OUTPUT_FILE
+    catt_monitor.STATE_FILE = str(web_dir / 'cast_devices_state.json')
+    catt_monitor.LEGACY_STATE_FILE = str(web_dir / 'cast_state.json')
+    catt_monitor.FRESHNESS_FILE = str(web_dir / 'freshness.json')
+    catt_monitor.DEVICES_FILE = str(state_dir / 'cast_devices.json')
+    catt_monitor.CATT_COMMAND = str(catt)
+    cast_devices.save_devices(cast_devices.scan_devices(str(catt)), catt_monitor.DEVICES_FILE)
+
+    threading.Thread(target=tournament_monitor.subscribe_loop, args=(publisher_url,),
+                     name='soak-subscriber', daemon=True).start()
+    threading.Thread(target=catt_monitor.monitor_and_cast, name='soak-catt-monitor', daemon=True).start()
+
+
+def count_lines(path):
+    try:
+        with open(path, 'rb') as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+
+def print_report(report, previous=None):
+    print("\n" + "=" * 60)
+    print(f"SOAK: {report['cycles']} cycles in {report['elapsed_seconds']:.0f}s "
+          f"({report['revision'] or 'unknown revision'})")
+    print("=" * 60)
+    header = f"{'metric':<10}{'first':>10}{'last':>10}{'growth':>10}{'/1000cyc':>11}{'limit':>9}"
+    if previous:
+        header += f"{'prev /1000':>12}"
+    print(header)
+    for name, m in report['metrics'].items():
+        line = (f"{name:<10}{m['first']:>10}{m['last']:>10}{m['growth']:>10.0f}"
+                f"{m['slope_per_1000_cycles']:>11.1f}{m['limit']:>9}")
+        if previous and name in previous.get('metrics', {}):
+            line += f"{previous['metrics'][name]['slope_per_1000_cycles']:>12.1f}"
+        print(line + ("" if m['ok'] else "  ✗ LEAK"))
+    print(f"\nScraper exit codes: {report['exit_codes']} (errors: {report['errors']}), "
+          f"catt calls: {report['catt_calls']}, browsers left: {report['browsers_left']}")
+    print("✓ No unbounded growth" if report['ok'] else "✗ Leak detected")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak the monitor pipeline against a fake DigitalPool and catt")
+    parser.add_argument('--cycles', type=int, default=1000, help="Scraper runs to perform")
+    parser.add_argument('--speedup', type=float, default=SPEEDUP, help="How much faster pipeline sleeps run")
+    parser.add_argument('--sample-every', type=int, default=10, metavar='N', help="Sample every N cycles")
+    parser.add_argument('--cycles-per-event', type=int, default=CYCLES_PER_EVENT,
+                        help="Cycles each fake tournament lasts")
+    parser.add_argument('--work-dir', help="Where state files and logs go (default: a new temp dir)")
+    parser.add_argument('--report', default='soak_report.json', help="Trend report JSON to write")
+    parser.add_argument('--compare', metavar='FILE', help="Previous report to compare trends with")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix='tournament-soak-'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(level=logging.INFO, filename=str(work_dir / 'monitors.log'),
+                        format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+    print(f"Soak work directory: {work_dir}")
+
+    browser_baseline = count_browsers(process_table())
+    site = FakeDigitalPool(args.cycles_per_event)
+    site_server = start_fake_digitalpool(site)
+    publisher = StatePublisher(events_file=str(work_dir / 'pi' / 'tournament_events.jsonl'),
+                               bracket_file=str(work_dir / 'pi' / 'bracket_deltas.jsonl'))
+    publisher_server = start_publisher_server(publisher, host='127.0.0.1', port=0)
+
+    setup_pipeline(
+        work_dir,
+        f"http://127.0.0.1:{site_server.server_address[1]}",
+        f"http://127.0.0.1:{publisher_server.server_address[1]}",
+        args.speedup
+    )
+
+    samples = [take_sample(0, browser_baseline)]
+    errors = 0
+    exit_codes = {}
+    started = time.monotonic()
+    with open(os.devnull, 'w') as quiet:
+        for cycle in range(1, args.cycles + 1):
+            site.advance(cycle)
+            try:
+                with contextlib.redirect_stdout(quiet):
+                    code = monitor.run(sync_schedule=site.new_event)
+                exit_codes[str(code)] = exit_codes.get(str(code), 0) + 1
+                record = load_record(monitor.DATA_FILE)
+                if record:
+                    publisher.publish(record)
+            except Exception as e:
+                errors += 1
+                logging.error(f"Cycle {cycle} failed: {e}")
+
+            if cycle % args.sample_every == 0 or cycle == args.cycles:
+                samples.append(take_sample(cycle, browser_baseline))
+                latest = samples[-1]
+                print(f"  cycle {cycle}: rss {latest['rss_kb']} KB, fds {latest['fds']}, "
+                      f"threads {latest['threads']}, children {latest['children']}, chrome {latest['chrome']}")
+
+    # Give the last quit() a moment, then look for browsers that never went away
+    time.sleep(2)
+    browsers_left = max(0, count_browsers(process_table()) - browser_baseline)
+
+    metrics = analyze(samples)
+    report = {
+        'version': REPORT_VERSION,
+        'revision': git_revision(),
+        'started_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'cycles': args.cycles,
+        'speedup': args.speedup,
+        'elapsed_seconds': time.monotonic() - started,
+        'exit_codes': exit_codes,
+        'errors': errors,
+        'catt_calls': count_lines(work_dir / 'catt_calls.log'),
+        'browsers_left': browsers_left,
+        'metrics': metrics,
+        'ok': all(m['ok'] for m in metrics.values()) and not browsers_left,
+        'samples': samples,
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    previous = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"✗ Could not read {args.compare}: {e}")
+    print_report(report, previous)
+    print(f"Report written to {args.report}")
+
+    publisher_server.shutdown()
+    site_server.shutdown()
+    sys.exit(0 if report['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
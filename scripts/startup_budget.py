@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Startup Budget Check
+Measures cold-start import cost of every entry point with `python -X importtime`
+and fails (exit code 1) if any of them goes over its budget or loads a heavy
+dependency (Selenium, HTTP clients, JSON schema, ...) at import time.
+
+Budgets are for our hardware class (Raspberry Pi 4); pass --scale to adjust
+them on faster or slower machines, e.g. --scale 0.2 on a desktop.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point (relative to the repo root) -> import budget in milliseconds on
+# a Pi 4. The consumers import only the standard library and the shared
+# model; importing Selenium eagerly would cost well over a second there.
+BUDGETS_MS = {
+    'scripts/catt_monitor.py': 350,
+    'scripts/tournament_monitor.py': 350,
+    'scripts/display_manager.py': 350,
+    'scripts/supervisor.py': 750,  # asyncio + all three consumers it replaces
+    'smart_switcher_status.py': 350,
+    'bankshot_monitor_multi.py': 450,
+}
+
+# Modules that must only be imported on the code path that needs them
+LAZY_MODULES = (
+    'selenium',
+    'urllib3',
+    'requests',
+    'urllib.request',  # Pulls in http.client and ssl
+    'http.client',  # (not ssl itself - asyncio imports it for the supervisor)
+    'jsonschema',
+    'websocket',
+    'cProfile',
+    'tracemalloc',
+)
+
+
+def measure(entry_point, python=sys.executable):
+    """
+    Import an entry point in a fresh interpreter with -X importtime
+    Returns (total_import_ms, wall_ms, imported_module_names)
+    """
+    path = os.path.join(REPO_ROOT, entry_point)
+    module_dir, filename = os.path.split(path)
+    module = os.path.splitext(filename)[0]
+    code = f"import sys; sys.path.insert(0, {module_dir!r}); import {module}"
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        timeout=60
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {entry_point} failed:\n{result.stderr.strip()[-2000:]}")
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            _, cumulative, name = line[len('import time:'):].split('|')
+        except ValueError:
+            continue
+        modules.add(name.strip())
+        if not name.startswith('  '):
+            # Top-level entries already include their children
+            total_us += int(cumulative)
+    return total_us / 1000, wall_ms, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if entry point cold start goes over budget")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Multiply every budget by this factor for other hardware")
+    parser.add_argument('--python', default=sys.executable, help="Interpreter to measure")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'entry point':<32} {'imports':>10} {'budget':>10} {'wall':>10}")
+    for entry_point, budget in BUDGETS_MS.items():
+        budget *= args.scale
+        try:
+            import_ms, wall_ms, modules = measure(entry_point, args.python)
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            failures.append(str(e))
+            continue
+
+        print(f"{entry_point:<32} {import_ms:>8.1f}ms {budget:>8.1f}ms {wall_ms:>8.1f}ms")
+
+        if import_ms > budget:
+            failures.append(f"{entry_point}: imports took {import_ms:.1f}ms (budget {budget:.1f}ms)")
+
+        eager = sorted(m for m in modules if any(m == lazy or m.startswith(lazy + '.') for lazy in LAZY_MODULES))
+        if eager:
+            failures.append(f"{entry_point}: heavy modules imported at startup: {', '.join(eager[:5])}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        sys.exit(1)
+
+    print("\n✓ All entry points within their startup budget")
+
+
+if __name__ == '__main__':
+    main()
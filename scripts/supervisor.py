@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Display Pi Supervisor
+Runs the Pi's monitors as cooperating asyncio tasks in one interpreter,
+instead of tournament_monitor.py, catt_monitor.py, display_manager.py and
+periodic scraper launches each running as a separate process with its own
+sleep loop and its own re-reads of tournament_data.json.
+
+    pull      GitHub pull (or --subscribe to a LAN publisher)
+    cast      keeps every Chromecast in line with the record
+    display   HDMI business-hours display (Chromium kiosk)
+    scrape    optional local scraper run (--scrape-every MINUTES)
+
+The tasks share one SharedState: the pull and scrape tasks set the record and
+the cast and display tasks wake on the change. Every sleep is parked on one
+TimerWheel. Blocking work (git, catt, Selenium, long-polls) runs on a small
+shared thread pool. Each task has a RestartPolicy: a step that raises is
+restarted after an exponential back-off, and a task that keeps crashing is
+given up on without taking the others down.
+
+    python3 scripts/supervisor.py
+    python3 scripts/supervisor.py --subscribe http://10.0.0.5:8765 --no-display
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import math
+import signal
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tournament_model import load_record
+from cast_devices import CastController, load_devices
+from freshness import FreshnessWatchdog
+import catt_monitor
+import display_manager
+import tournament_monitor
+
+# Configuration
+LOG_FILE = "/home/pi/logs/supervisor.log"
+WORKERS = 4  # Threads for blocking steps (a long-poll holds one for up to a minute)
+TICK = 0.5  # Timer wheel resolution in seconds
+WHEEL_SLOTS = 512
+IDLE_WAIT = 10 * 60  # Longest a task waits for a record change before re-checking anyway
+
+# Record fields rewritten on every pull - a change in them alone is not a new state
+VOLATILE_FIELDS = ('last_updated', 'fetched_at')
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel shared by all tasks: one asyncio timer ticks it and
+    each sleep is a future parked in the slot its deadline falls into, so
+    the event loop holds a single timer however many tasks are waiting
+    """
+
+    def __init__(self, tick=TICK, slots=WHEEL_SLOTS):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.ticks = 0
+
+    def sleep(self, seconds):
+        """Future resolved after about `seconds` (rounded up to the next tick)"""
+        future = asyncio.get_running_loop().create_future()
+        target = self.ticks + max(1, math.ceil(seconds / self.tick))
+        self.slots[target % len(self.slots)].append((target, future))
+        return future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        while True:
+            # Sleep to the absolute tick boundary so the wheel doesn't drift
+            await asyncio.sleep(max(0, started + (self.ticks + 1) * self.tick - loop.time()))
+            self.ticks += 1
+            slot = self.slots[self.ticks % len(self.slots)]
+            waiting = []
+            for target, future in slot:
+                if target > self.ticks:
+                    waiting.append((target, future))  # Due on a later turn of the wheel
+                elif not future.done():
+                    future.set_result(None)
+            slot[:] = waiting
+
+
+class SharedState:
+    """The tournament record every task works from, with change notification"""
+
+    __slots__ = ('wheel', 'record', 'version', 'updated_at', '_key', '_changed')
+
+    def __init__(self, wheel):
+        self.wheel = wheel
+        self.record = None
+        self.version = 0
+        self.updated_at = None
+        self._key = None
+        self._changed = None
+
+    def set_record(self, record):
+        """Replace the record; returns True (and wakes waiting tasks) if it really changed"""
+        if not record:
+            return False
+        key = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+        if key == self._key:
+            self.record = record
+            return False
+        self.record = record
+        self._key = key
+        self.version += 1
+        self.updated_at = time.time()
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(self.version)
+        self._changed = None
+        return True
+
+    async def wait(self, since, timeout):
+        """Wait until the record changes from version `since`, at most `timeout` seconds"""
+        if self.version != since:
+            return
+        if self._changed is None:
+            self._changed = asyncio.get_running_loop().create_future()
+        timer = self.wheel.sleep(timeout)
+        await asyncio.wait([timer, self._changed], return_when=asyncio.FIRST_COMPLETED)
+        timer.cancel()
+
+
+class RestartPolicy:
+    """Back-off between restarts of a crashed task, and when to give up on it"""
+
+    __slots__ = ('backoff', 'max_backoff', 'max_restarts', 'window')
+
+    def __init__(self, backoff=2, max_backoff=300, max_restarts=None, window=3600):
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_restarts = max_restarts  # None: always restart
+        self.window = window  # Crashes older than this are forgotten
+
+    def delay(self, crashes):
+        return min(self.max_backoff, self.backoff * 2 ** max(0, crashes - 1))
+
+    def gives_up(self, crashes):
+        return self.max_restarts is not None and crashes > self.max_restarts
+
+
+class SupervisedTask:
+    """
+    A monitor as step functions: setup(supervisor) builds its context,
+    step(supervisor, context) does one pass and returns the seconds until
+    the next one, teardown(context) runs on shutdown
+    """
+
+    __slots__ = ('name', 'setup', 'step', 'teardown', 'policy', 'wake_on_change',
+                 'context', 'crashes', 'runs', 'last_error', 'failed')
+
+    def __init__(self, name, setup, step, teardown=None, policy=None, wake_on_change=False):
+        self.name = name
+        self.setup = setup
+        self.step = step
+        self.teardown = teardown
+        self.policy = policy or RestartPolicy()
+        self.wake_on_change = wake_on_change  # Also run the step as soon as the record changes
+        self.context = None
+        self.crashes = []
+        self.runs = 0
+        self.last_error = None
+        self.failed = False
+
+
+class Supervisor:
+    """Runs supervised tasks on one event loop with a shared state, timer wheel and thread pool"""
+
+    def __init__(self, tasks, workers=WORKERS):
+        self.tasks = list(tasks)
+        self.wheel = TimerWheel()
+        self.state = SharedState(self.wheel)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='supervisor')
+
+    async def in_thread(self, fn, *args):
+        """Run a blocking call on the shared pool"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(fn, *args))
+
+    async def _run_task(self, task):
+        while True:
+            try:
+                if task.context is None:
+                    task.context = await task.setup(self)
+                since = self.state.version
+                delay = await task.step(self, task.context)
+                task.runs += 1
+                if task.wake_on_change:
+                    await self.state.wait(since, delay)
+                else:
+                    await self.wheel.sleep(delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                now = time.monotonic()
+                task.crashes = [t for t in task.crashes if now - t < task.policy.window] + [now]
+                task.last_error = str(e)
+                logging.error(f"✗ Task {task.name} crashed: {e}")
+                logging.debug(traceback.format_exc())
+                await self._teardown(task)
+                if task.policy.gives_up(len(task.crashes)):
+                    task.failed = True
+                    logging.error(f"✗ Task {task.name} crashed {len(task.crashes)} times in "
+                                  f"{task.policy.window}s - giving up on it")
+                    return
+                delay = task.policy.delay(len(task.crashes))
+                logging.info(f"Restarting {task.name} in {delay:.0f}s")
+                await self.wheel.sleep(delay)
+
+    async def _teardown(self, task):
+        context, task.context = task.context, None
+        if context is not None and task.teardown:
+            try:
+                await self.in_thread(task.teardown, context)
+            except Exception as e:
+                logging.error(f"Error tearing down {task.name}: {e}")
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+
+        wheel = asyncio.create_task(self.wheel.run(), name='timer-wheel')
+        running = [asyncio.create_task(self._run_task(t), name=t.name) for t in self.tasks]
+        logging.info(f"Supervising: {', '.join(t.name for t in self.tasks)}")
+
+        await stop.wait()
+        logging.info("Stopping supervised tasks")
+        for handle in running + [wheel]:
+            handle.cancel()
+        await asyncio.gather(*running, wheel, return_exceptions=True)
+        for task in self.tasks:
+            await self._teardown(task)
+        self.executor.shutdown(wait=False)
+
+
+# --- pull: GitHub, or a LAN publisher ---------------------------------------
+
+async def pull_setup(supervisor):
+    await supervisor.in_thread(tournament_monitor.publish_last_good)
+    supervisor.state.set_record(await supervisor.in_thread(load_record, tournament_monitor.OUTPUT_FILE))
+    return {}
+
+
+async def pull_step(supervisor, context):
+    record = await supervisor.in_thread(tournament_monitor.pull_once)
+    if record:
+        supervisor.state.set_record(record)
+    return tournament_monitor.CHECK_INTERVAL
+
+
+def make_subscribe_task(url):
+    from lan_publisher import StateSubscriber, ChecksumMismatch
+
+    async def setup(supervisor):
+        context = await pull_setup(supervisor)
+        context['subscriber'] = StateSubscriber(url)
+        context['last_contact'] = time.monotonic()
+        return context
+
+    async def step(supervisor, context):
+        try:
+            record = await supervisor.in_thread(tournament_monitor.subscribe_step, context['subscriber'])
+            context['last_contact'] = time.monotonic()
+            if record is not None:
+                supervisor.state.set_record(record)
+            return 0  # Long-poll again straight away
+        except ChecksumMismatch as e:
+            logging.error(f"Rejected record from publisher: {e}")
+        except (OSError, ValueError) as e:
+            silent_for = time.monotonic() - context['last_contact']
+            logging.warning(f"Publisher unreachable for {silent_for:.0f}s: {e}")
+            if silent_for >= tournament_monitor.SUBSCRIBE_FALLBACK_AFTER:
+                logging.warning("Falling back to direct GitHub pull")
+                await pull_step(supervisor, context)
+        return tournament_monitor.CHECK_INTERVAL
+
+    return SupervisedTask('subscribe', setup, step)
+
+
+# --- cast: Chromecasts ------------------------------------------------------
+
+async def cast_setup(supervisor):
+    devices = load_devices(catt_monitor.DEVICES_FILE)
+    logging.info(f"Cast devices: {', '.join(d.key for d in devices)}")
+    return {
+        'devices': devices,
+        'controller': CastController(devices, catt_command=catt_monitor.CATT_COMMAND, log=logging.info),
+        'state': await supervisor.in_thread(catt_monitor.load_cast_state, devices),
+        'watchdog': FreshnessWatchdog(catt_monitor.FRESHNESS_FILE),
+    }
+
+
+async def cast_step(supervisor, context):
+    record = supervisor.state.record
+    if not record:
+        return catt_monitor.CHECK_INTERVAL
+    settled = await supervisor.in_thread(
+        catt_monitor.cast_step, record, context['devices'], context['controller'],
+        context['state'], context['watchdog']
+    )
+    # Retry devices that didn't take the cast; otherwise wait for the next change
+    return IDLE_WAIT if settled else catt_monitor.CHECK_INTERVAL
+
+
+# --- display: HDMI Chromium kiosk --------------------------------------------
+
+async def display_setup(supervisor):
+    return {
+        'hours': display_manager.OpenHours(),
+        'window': display_manager.TournamentWindow(),
+        'chromium': display_manager.ChromiumSupervisor(),
+    }
+
+
+async def display_step(supervisor, context):
+    context['window'].load(supervisor.state.record)
+    return await supervisor.in_thread(
+        display_manager.display_step, context['hours'], context['window'], context['chromium']
+    )
+
+
+def display_teardown(context):
+    context['chromium'].stop()
+
+
+# --- scrape: local scraper run -----------------------------------------------
+
+def make_scrape_task(interval):
+    async def setup(supervisor):
+        return {}
+
+    async def step(supervisor, context):
+        # The scraper (and Selenium) are only imported once the first run is due
+        from bankshot_monitor_multi import run as run_scraper
+        started = time.monotonic()
+        code = await supervisor.in_thread(run_scraper)
+        logging.info(f"Scraper exit code: {code} ({time.monotonic() - started:.1f}s)")
+        supervisor.state.set_record(await supervisor.in_thread(load_record, tournament_monitor.OUTPUT_FILE))
+        return interval
+
+    def teardown(context):
+        # On shutdown the executor isn't waited for, so a scrape in flight would keep
+        # its Chrome until it finished - close it now, which also ends the scrape
+        scraper = sys.modules.get('bankshot_monitor_multi')
+        if scraper is not None and scraper.BROWSERS is not None:
+            scraper.BROWSERS.close_all()
+
+    return SupervisedTask('scrape', setup, step, teardown, policy=RestartPolicy(backoff=60, max_backoff=1800))
+
+
+def build_tasks(args):
+    tasks = []
+    if args.subscribe:
+        tasks.append(make_subscribe_task(args.subscribe))
+    else:
+        tasks.append(SupervisedTask('pull', pull_setup, pull_step))
+    if not args.no_cast:
+        tasks.append(SupervisedTask('cast', cast_setup, cast_step, wake_on_change=True))
+    if not args.no_display:
+        tasks.append(SupervisedTask('display', display_setup, display_step, display_teardown,
+                                    wake_on_change=True))
+    if args.scrape_every:
+        tasks.append(make_scrape_task(args.scrape_every * 60))
+    return tasks
+
+
+def setup_logging():
+    """Setup logging (called from main so importing this module has no side effects)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the display Pi's monitors in one asyncio process")
+    parser.add_argument('--subscribe', metavar='URL',
+                        help="Follow a LAN publisher (e.g. http://10.0.0.5:8765) instead of pulling from GitHub")
+    parser.add_argument('--no-cast', action='store_true', help="Don't run the Chromecast task")
+    parser.add_argument('--no-display', action='store_true', help="Don't run the HDMI display task")
+    parser.add_argument('--scrape-every', type=float, metavar='MINUTES',
+                        help="Also run the scraper locally every MINUTES")
+    args = parser.parse_args()
+    setup_logging()
+
+    logging.info("=" * 60)
+    logging.info("Display Pi Supervisor Starting")
+    logging.info("=" * 60)
+    asyncio.run(Supervisor(build_tasks(args)).run())
+
+
+if __name__ == '__main__':
+    main()
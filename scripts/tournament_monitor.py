@@ -2,32 +2,59 @@
 """
 Tournament Monitor - GitHub Integration
 Pulls tournament data from GitHub repository and updates local cache
+
+With --publish this Pi also serves the record to the other display Pis on
+the LAN; with --subscribe URL a Pi follows that publisher instead of pulling
+from GitHub itself, and falls back to the direct pull if it goes away.
 """
 
+import argparse
 import json
 import subprocess
 import os
+import sys
 import time
 import logging
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tournament_model import Tournament, load_record
+from last_good import save_last_good, warm_start_record
+from profiling import NullProfiler, add_profile_argument, make_profiler
+from render_display import render_if_changed
+from freshness import stamp_fetch
+from bracket_feed import BracketFeed, load_bracket, save_bracket
+from change_events import log_generation
+
 # Configuration
 GITHUB_REPO_URL = "https://github.com/jhamilt0n/tournament-scraper.git"
 LOCAL_REPO_PATH = "/tmp/tournament-scraper"
 OUTPUT_FILE = "/var/www/html/tournament_data.json"
+EVENTS_OUTPUT_FILE = "/var/www/html/tournament_events.jsonl"
+BRACKET_LOG_FILE = "/var/www/html/bracket_deltas.jsonl"  # Mirror of the scraper's bracket feed (publisher only)
+BRACKET_OUTPUT_FILE = "/var/www/html/bracket.json"  # Current bracket for the display page
+LAST_GOOD_FILE = "/home/pi/tournament_last_good.json"
 LOG_FILE = "/home/pi/logs/tournament_monitor.log"
 CHECK_INTERVAL = 60  # seconds
+RECORD_FILE = 'tournament_data.json'  # The scraper's record in the repository
+PUBLISH_PORT = 8765
+SUBSCRIBE_FALLBACK_AFTER = 3 * CHECK_INTERVAL  # Pull directly once the publisher is silent this long
+
+# Replaced by make_profiler() when --profile is given
+PROFILER = NullProfiler()
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
-)
+
+def setup_logging():
+    """Setup logging (called from main so importing this module has no side effects)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOG_FILE),
+            logging.StreamHandler()
+        ]
+    )
 
 def clone_or_pull_repo():
     """Clone repository if it doesn't exist, otherwise pull latest changes"""
@@ -68,16 +95,14 @@ def clone_or_pull_repo():
 def load_tournament_data():
     """Load tournament data from the cloned repository"""
     try:
-        # Look for tournament JSON files
-        json_files = list(Path(LOCAL_REPO_PATH).glob('*.json'))
+        # Only the scraper's record - the repo also carries state files (schedule,
+        # snapshot, payout tables...) that must not be mistaken for it
+        latest_file = Path(LOCAL_REPO_PATH) / RECORD_FILE
         
-        if not json_files:
-            logging.warning("No JSON files found in repository")
+        if not latest_file.exists():
+            logging.warning(f"No {RECORD_FILE} in repository")
             return None
         
-        # Get the most recently modified JSON file
-        latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
-        
         with open(latest_file, 'r') as f:
             data = json.load(f)
         
@@ -101,15 +126,88 @@ def save_tournament_data(data):
         # Add last updated timestamp
         data['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
+        # Freshness hop: first time this Pi got this published record
+        try:
+            with open(OUTPUT_FILE, 'r') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        stamp_fetch(data, previous)
+        
         with open(OUTPUT_FILE, 'w') as f:
             json.dump(data, f, indent=2)
         
         logging.info(f"Saved tournament data to {OUTPUT_FILE}")
+        
+        if not data.get('stale'):
+            save_last_good(LAST_GOOD_FILE, data)
         return True
     except Exception as e:
         logging.error(f"Error saving tournament data: {e}")
         return False
 
+def _first_line(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.readline()
+    except OSError:
+        return b''
+
+def mirror_log(name, output_file, label):
+    """
+    Mirror one of the scraper's logs into the web directory
+    Only the new tail is appended so consumers' byte offsets stay valid; a
+    log rewritten upstream (the bracket feed's snapshot line, or the event
+    log's rotation marker, differs) is copied whole and atomically
+    """
+    source = Path(LOCAL_REPO_PATH) / name
+    if not source.exists():
+        return False
+    
+    try:
+        source_size = source.stat().st_size
+        dest_size = os.path.getsize(output_file) if os.path.exists(output_file) else 0
+        rewritten = source_size < dest_size or (dest_size and _first_line(source) != _first_line(output_file))
+        
+        if rewritten:
+            tmp_path = f"{output_file}.tmp"
+            with open(source, 'rb') as src, open(tmp_path, 'wb') as dst:
+                dst.write(src.read())
+            os.replace(tmp_path, output_file)
+            logging.info(f"Replaced {label} ({source_size} bytes) - rewritten upstream")
+            return True
+        
+        if source_size == dest_size:
+            return False
+        
+        with open(source, 'rb') as src, open(output_file, 'ab') as dst:
+            src.seek(dest_size)
+            dst.write(src.read())
+        
+        logging.info(f"Synced {source_size - dest_size} bytes of {label}")
+        return True
+    except Exception as e:
+        logging.error(f"Error syncing {label}: {e}")
+        return False
+
+def sync_event_log():
+    """Mirror the scraper's change-event log"""
+    return mirror_log('tournament_events.jsonl', EVENTS_OUTPUT_FILE, 'change events')
+
+def sync_bracket_log():
+    """Mirror the scraper's bracket feed and bring the display's bracket up to date"""
+    if not mirror_log('bracket_deltas.jsonl', BRACKET_LOG_FILE, 'bracket deltas'):
+        return False
+    
+    try:
+        feed = BracketFeed.load(BRACKET_LOG_FILE)
+        save_bracket(feed, BRACKET_OUTPUT_FILE)
+        logging.info(f"Bracket at version {feed.version} ({len(feed.matches)} matches)")
+        return True
+    except Exception as e:
+        logging.error(f"Error saving bracket: {e}")
+        return False
+
 def generate_qr_code():
     """Generate QR code for tournament bracket"""
     try:
@@ -132,44 +230,102 @@ def generate_qr_code():
 
 def check_tournament_status(data):
     """Log current tournament status"""
-    if not data:
+    tournament = Tournament.from_record(data)
+    if not tournament:
+        logging.info("○ No active tournament to display")
         return
     
-    display = data.get('display_tournament', False)
-    player_count = data.get('player_count', 0)
-    
-    if display and player_count > 0:
-        logging.info(f"✓ Tournament is active: {data.get('tournament_name', 'Unknown')}")
-    elif display and player_count == 0:
-        logging.info(f"⏳ Tournament scheduled but no players yet: {data.get('tournament_name', 'Unknown')}")
+    if tournament.should_display and tournament.player_count > 0:
+        logging.info(f"✓ Tournament is active: {tournament.name}")
+    elif tournament.should_display:
+        logging.info(f"⏳ Tournament scheduled but no players yet: {tournament.name}")
     else:
         logging.info("○ No active tournament to display")
 
-def monitor_loop():
+def publish_last_good():
+    """Publish the last-known-good record at startup, before the first (slow) git pull"""
+    record = warm_start_record(LAST_GOOD_FILE)
+    if record is None:
+        logging.info("No plausible last-known-good snapshot to publish")
+        return False
+    
+    try:
+        with open(OUTPUT_FILE, 'w') as f:
+            json.dump(record, f, indent=2)
+        logging.info(f"⚡ Warm start: published last-known-good record: {record.get('tournament_name')}")
+        return True
+    except Exception as e:
+        logging.error(f"Error publishing last-known-good record: {e}")
+        return False
+
+def apply_tournament_data(tournament_data):
+    """Save a new record and refresh the QR code and status log"""
+    with PROFILER.phase('save'):
+        saved = save_tournament_data(tournament_data)
+    
+    if saved:
+        logging.info("Tournament data has been updated")
+        
+        # Generate QR code if tournament is active
+        tournament = Tournament.from_record(tournament_data)
+        if tournament and tournament.should_display:
+            generate_qr_code()
+        
+        # Render the static display page (after the QR, which it embeds)
+        render_page(tournament_data)
+        
+        check_tournament_status(tournament_data)
+    return saved
+
+def render_page(tournament_data):
+    """Re-render the static display page if the record or its bracket changed"""
+    try:
+        with PROFILER.phase('render'):
+            rendered = render_if_changed(tournament_data, os.path.dirname(OUTPUT_FILE))
+        if rendered:
+            logging.info(f"✓ Rendered static display page {rendered}")
+    except Exception as e:
+        logging.error(f"Error rendering display page: {e}")
+
+def pull_once(publisher=None):
+    """
+    One GitHub pull; the record is also handed to the LAN publisher if there is one
+    Returns the saved record, or None if nothing could be pulled or saved
+    """
+    with PROFILER.phase('git_pull'):
+        pulled = clone_or_pull_repo()
+    
+    if not pulled:
+        return None
+    
+    with PROFILER.phase('load'):
+        sync_event_log()
+        sync_bracket_log()  # Before the record, so its render picks up the new bracket
+        
+        # Load tournament data
+        tournament_data = load_tournament_data()
+    
+    if not tournament_data:
+        logging.warning("No valid tournament data found")
+        return None
+    
+    if publisher is not None and publisher.publish(dict(tournament_data)):
+        logging.info(f"📡 Published record version {publisher.version} to LAN subscribers")
+    
+    return tournament_data if apply_tournament_data(tournament_data) else None
+
+def monitor_loop(publisher=None):
     """Main monitoring loop"""
     logging.info("Starting GitHub-based tournament monitor...")
     logging.info(f"Repository: {GITHUB_REPO_URL}")
     logging.info(f"Check interval: {CHECK_INTERVAL} seconds")
     
+    publish_last_good()
+    
     while True:
         try:
             # Pull latest data from GitHub
-            if clone_or_pull_repo():
-                # Load tournament data
-                tournament_data = load_tournament_data()
-                
-                if tournament_data:
-                    # Check if data has changed
-                    if save_tournament_data(tournament_data):
-                        logging.info("Tournament data has been updated")
-                        
-                        # Generate QR code if tournament is active
-                        if tournament_data.get('display_tournament', False):
-                            generate_qr_code()
-                        
-                        check_tournament_status(tournament_data)
-                else:
-                    logging.warning("No valid tournament data found")
+            pull_once(publisher)
             
             # Wait before next check
             time.sleep(CHECK_INTERVAL)
@@ -181,5 +337,120 @@ def monitor_loop():
             logging.error(f"Error in monitor loop: {e}")
             time.sleep(CHECK_INTERVAL)
 
+def sync_events_from_publisher(subscriber):
+    """Append the publisher's new event-log tail to our copy"""
+    offset = os.path.getsize(EVENTS_OUTPUT_FILE) if os.path.exists(EVENTS_OUTPUT_FILE) else 0
+    # Our copy's first line names the generation we hold, so a rotated log is fetched whole
+    data, reset = subscriber.fetch_events(offset, log_generation(EVENTS_OUTPUT_FILE))
+    if not data and not reset:
+        return False
+    with open(EVENTS_OUTPUT_FILE, 'wb' if reset else 'ab') as f:
+        f.write(data)
+    logging.info(f"Synced {len(data)} bytes of change events from publisher")
+    return True
+
+def sync_bracket_from_publisher(subscriber):
+    """
+    Catch our bracket up with the publisher's: replay the deltas after our
+    version, or take a snapshot if we are too far behind or missed one
+    """
+    replica = load_bracket(BRACKET_OUTPUT_FILE)
+    before = (replica.url, replica.version)
+    response = subscriber.fetch_bracket(replica.version)
+    if response is None:
+        return False
+    if not replica.catch_up(response):
+        logging.warning(f"Bracket delta missing after version {replica.version} - fetching a snapshot")
+        replica.catch_up(subscriber.fetch_bracket(0))
+    if (replica.url, replica.version) == before:
+        return False
+    save_bracket(replica, BRACKET_OUTPUT_FILE)
+    logging.info(f"Bracket caught up to version {replica.version}")
+    return True
+
+def subscribe_step(subscriber, wait=None):
+    """
+    One long-poll of the publisher: sync the event log and apply a new record
+    Returns the new record, or None if nothing changed; raises like StateSubscriber.poll
+    """
+    with PROFILER.phase('subscribe'):
+        record = subscriber.poll() if wait is None else subscriber.poll(wait)
+    
+    sync_events_from_publisher(subscriber)
+    try:
+        bracket_changed = sync_bracket_from_publisher(subscriber)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not sync bracket from publisher: {e}")
+        bracket_changed = False
+    if record is not None:
+        logging.info(f"📡 Received record version {subscriber.version} from publisher")
+        apply_tournament_data(record)
+    elif bracket_changed:
+        current = load_record(OUTPUT_FILE)
+        if current:
+            render_page(current)
+    return record
+
+def subscribe_loop(url):
+    """Follow a LAN publisher, falling back to GitHub while it is unreachable"""
+    from lan_publisher import StateSubscriber, ChecksumMismatch
+    
+    logging.info(f"Starting LAN subscriber for {url}")
+    publish_last_good()
+    
+    subscriber = StateSubscriber(url)
+    last_contact = time.monotonic()
+    
+    while True:
+        try:
+            subscribe_step(subscriber)
+            last_contact = time.monotonic()
+        
+        except KeyboardInterrupt:
+            logging.info("Monitor stopped by user")
+            break
+        except ChecksumMismatch as e:
+            logging.error(f"Rejected record from publisher: {e}")
+            time.sleep(CHECK_INTERVAL)
+        except (OSError, ValueError) as e:
+            silent_for = time.monotonic() - last_contact
+            logging.warning(f"Publisher unreachable for {silent_for:.0f}s: {e}")
+            if silent_for >= SUBSCRIBE_FALLBACK_AFTER:
+                logging.warning("Falling back to direct GitHub pull")
+                try:
+                    pull_once()
+                except Exception as e:
+                    logging.error(f"Error in fallback pull: {e}")
+            time.sleep(CHECK_INTERVAL)
+        except Exception as e:
+            logging.error(f"Error in subscriber loop: {e}")
+            time.sleep(CHECK_INTERVAL)
+
+def main():
+    global PROFILER
+    parser = argparse.ArgumentParser(description="GitHub-based tournament monitor")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--publish', nargs='?', type=int, const=PUBLISH_PORT, default=None, metavar='PORT',
+                      help=f"Also serve the record to LAN subscribers on PORT (default {PUBLISH_PORT})")
+    mode.add_argument('--subscribe', metavar='URL',
+                      help="Follow a LAN publisher (e.g. http://10.0.0.5:8765) instead of pulling from GitHub")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    setup_logging()
+    PROFILER = make_profiler(args.profile, "tournament_monitor")
+    
+    if args.subscribe:
+        subscribe_loop(args.subscribe)
+        return
+    
+    publisher = None
+    if args.publish is not None:
+        from lan_publisher import StatePublisher, start_publisher_server
+        publisher = StatePublisher(events_file=EVENTS_OUTPUT_FILE, bracket_file=BRACKET_LOG_FILE)
+        start_publisher_server(publisher, port=args.publish)
+        logging.info(f"📡 Publishing tournament state to the LAN on port {args.publish}")
+    
+    monitor_loop(publisher)
+
 if __name__ == '__main__':
-    monitor_loop()
+    main()
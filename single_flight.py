@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Scrapes
+The scraper is started by cron, the boot check service and
+smart_switcher_status.py (before every cast decision), and those triggers
+overlap. Only one scrape runs at a time: the first trigger takes an
+exclusive file lock and writes a lease; a trigger that arrives while it
+runs waits for it and reuses its result instead of starting another Chrome
+and racing it on the data file. A result younger than the freshness
+threshold is returned straight away without scraping. A trigger that needs
+a scrape of its own (fresh_for=0: --force, --sync-schedule) still waits its
+turn but then runs instead of reusing anything.
+
+The lock is released by the kernel when its holder dies. The lease only
+matters for a holder that is alive but hung: once it expires, waiters stop
+waiting and scrape without the lock.
+"""
+
+import fcntl
+import json
+import os
+import time
+
+
+LEASE_SECONDS = 10 * 60  # Longest a scrape may hold the lock (CI's timeout-minutes)
+FRESH_SECONDS = 120  # A result younger than this is reused without scraping
+WAIT_POLL = 1  # Seconds between lock attempts while another scrape runs
+
+
+class SingleFlight:
+    """One scrape at a time, with the result shared through a small state file"""
+
+    __slots__ = ('path', 'lease', 'fresh_for', 'log')
+
+    def __init__(self, path, lease=LEASE_SECONDS, fresh_for=FRESH_SECONDS, log=print):
+        self.path = path
+        self.lease = lease
+        self.fresh_for = fresh_for
+        self.log = log
+
+    def _read_state(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, state):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _fresh_result(self, state, now):
+        """True if the last scrape finished with a result less than fresh_for seconds ago"""
+        finished = state.get('finished_at')
+        return bool(self.fresh_for) and finished is not None and 'result' in state and now - finished < self.fresh_for
+
+    @staticmethod
+    def _try_lock(lock):
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _wait(self, lock):
+        """
+        Wait for the running scrape to release the lock
+        Returns False if its lease ran out first (the lock is then not held)
+        """
+        while True:
+            time.sleep(WAIT_POLL)
+            if self._try_lock(lock):
+                return True
+            state = self._read_state()
+            # Until the holder has written its lease the file still shows the previous, finished run
+            if 'finished_at' not in state and time.time() > state.get('lease_until', float('inf')):
+                self.log(f"✗ Scrape by pid {state.get('owner')} overran its {self.lease}s lease - "
+                         f"scraping without the lock")
+                return False
+
+    def run(self, work):
+        """
+        Return work()'s result: a fresh one from the last scrape, the one
+        of a scrape already in flight, or from running work() here
+        """
+        arrived = time.time()
+        state = self._read_state()
+        if self._fresh_result(state, arrived):
+            self.log(f"○ Last scrape finished {arrived - state['finished_at']:.0f}s ago - reusing its result")
+            return state['result']
+
+        with open(f"{self.path}.lock", 'a') as lock:
+            if not self._try_lock(lock):
+                self.log(f"Scrape already running (pid {state.get('owner')}) - waiting for its result")
+                locked = self._wait(lock)
+                state = self._read_state()
+                if locked and self.fresh_for and state.get('finished_at', 0) >= arrived and 'result' in state:
+                    self.log(f"✓ Reusing the result of the scrape by pid {state.get('owner')}")
+                    return state['result']
+                # Its holder died (or hung) without a result, or we need our own pass - scrape ourselves
+
+            # Someone may have finished between our first look and taking the lock
+            state = self._read_state()
+            if self._fresh_result(state, time.time()):
+                return state['result']
+
+            started = time.time()
+            self._write_state({'owner': os.getpid(), 'started_at': started, 'lease_until': started + self.lease})
+            try:
+                result = work()
+            except BaseException as e:
+                self._write_state({'owner': os.getpid(), 'started_at': started, 'finished_at': time.time(),
+                                   'error': str(e) or type(e).__name__})
+                raise
+            self._write_state({'owner': os.getpid(), 'started_at': started, 'finished_at': time.time(),
+                               'result': result})
+            return result
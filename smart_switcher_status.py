@@ -5,10 +5,14 @@ Switches display based on tournament status from DigitalPool
 """
 
 import socket
-import subprocess
 import os
 import json
 import datetime
+import time
+
+from tournament_model import Tournament
+from cast_devices import CastController, load_devices
+from render_display import WEB_ROOT, PAGE_NAME, is_current
 
 
 def get_ip_address():
@@ -51,24 +55,22 @@ def should_display_tournament(tournament_data):
     Determine if tournament should be displayed based on status
     Returns True if status is "In Progress"
     """
-    if not tournament_data:
-        return False
-    
-    tournament_name = tournament_data.get('tournament_name', '')
-    tournament_url = tournament_data.get('tournament_url', '')
-    status = tournament_data.get('status', '')
-    display_flag = tournament_data.get('display_tournament', False)
-    
-    print(f"\nTournament: {tournament_name}")
-    print(f"Venue: {tournament_data.get('venue', 'N/A')}")
-    print(f"Status: {status}")
-    print(f"Display flag: {display_flag}")
+    tournament = Tournament.from_record(tournament_data)
     
     # Check if we have valid tournament data
-    if tournament_name == 'No tournaments in progress' or not tournament_url:
+    if not tournament or not tournament.url:
         print("No active tournament")
         return False
     
+    display_flag = tournament.should_display
+    
+    print(f"\nTournament: {tournament.name}")
+    print(f"Venue: {tournament.venue or 'N/A'}")
+    print(f"Status: {tournament.status.value}")
+    print(f"Display flag: {display_flag}")
+    if tournament_data.get('stale'):
+        print(f"⚠ DigitalPool unreachable - showing last good data ({tournament_data.get('stale_age_seconds')}s old)")
+    
     # Use the display_tournament flag set by the monitor
     if display_flag:
         print("✓ Tournament is in progress - should display")
@@ -99,7 +101,11 @@ def determine_page_to_display():
     else:
         # Check if tournament should be displayed based on status
         if should_display_tournament(tournament_data):
-            page_to_display = "index2.php"
+            # Prefer the pre-rendered static page when it matches this record
+            if is_current(tournament_data, WEB_ROOT):
+                page_to_display = PAGE_NAME
+            else:
+                page_to_display = "index2.php"
             reason = "Tournament status is 'In Progress'"
         else:
             page_to_display = "index.php"
@@ -114,29 +120,25 @@ def determine_page_to_display():
 
 
 def cast_to_chromecast(page):
-    """Cast the specified page to Chromecast"""
+    """Cast the specified page to every registered Chromecast at once"""
     ip = get_ip_address()
     
     if not ip:
         print("Could not retrieve IP address.")
         return False
     
-    print(f"Casting http://{ip}/{page} to Chromecast...")
+    devices = load_devices()
+    print(f"Casting http://{ip}/{page} to {len(devices)} device(s): {', '.join(d.key for d in devices)}")
     
-    # Change to catt directory
-    new_directory = "/home/pi/.local/bin"
-    if os.path.exists(new_directory):
-        os.chdir(new_directory)
+    controller = CastController(devices)
+    results = controller.cast_site(f"http://{ip}/{page}", stop_first=False)
     
-    # Cast the page
-    command = f"/home/pi/.local/bin/catt cast_site 'http://{ip}/{page}'"
-    result = subprocess.call(command, shell=True)
-    
-    if result == 0:
+    if all(r.ok for r in results.values()):
         print(f"✓ Successfully cast {page}")
         return True
     else:
-        print(f"✗ Failed to cast {page}")
+        failed = [key for key, r in results.items() if not r.ok]
+        print(f"✗ Failed to cast {page} on: {', '.join(failed)}")
         return False
 
 
@@ -146,14 +148,14 @@ def main():
     print("SMART TOURNAMENT DISPLAY SWITCHER - STATUS-BASED")
     print("="*60)
     
-    # First, run the tournament monitor to get latest status
+    # First, run the tournament monitor to get latest status. It runs in this
+    # interpreter (no second python3 start-up); it loads Selenium itself only
+    # if it actually needs the browser.
     print("\nStep 1: Checking tournament status...")
-    result = subprocess.call("/usr/bin/python3 /home/pi/bankshot_monitor_status.py", shell=True)
-    print(f"Monitor exit code: {result}")
-    
-    # Wait a moment for file to be written
-    import time
-    time.sleep(2)
+    started = time.monotonic()
+    from bankshot_monitor_multi import run as run_monitor
+    result = run_monitor()
+    print(f"Monitor exit code: {result} ({time.monotonic() - started:.1f}s)")
     
     # Determine which page to display
     print("\nStep 2: Determining which page to display...")
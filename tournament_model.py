@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Tournament Model - shared by the scraper and every consumer script
+One slotted Tournament class and a status enum so selection, sorting and
+display checks work on precomputed fields instead of re-parsing strings
+"""
+
+import datetime
+import functools
+import json
+from enum import Enum
+
+
+NO_TOURNAMENT_NAME = "No tournaments to display"
+TIME_FORMATS = ['%I:%M %p', '%I:%M%p', '%I %p', '%I%p']
+
+
+class TournamentStatus(Enum):
+    """Tournament status as reported (or inferred) from DigitalPool"""
+    IN_PROGRESS = "In Progress"
+    UPCOMING = "Upcoming"
+    COMPLETED = "Completed"
+    UNKNOWN = "Unknown"
+
+    @classmethod
+    def parse(cls, value):
+        """Map any known spelling ('In Progress', 'in_progress', ...) to a status"""
+        if isinstance(value, cls):
+            return value
+        if not value:
+            return cls.UNKNOWN
+        return _STATUS_LOOKUP.get(str(value).strip().lower(), cls.UNKNOWN)
+
+    @property
+    def is_displayable(self):
+        """Upcoming and In Progress tournaments are shown on the displays"""
+        return self is TournamentStatus.IN_PROGRESS or self is TournamentStatus.UPCOMING
+
+
+_STATUS_LOOKUP = {}
+for _status in TournamentStatus:
+    _STATUS_LOOKUP[_status.value.lower()] = _status
+    _STATUS_LOOKUP[_status.value.lower().replace(' ', '_')] = _status
+    _STATUS_LOOKUP[_status.name.lower()] = _status
+
+
+@functools.lru_cache(maxsize=256)
+def parse_time_string(time_str):
+    """Parse time strings like '7:00 PM' and return datetime.time object"""
+    try:
+        time_str = time_str.strip()
+        for fmt in TIME_FORMATS:
+            try:
+                parsed = datetime.datetime.strptime(time_str, fmt)
+                return parsed.time()
+            except ValueError:
+                continue
+        return None
+    except Exception:
+        return None
+
+
+def _minutes_from_hhmm(value):
+    """Convert 'HH:MM' into minutes since midnight"""
+    try:
+        hours, minutes = value.split(':', 1)
+        return int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Tournament:
+    """A single tournament with its derived start fields computed once"""
+
+    __slots__ = (
+        'name', 'venue', 'date', 'start_time', 'start_time_parsed', 'status',
+        'url', 'found_at', 'player_count', 'completion_pct', 'entry_fee', 'display',
+        'start_minutes', 'start_epoch',
+    )
+
+    def __init__(self, name, venue=None, date=None, start_time=None, status=None,
+                 url=None, found_at=None, player_count=0, start_time_parsed=None,
+                 display=None, completion_pct=None, entry_fee=None):
+        self.name = name
+        self.venue = venue
+        self.date = date
+        self.start_time = start_time
+        self.status = TournamentStatus.parse(status)
+        self.url = url
+        self.found_at = found_at
+        self.player_count = player_count or 0
+        self.completion_pct = completion_pct
+        self.entry_fee = entry_fee
+        self.display = display
+
+        if not start_time_parsed and start_time:
+            parsed = parse_time_string(start_time)
+            start_time_parsed = parsed.strftime("%H:%M") if parsed else None
+        self.start_time_parsed = start_time_parsed
+        self.start_minutes = _minutes_from_hhmm(start_time_parsed)
+        self.start_epoch = self._compute_start_epoch()
+
+    def _compute_start_epoch(self):
+        """Epoch seconds of the tournament start, or None if date/time is unknown"""
+        if not self.date or self.start_minutes is None:
+            return None
+        try:
+            day = datetime.datetime.strptime(self.date, "%Y/%m/%d")
+        except ValueError:
+            return None
+        return (day + datetime.timedelta(minutes=self.start_minutes)).timestamp()
+
+    @property
+    def sort_key(self):
+        """Start minutes for ordering - unknown times sort as midnight"""
+        return self.start_minutes if self.start_minutes is not None else 0
+
+    @property
+    def should_display(self):
+        """Display flag from the record, falling back to the status"""
+        if self.display is None:
+            return self.status.is_displayable
+        return bool(self.display) and self.status.is_displayable
+
+    def is_on(self, date_str):
+        """True if the tournament is dated date_str ('YYYY/MM/DD')"""
+        return self.date == date_str
+
+    def to_dict(self):
+        """Serialize with the scraper's internal key names"""
+        return {
+            'name': self.name,
+            'venue': self.venue,
+            'date': self.date,
+            'start_time': self.start_time,
+            'start_time_parsed': self.start_time_parsed,
+            'status': self.status.value,
+            'url': self.url,
+            'found_at': self.found_at,
+            'player_count': self.player_count,
+            'completion_pct': self.completion_pct,
+            'entry_fee': self.entry_fee,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a tournament from to_dict() output"""
+        return cls(
+            data.get('name'),
+            venue=data.get('venue'),
+            date=data.get('date'),
+            start_time=data.get('start_time'),
+            status=data.get('status'),
+            url=data.get('url'),
+            found_at=data.get('found_at'),
+            player_count=data.get('player_count', 0),
+            start_time_parsed=data.get('start_time_parsed'),
+            completion_pct=data.get('completion_pct'),
+            entry_fee=data.get('entry_fee'),
+        )
+
+    def to_record(self, payout_data=None, last_updated=None, payouts=None):
+        """Serialize into the tournament_data.json format read by the displays"""
+        return {
+            'tournament_name': self.name,
+            'tournament_url': self.url,
+            'venue': self.venue,
+            'date': self.date,
+            'start_time': self.start_time,
+            'start_minutes': self.start_minutes,
+            'start_epoch': self.start_epoch,
+            'status': self.status.value,
+            'player_count': self.player_count,
+            'completion_pct': self.completion_pct,
+            'entry_fee': self.entry_fee,
+            'payout_data': payout_data,
+            'payouts': payouts,
+            'last_updated': last_updated or datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'display_tournament': self.should_display,
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """
+        Build a tournament from a tournament_data.json record
+        Returns None for empty records ('No tournaments to display')
+        """
+        if not record:
+            return None
+        name = record.get('tournament_name')
+        url = record.get('tournament_url')
+        if not name or (not url and name.lower().startswith('no tournament')):
+            return None
+        return cls(
+            name,
+            venue=record.get('venue'),
+            date=record.get('date'),
+            start_time=record.get('start_time'),
+            status=record.get('status'),
+            url=url,
+            player_count=record.get('player_count', 0),
+            completion_pct=record.get('completion_pct'),
+            entry_fee=record.get('entry_fee'),
+            display=record.get('display_tournament', False),
+        )
+
+    def _compared(self):
+        """Everything but found_at, which differs between reads of an unchanged tournament"""
+        fields = self.to_dict()
+        del fields['found_at']
+        return fields
+
+    def __eq__(self, other):
+        if not isinstance(other, Tournament):
+            return NotImplemented
+        return self._compared() == other._compared()
+
+    def __hash__(self):
+        # Only fields that __eq__ compares, so equal tournaments hash alike
+        return hash((self.url, self.name, self.date, self.start_time))
+
+    def __repr__(self):
+        return f"Tournament({self.name!r}, date={self.date!r}, start={self.start_time!r}, status={self.status.value!r})"
+
+
+def empty_record(last_updated=None):
+    """The record written when there is no tournament to display"""
+    return {
+        'tournament_name': NO_TOURNAMENT_NAME,
+        'tournament_url': None,
+        'venue': None,
+        'date': None,
+        'start_time': None,
+        'start_minutes': None,
+        'start_epoch': None,
+        'status': None,
+        'player_count': 0,
+        'completion_pct': None,
+        'entry_fee': None,
+        'payout_data': None,
+        'payouts': None,
+        'last_updated': last_updated or datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'display_tournament': False,
+    }
+
+
+def load_record(path):
+    """Load a tournament_data.json record, returning None if missing or invalid"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
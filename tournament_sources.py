@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tournament Sources
+Adapter interface for tournament listing sites, and the engine that runs
+every configured source at once under one deadline and merges what they
+found. Total latency is that of the slowest source, not the sum of them.
+
+A source implements:
+
+    fetch(date_from, date_to, deadline)  the raw listing (raises SourceError on failure)
+    parse(raw, date_from, date_to)       a list of Tournament
+    identity(tournament)                 key that matches the same event across sources
+
+deadline is a time.monotonic() value the source must stop by. The first
+source is the primary one and runs in the calling thread (DigitalPool's
+drives the browser and the profiler, neither of which is thread-safe); the
+others are feeds that run alongside it in worker threads. Feeds only add to
+a primary listing - if the primary source fails, the fetch fails, so a
+feed-only list is never taken for the full schedule.
+
+Within one source tournaments are told apart by URL, so two same-named
+events on one day stay separate. The same event listed by two sources is
+merged into one Tournament: the first configured source wins, unless another
+one has seen the event further along (statuses only move forward), and gaps
+are filled from the other.
+"""
+
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from tournament_model import Tournament, TournamentStatus
+
+
+SOURCE_DEADLINE = 150  # Seconds for all sources together (DigitalPool's search takes ~40s)
+FEED_TIMEOUT = 20
+
+# Later states win a merge - a source that saw the event finish is right
+STATUS_RANK = {
+    TournamentStatus.UNKNOWN: 0,
+    TournamentStatus.UPCOMING: 1,
+    TournamentStatus.IN_PROGRESS: 2,
+    TournamentStatus.COMPLETED: 3,
+}
+
+
+class SourceError(Exception):
+    """A source could not produce a listing"""
+
+
+def tournament_identity(tournament):
+    """Date plus the name reduced to lowercase words (without a leading date)"""
+    name = re.sub(r'^\d{4}/\d{2}/\d{2}\s+', '', tournament.name or '')
+    return (tournament.date, ' '.join(re.findall(r'[a-z0-9]+', name.lower())))
+
+
+def in_range(tournament, date_from=None, date_to=None):
+    """True if the tournament is dated within date_from..date_to (YYYY/MM/DD, inclusive)"""
+    if not date_from and not date_to:
+        return True
+    if not tournament.date:
+        return False
+    return (not date_from or tournament.date >= date_from) and (not date_to or tournament.date <= date_to)
+
+
+class TournamentSource:
+    """Base adapter; subclasses implement fetch and parse"""
+
+    name = 'source'
+
+    def fetch(self, date_from=None, date_to=None, deadline=None):
+        raise NotImplementedError
+
+    def parse(self, raw, date_from=None, date_to=None):
+        raise NotImplementedError
+
+    def identity(self, tournament):
+        return tournament_identity(tournament)
+
+    def collect(self, date_from=None, date_to=None, deadline=None):
+        return self.parse(self.fetch(date_from, date_to, deadline), date_from, date_to)
+
+
+class JsonFeedSource(TournamentSource):
+    """
+    A JSON feed of tournaments, e.g. a venue's own schedule: a list of
+    Tournament.to_dict() objects, or the same under a 'tournaments' key
+    """
+
+    def __init__(self, url, name=None, timeout=FEED_TIMEOUT):
+        self.url = url
+        self.name = name or f"feed:{url}"
+        self.timeout = timeout
+
+    def fetch(self, date_from=None, date_to=None, deadline=None):
+        # Deferred so a scraper run without feeds never loads the HTTP stack
+        import urllib.error
+        import urllib.request
+        
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = max(1, min(timeout, deadline - time.monotonic()))
+        try:
+            with urllib.request.urlopen(self.url, timeout=timeout) as response:
+                return response.read()
+        except (OSError, urllib.error.URLError) as e:
+            raise SourceError(f"could not fetch {self.url}: {e}") from e
+
+    def parse(self, raw, date_from=None, date_to=None):
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise SourceError(f"invalid JSON from {self.url}: {e}") from e
+        if isinstance(data, dict):
+            data = data.get('tournaments', [])
+        tournaments = [Tournament.from_dict(item) for item in data if isinstance(item, dict) and item.get('name')]
+        return [t for t in tournaments if in_range(t, date_from, date_to)]
+
+
+class SourceResult:
+    """What one source returned (or why it didn't)"""
+
+    __slots__ = ('source', 'tournaments', 'error', 'elapsed')
+
+    def __init__(self, source, tournaments=None, error=None, elapsed=None):
+        self.source = source
+        self.tournaments = tournaments
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None and self.tournaments is not None
+
+
+def _collect(source, date_from, date_to, deadline=None):
+    started = time.monotonic()
+    try:
+        tournaments = source.collect(date_from, date_to, deadline)
+        return SourceResult(source, tournaments, elapsed=time.monotonic() - started)
+    except Exception as e:
+        return SourceResult(source, error=str(e) or type(e).__name__, elapsed=time.monotonic() - started)
+
+
+def _prefer(first, second):
+    """Merge two copies of one event; first is from the higher-priority source"""
+    best, other = (second, first) if STATUS_RANK[second.status] > STATUS_RANK[first.status] else (first, second)
+    timed = best if best.start_time else other
+    return Tournament(
+        best.name,
+        venue=best.venue or other.venue,
+        date=best.date or other.date,
+        start_time=timed.start_time,
+        start_time_parsed=timed.start_time_parsed,
+        status=best.status,
+        url=best.url or other.url,
+        found_at=best.found_at or other.found_at,
+        player_count=max(best.player_count, other.player_count),
+        completion_pct=best.completion_pct if best.completion_pct is not None else other.completion_pct,
+        entry_fee=best.entry_fee or other.entry_fee,
+    )
+
+
+def merge_tournaments(results):
+    """
+    Merge the tournaments of successful results (in priority order): one per
+    URL within a source, one per identity across sources
+    """
+    merged = []  # Tournaments in order of first appearance
+    by_identity = {}  # identity -> indexes into merged
+    for result in results:
+        if not result.ok:
+            continue
+        own = {}  # this source's URL (or identity) -> index into merged
+        for tournament in result.tournaments:
+            identity = result.source.identity(tournament)
+            key = tournament.url or identity
+            index = own.get(key)
+            if index is None:
+                # The same event from an earlier source: prefer the one with this URL
+                earlier = [i for i in by_identity.get(identity, []) if i not in own.values()]
+                same_url = [i for i in earlier if tournament.url and merged[i].url == tournament.url]
+                index = (same_url or earlier or [None])[0]
+            if index is None:
+                merged.append(tournament)
+                index = len(merged) - 1
+                by_identity.setdefault(identity, []).append(index)
+            else:
+                merged[index] = _prefer(merged[index], tournament)
+            own[key] = index
+    return merged
+
+
+def fetch_sources(sources, date_from=None, date_to=None, deadline=SOURCE_DEADLINE, log=print):
+    """
+    Run every source at once and merge what came back within the deadline
+    Returns (merged tournaments, or None if the primary source failed; per-source results)
+    """
+    if not sources:
+        return None, []
+
+    stop_by = time.monotonic() + deadline
+    first, others = sources[0], sources[1:]
+    executor = None
+    futures = []
+    if others:
+        executor = ThreadPoolExecutor(max_workers=len(others), thread_name_prefix='source')
+        futures = [(executor.submit(_collect, source, date_from, date_to, stop_by), source) for source in others]
+
+    results = [_collect(first, date_from, date_to, stop_by)]
+    if executor is not None:
+        done, _ = wait([future for future, _ in futures], timeout=max(0, stop_by - time.monotonic()))
+        # Feeds are bounded by their own timeouts, so this doesn't outlive them
+        executor.shutdown(wait=False)
+        for future, source in futures:
+            if future in done:
+                results.append(future.result())
+            else:
+                results.append(SourceResult(source, error=f"no answer within {deadline}s", elapsed=deadline))
+
+    for result in results:
+        if result.ok:
+            log(f"✓ Source {result.source.name}: {len(result.tournaments)} tournament(s) in {result.elapsed:.1f}s")
+        else:
+            log(f"✗ Source {result.source.name} failed after {result.elapsed:.1f}s: {result.error}")
+
+    if not results[0].ok:
+        if any(result.ok for result in results[1:]):
+            log(f"✗ Primary source {first.name} failed - not using the feeds' listings on their own")
+        return None, results
+    merged = merge_tournaments(results)
+    found = sum(len(result.tournaments) for result in results if result.ok)
+    if found != len(merged):
+        log(f"Merged {found} listing(s) into {len(merged)} tournament(s)")
+    return merged, results